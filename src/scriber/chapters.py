@@ -0,0 +1,58 @@
+"""Split a timed transcript along a video's chapters, and link back into the video.
+
+Summarizing a two-hour video as one prompt is slow and crowds the model's
+context. When the uploader published chapters and the transcript is timed
+(caption cues or whisper segments), :func:`split_by_chapters` cuts it into
+one text per chapter, so each can be summarized on its own and in parallel;
+:func:`timestamp_url` builds the ``?t=<ss>`` deep-link to each chapter.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+if TYPE_CHECKING:
+    from scriber.model import Chapter
+
+
+def split_by_chapters(
+    segments: list[dict[str, Any]],
+    chapters: list[Chapter],
+) -> list[tuple[Chapter, str]]:
+    """Return each chapter with the text of the segments that start in it.
+
+    A segment belongs to the last chapter starting at or before its start;
+    segments before the first chapter go to the first. Chapters without any
+    speech are dropped.
+    """
+    if not chapters:
+        return []
+    texts: list[list[str]] = [[] for _ in chapters]
+    index = 0
+    for seg in sorted(segments, key=lambda s: float(s["start"])):
+        start = float(seg["start"])
+        while index + 1 < len(chapters) and chapters[index + 1].start <= start:
+            index += 1
+        text = str(seg.get("text", "")).strip()
+        if text:
+            texts[index].append(text)
+    return [
+        (chapter, " ".join(parts)) for chapter, parts in zip(chapters, texts, strict=True) if parts
+    ]
+
+
+def format_offset(seconds: float) -> str:
+    """Return ``seconds`` as ``M:SS``, or ``H:MM:SS`` from one hour on."""
+    total = int(seconds)
+    h, rem = divmod(total, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+def timestamp_url(url: str, seconds: float) -> str:
+    """Return ``url`` with its ``t`` query parameter set to ``seconds`` (whole seconds)."""
+    parsed = urlparse(url)
+    query = [(key, value) for key, value in parse_qsl(parsed.query) if key != "t"]
+    query.append(("t", str(int(seconds))))
+    return urlunparse(parsed._replace(query=urlencode(query)))
@@ -27,3 +27,43 @@ def wrap_transcript(text: str, *, diarize: bool, width: int) -> str:
         break_long_words=False,
         break_on_hyphens=False,
     )
+
+
+class LineWrapper:
+    """Incremental counterpart of :func:`wrap_transcript` for streamed text.
+
+    Text arrives piecemeal (one whisper segment at a time); :meth:`feed`
+    returns the lines that are complete so far and keeps the unfinished one
+    buffered. Greedy word packing matches ``textwrap.fill`` with
+    ``break_long_words=False``: a word longer than ``width`` gets a line of
+    its own instead of being split, and leading whitespace of the very first
+    piece is kept (whisper text starts with a space).
+    """
+
+    def __init__(self, width: int) -> None:
+        """Start with an empty line buffer."""
+        self.width = width
+        self._line = ""
+        self._started = False
+
+    def feed(self, text: str) -> list[str]:
+        """Add ``text`` and return every line it completed."""
+        if not self._started and text.strip():
+            self._started = True
+            self._line = text[: len(text) - len(text.lstrip())]
+        done: list[str] = []
+        for word in text.split():
+            if not self._line.strip():
+                self._line += word
+            elif len(self._line) + 1 + len(word) > self.width:
+                done.append(self._line)
+                self._line = word
+            else:
+                self._line = f"{self._line} {word}"
+        return done
+
+    def flush(self) -> str:
+        """Return the buffered partial line (possibly empty) and reset."""
+        line, self._line = self._line, ""
+        self._started = False
+        return line
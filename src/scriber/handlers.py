@@ -14,20 +14,26 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from typing import cast
+from typing import Any, cast
 
 from langdetect import LangDetectException, detect
+from yt_dlp.utils import DownloadError
 
 from scriber.formatting import sanitize_filename, wrap_transcript
 from scriber.language import derive_summary_language, derive_whisper_summary_language
 from scriber.logger import my_logger
 from scriber.model import Transcript
 from scriber.settings import Settings
+from scriber.streaming import TranscriptStreamWriter
 from scriber.subtitles import write_srt, write_vtt
 from scriber.summarizers import make_summarizer
 from scriber.transcription import local as plt
 from scriber.transcription import youtube_audio as pya
 from scriber.transcription import youtube_captions as pytt
+from scriber.transcription import youtube_metadata as pymeta
+from scriber.transcription.caption_cache import CaptionCache
+from scriber.transcription.metadata_cache import MetadataCache
+from scriber.transcription.speakers import SpeakerIndex
 from scriber.transcription.youtube_captions import TranscriptUnavailableError
 
 
@@ -37,9 +43,12 @@ def handle_url(args: argparse.Namespace, settings: Settings) -> Transcript:
     my_logger.debug(f"Video ID: {video_id}")
     requested_lang: str | None = args.language
     force: bool = bool(getattr(args, "force", False))
+    metadata = fetch_metadata(args, settings, video_id, refresh=force)
+    chapters = metadata.chapters if metadata is not None else []
 
+    offline = getattr(args, "offline", False) is True
     try:
-        track = pytt.get_youtube_transcript(video_id, requested_lang=requested_lang)
+        track = fetch_captions(args, settings, video_id, metadata)
     except TranscriptUnavailableError as exc:
         log = my_logger.warning if exc.reason == "download_failed" else my_logger.info
         log(
@@ -50,6 +59,8 @@ def handle_url(args: argparse.Namespace, settings: Settings) -> Transcript:
             args.input_path,
             settings.downloads_dir,
             force=force,
+            metadata=metadata,
+            offline=offline,
         )
         title = sanitize_filename(raw_title)
 
@@ -66,18 +77,29 @@ def handle_url(args: argparse.Namespace, settings: Settings) -> Transcript:
                 diarized=args.diarize,
             )
 
-        segments: list[dict[str, object]] = []
+        segments: list[dict[str, Any]] = []
         if args.diarize:
-            transcribed_text, used_lang = plt.transcribe_audio_with_diarization(
+            speaker_index, enroll = _open_speaker_index(args, settings)
+            transcribed_text, used_lang, segments = plt.transcribe_audio_with_diarization(
                 str(audio_path),
                 model_size=settings.whisper_model_size,
                 language=requested_lang,
+                speech_detection=settings.speech_detection,
+                cache_dir=settings.cache_dir,
+                refresh_cache=force,
+                speaker_index=speaker_index,
+                enroll=enroll,
+                diarization_window=settings.diarization_window_minutes * 60.0,
+                channel_speakers=getattr(args, "channel_speakers", False) is True,
+                checkpoint_path=_checkpoint_path(title, args, settings, diarized=True),
             )
+            _save_enrollments(speaker_index, enroll, settings)
         else:
-            transcribed_text, used_lang, segments = plt.transcribe_audio_full(
+            transcribed_text, used_lang, segments = _stream_whisper(
                 str(audio_path),
-                model_size=settings.whisper_model_size,
-                language=requested_lang,
+                title,
+                args,
+                settings,
             )
         summary_lang = derive_whisper_summary_language(used_lang, requested_lang)
         return Transcript(
@@ -87,6 +109,8 @@ def handle_url(args: argparse.Namespace, settings: Settings) -> Transcript:
             source="whisper",
             diarized=args.diarize,
             segments=segments,
+            chapters=chapters,
+            written=not args.diarize,  # streamed by _stream_whisper
         )
 
     summary_lang = derive_summary_language(track.lang, requested_lang)
@@ -96,12 +120,152 @@ def handle_url(args: argparse.Namespace, settings: Settings) -> Transcript:
     return Transcript(
         text=track.text,
         language=summary_lang,
-        title=sanitize_filename(pya.fetch_video_title(args.input_path)),
+        title=sanitize_filename(pya.fetch_video_title(args.input_path, metadata)),
         source="yt_manual" if track.kind == "manual" else "yt_auto",
         diarized=False,
+        segments=track.segments,
+        chapters=chapters,
+    )
+
+
+def fetch_metadata(
+    args: argparse.Namespace,
+    settings: Settings,
+    video_id: str,
+    *,
+    refresh: bool = False,
+) -> pymeta.VideoMetadata | None:
+    """Get the video's metadata once for every step of ``handle_url`` (cache first).
+
+    On failure, return ``None``: each step then tries on its own and reports
+    its own error, as before. In offline mode, a cache miss propagates as
+    :class:`~scriber.transcription.metadata_cache.MetadataNotCachedError`
+    (a :class:`~scriber.transcription.youtube_metadata.NotCachedError`).
+    """
+    cache = MetadataCache(settings.cache_dir, ttl_seconds=settings.metadata_ttl_hours * 3600.0)
+    try:
+        return cache.fetch(
+            args.input_path,
+            video_id,
+            offline=getattr(args, "offline", False) is True,
+            refresh=refresh,
+        )
+    except DownloadError as exc:
+        my_logger.warning(f"Could not fetch video metadata up front: {exc}")
+        return None
+
+
+def fetch_captions(
+    args: argparse.Namespace,
+    settings: Settings,
+    video_id: str,
+    metadata: pymeta.VideoMetadata | None,
+) -> pytt.CaptionTrack:
+    """Fetch the caption track (cache first); retry once with fresh metadata if cached URLs expired.
+
+    Raises:
+        TranscriptUnavailableError: No usable caption track.
+        NotCachedError: Offline mode and the picked track is not cached.
+
+    """
+    cache = CaptionCache(settings.cache_dir)
+    refresh = bool(getattr(args, "force", False))
+    offline = getattr(args, "offline", False) is True
+    try:
+        return pytt.get_youtube_transcript(
+            video_id,
+            requested_lang=args.language,
+            metadata=metadata,
+            cache=cache,
+            refresh=refresh,
+            offline=offline,
+        )
+    except TranscriptUnavailableError as exc:
+        stale = exc.reason == "download_failed" and metadata is not None and metadata.from_cache
+        if not stale or offline:
+            raise
+        my_logger.info(f"Caption download failed with cached metadata ({exc}); refreshing it.")
+    fresh = fetch_metadata(args, settings, video_id, refresh=True)
+    return pytt.get_youtube_transcript(
+        video_id,
+        requested_lang=args.language,
+        metadata=fresh,
+        cache=cache,
+        refresh=refresh,
     )
 
 
+def _transcript_path(title: str, settings: Settings, *, diarized: bool) -> Path:
+    suffix = " diarized transcript" if diarized else " transcript"
+    return settings.output_dir / f"{title}{suffix}.txt"
+
+
+def _checkpoint_path(
+    title: str,
+    args: argparse.Namespace,
+    settings: Settings,
+    *,
+    diarized: bool,
+) -> Path:
+    """Return where whisper progress is checkpointed; ``--force`` discards what is there."""
+    suffix = " diarized transcript" if diarized else " transcript"
+    checkpoint = settings.output_dir / f"{title}{suffix}.checkpoint.jsonl"
+    if getattr(args, "force", False) is True:
+        checkpoint.unlink(missing_ok=True)
+    return checkpoint
+
+
+def _stream_whisper(
+    audio_path: str,
+    title: str,
+    args: argparse.Namespace,
+    settings: Settings,
+) -> tuple[str, str, list[dict[str, Any]]]:
+    """Run whisper, appending each segment to the outputs as it is decoded.
+
+    Progress is checkpointed next to the transcript so an interrupted run
+    resumes where it stopped; ``--force`` discards any such checkpoint.
+    Returns ``(text, used_lang, segments)`` like ``transcribe_audio_full``.
+    """
+    used_lang, stream = plt.stream_transcription(
+        audio_path,
+        model_size=settings.whisper_model_size,
+        language=args.language,
+        checkpoint_path=_checkpoint_path(title, args, settings, diarized=False),
+    )
+    subtitles = getattr(args, "subtitles", False) is True
+    writer = TranscriptStreamWriter(
+        _transcript_path(title, settings, diarized=False),
+        wrap_width=settings.wrap_width,
+        srt_path=settings.output_dir / f"{title}.srt" if subtitles else None,
+        vtt_path=settings.output_dir / f"{title}.vtt" if subtitles else None,
+    )
+    segments: list[dict[str, Any]] = []
+    with writer:
+        for segment in stream:
+            writer.write(segment)
+            segments.append(segment)
+    return "".join(str(seg["text"]) for seg in segments), used_lang, segments
+
+
+def _open_speaker_index(
+    args: argparse.Namespace,
+    settings: Settings,
+) -> tuple[SpeakerIndex, dict[str, str]]:
+    """Load the speaker index and the ``--enroll LABEL=NAME`` requests."""
+    enroll = dict(cast(list[tuple[str, str]], getattr(args, "enroll", None) or []))
+    return SpeakerIndex.load(settings.speaker_index_path), enroll
+
+
+def _save_enrollments(index: SpeakerIndex, enroll: dict[str, str], settings: Settings) -> None:
+    """Persist the index when this run enrolled voices into it."""
+    if enroll and len(index):
+        index.save(settings.speaker_index_path)
+        my_logger.info(
+            f"Saved speaker index ({len(index)} voices) to {settings.speaker_index_path}"
+        )
+
+
 def _try_load_cached_transcript(
     title: str,
     settings: Settings,
@@ -112,8 +276,7 @@ def _try_load_cached_transcript(
     """Return cached transcript text if a matching ``.txt`` already exists."""
     if force:
         return None
-    suffix = " diarized transcript" if diarize else " transcript"
-    cached = settings.output_dir / f"{title}{suffix}.txt"
+    cached = _transcript_path(title, settings, diarized=diarize)
     if not cached.exists():
         return None
     my_logger.info(f"Using cached transcript at {cached}")
@@ -129,24 +292,27 @@ def handle_media(args: argparse.Namespace, settings: Settings) -> Transcript:
     """
     title = sanitize_filename(Path(args.input_path).stem)
     requested_lang: str | None = args.language
-    segments: list[dict[str, object]] = []
+    segments: list[dict[str, Any]] = []
     if args.diarize:
-        text, used_lang = plt.transcribe_video_file_with_diarization(
+        speaker_index, enroll = _open_speaker_index(args, settings)
+        text, used_lang, segments = plt.transcribe_video_file_with_diarization(
             args.input_path,
             model_size=settings.whisper_model_size,
             language=requested_lang,
+            speech_detection=settings.speech_detection,
+            cache_dir=settings.cache_dir,
+            refresh_cache=getattr(args, "force", False) is True,
+            speaker_index=speaker_index,
+            enroll=enroll,
+            diarization_window=settings.diarization_window_minutes * 60.0,
+            channel_speakers=getattr(args, "channel_speakers", False) is True,
+            checkpoint_path=_checkpoint_path(title, args, settings, diarized=True),
         )
+        _save_enrollments(speaker_index, enroll, settings)
     else:
-        # transcribe_video_file is a thin wrapper around transcribe_audio_full
-        # via tempfile-based ffmpeg extraction; we duplicate the unwrap here
-        # so segments are exposed to handle_media too.
         audio_tmp = plt.extract_audio(args.input_path)
         try:
-            text, used_lang, segments = plt.transcribe_audio_full(
-                audio_tmp,
-                model_size=settings.whisper_model_size,
-                language=requested_lang,
-            )
+            text, used_lang, segments = _stream_whisper(audio_tmp, title, args, settings)
         finally:
             Path(audio_tmp).unlink()
     summary_lang = derive_whisper_summary_language(used_lang, requested_lang)
@@ -158,6 +324,7 @@ def handle_media(args: argparse.Namespace, settings: Settings) -> Transcript:
         source="whisper",
         diarized=args.diarize,
         segments=segments,
+        written=not args.diarize,  # streamed by _stream_whisper
     )
 
 
@@ -196,11 +363,14 @@ def write_transcript_file(
 ) -> Path:
     """Write the transcript text to ``<output_dir>/<title> [diarized] transcript.txt``.
 
-    When ``subtitles`` is True and the transcript carries whisper segments,
-    also writes ``.srt`` and ``.vtt`` files alongside.
+    When ``subtitles`` is True and the transcript carries timed segments
+    (whisper or caption cues), also writes ``.srt`` and ``.vtt`` files alongside.
+    A ``written`` transcript was streamed to those files already; it is left as is.
     """
-    suffix = " diarized transcript" if transcript.diarized else " transcript"
-    p = settings.output_dir / f"{transcript.title}{suffix}.txt"
+    p = _transcript_path(transcript.title, settings, diarized=transcript.diarized)
+    if transcript.written:
+        my_logger.info(f"Transcript written to {p}")
+        return p
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(
         wrap_transcript(transcript.text, diarize=transcript.diarized, width=settings.wrap_width),
@@ -211,8 +381,8 @@ def write_transcript_file(
     if subtitles:
         if not transcript.segments:
             my_logger.warning(
-                "--subtitles requested but no segments available "
-                "(YT captions or diarized output) — skipping .srt/.vtt.",
+                "--subtitles requested but the transcript has no timed segments "
+                "— skipping .srt/.vtt.",
             )
         else:
             srt_path = settings.output_dir / f"{transcript.title}.srt"
@@ -4,34 +4,48 @@ from __future__ import annotations
 
 import argparse
 import dataclasses
+import multiprocessing
+import os
 import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 import torch.cuda
 
-from scriber import handlers, parser
+from scriber import handlers, parser, prefetch
 from scriber.logger import initialize_logger, my_logger
 from scriber.settings import Settings
 from scriber.summarizers import MissingAPIKeyError, make_summarizer
+from scriber.transcription import local as plt
+from scriber.transcription.models import MODEL_REGISTRY
+from scriber.transcription.rate_limit import RATE_STATE_FILE, YOUTUBE_LIMITER, YouTubeThrottledError
+from scriber.transcription.youtube_metadata import NotCachedError
 
 
 def _apply_cli_overrides(args: argparse.Namespace, base: Settings) -> Settings:
     """Return a new ``Settings`` with CLI-provided values overlaid on ``base``.
 
     Summarize-only flags (``--llm-provider``, ``--llm-model``, ``--summary-mode``,
-    ``--with-openai``) are only present when the subcommand is ``summarize``.
+    ``--with-openai``) are only present when the subcommand is ``summarize``;
+    ``prefetch`` has none of the transcription flags either.
     """
     provider = getattr(args, "llm_provider", None) or base.llm_provider
     if getattr(args, "with_openai", False):
         provider = "openai"
     return dataclasses.replace(
         base,
-        output_dir=args.output_dir or base.output_dir,
-        downloads_dir=args.downloads_dir or base.downloads_dir,
-        whisper_model_size=args.model_size or base.whisper_model_size,
+        output_dir=getattr(args, "output_dir", None) or base.output_dir,
+        downloads_dir=getattr(args, "downloads_dir", None) or base.downloads_dir,
+        whisper_model_size=getattr(args, "model_size", None) or base.whisper_model_size,
         llm_provider=provider,
         llm_model=getattr(args, "llm_model", None) or base.llm_model,
         summary_mode=getattr(args, "summary_mode", None) or base.summary_mode,
+        speech_detection=getattr(args, "speech_detection", None) or base.speech_detection,
+        diarization_window_minutes=(
+            base.diarization_window_minutes
+            if getattr(args, "diarization_window", None) is None
+            else args.diarization_window
+        ),
     )
 
 
@@ -61,6 +75,18 @@ def _dry_run_report(path: str, classification: dict[str, bool], settings: Settin
 
 
 def main() -> None:
+    """Run scriber; on Ctrl-C exit with status 130, leaving checkpoints to resume from.
+
+    Entry point of the ``scriber`` console script and of ``python -m scriber``.
+    """
+    try:
+        _run()
+    except KeyboardInterrupt:
+        my_logger.critical("Interrupted by user; rerun to resume from the last checkpoint")
+        sys.exit(130)
+
+
+def _run() -> None:
     """Parse args, build a Transcript for each input, write it, and optionally summarize."""
     args = parser.parse_args()
     initialize_logger(args)
@@ -69,7 +95,19 @@ def main() -> None:
     my_logger.info(f"Script called with the following arguments: {vars(args)}")
     my_logger.debug(f"Loaded settings: {settings}")
 
+    # One request budget (and backoff) shared by every thread, worker process
+    # and concurrent scriber run on the machine.
+    YOUTUBE_LIMITER.configure(
+        settings.youtube_rate_limit or None,
+        state_path=settings.cache_dir / RATE_STATE_FILE,
+    )
+
+    if args.command == "prefetch":
+        prefetch.run(args, settings)
+        return
+
     _gpu_warning()
+    MODEL_REGISTRY.budget_bytes = settings.model_memory_budget_mb * 1024 * 1024
 
     will_summarize = args.command == "summarize"
 
@@ -82,41 +120,130 @@ def main() -> None:
             my_logger.error(str(exc))
             sys.exit(2)
 
-    for path in args.input_path:
-        classification = parser.classify_input(path)
+    if args.dry_run:
+        for path in args.input_path:
+            _dry_run_report(path, parser.classify_input(path), settings)
+        return
 
-        if args.dry_run:
-            _dry_run_report(path, classification, settings)
-            continue
+    workers = min(args.workers, len(args.input_path))
+    parallel = workers > 1 and _can_fork_workers()
+    if args.diarize:
+        _preload_diarization_pipelines(settings)
 
-        # Build a per-path namespace so handlers receive a single `input_path`
-        # string along with the correct type flags.
-        per_args = argparse.Namespace(**vars(args))
-        per_args.input_path = path
-        for key, val in classification.items():
-            setattr(per_args, key, val)
+    if parallel:
+        _run_in_workers(args, settings, workers=workers, will_summarize=will_summarize)
+        return
 
-        if per_args.is_url:
+    for path in args.input_path:
+        _process_input(path, args, settings, will_summarize=will_summarize)
+
+
+def _process_input(
+    path: str,
+    args: argparse.Namespace,
+    settings: Settings,
+    *,
+    will_summarize: bool,
+) -> None:
+    """Transcribe one input, write it, and optionally summarize it."""
+    classification = parser.classify_input(path)
+
+    # Build a per-path namespace so handlers receive a single `input_path`
+    # string along with the correct type flags.
+    per_args = argparse.Namespace(**vars(args))
+    per_args.input_path = path
+    for key, val in classification.items():
+        setattr(per_args, key, val)
+
+    if per_args.is_url:
+        try:
             transcript = handlers.handle_url(per_args, settings)
-        elif per_args.is_media_file:
-            transcript = handlers.handle_media(per_args, settings)
-        elif per_args.is_text_file:
-            transcript = handlers.handle_text(per_args, settings)
-        else:
-            my_logger.error(f"No handler for the given input type: {path}")
-            continue
+        except (NotCachedError, YouTubeThrottledError) as exc:
+            my_logger.error(f"Skipping {path}: {exc}")
+            return
+    elif per_args.is_media_file:
+        transcript = handlers.handle_media(per_args, settings)
+    elif per_args.is_text_file:
+        transcript = handlers.handle_text(per_args, settings)
+    else:
+        my_logger.error(f"No handler for the given input type: {path}")
+        return
 
-        handlers.write_transcript_file(transcript, settings, subtitles=args.subtitles)
-        my_logger.info(f"Video title: {transcript.title}")
+    handlers.write_transcript_file(transcript, settings, subtitles=args.subtitles)
+    my_logger.info(f"Video title: {transcript.title}")
 
-        if will_summarize:
-            my_logger.info("Generating summary...")
-            handlers.summarize(transcript, per_args, settings)
+    if will_summarize:
+        my_logger.info("Generating summary...")
+        handlers.summarize(transcript, per_args, settings)
 
 
-if __name__ == "__main__":
+def _preload_diarization_pipelines(settings: Settings) -> None:
+    """Load the pyannote pipelines once, before any input, instead of on first use.
+
+    A missing ``HUGGINGFACE_TOKEN`` then fails in seconds rather than after
+    the first whisper pass, and in worker mode the pipelines are resident
+    before the fork so their weights get shared like whisper's.
+    """
+    model_ids = [plt.DIARIZATION_PIPELINE]
+    if settings.speech_detection == "vad":
+        model_ids.append(plt.VAD_PIPELINE)
     try:
-        main()
-    except KeyboardInterrupt:
-        my_logger.critical("Interrupted by user")
-        sys.exit(0)
+        for model_id in model_ids:
+            plt.preload_pipeline(model_id)
+    except OSError as exc:
+        my_logger.error(str(exc))
+        sys.exit(2)
+
+
+def _can_fork_workers() -> bool:
+    """Worker processes need ``fork`` (to inherit loaded weights) and a CPU-only run."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        my_logger.warning("--workers needs the 'fork' start method; processing sequentially.")
+        return False
+    if plt.get_device() != "cpu":
+        # CUDA contexts do not survive fork; one GPU process is the right shape anyway.
+        my_logger.warning("--workers is CPU-only; processing sequentially on the GPU.")
+        return False
+    return True
+
+
+def _init_worker(torch_threads: int) -> None:
+    """Split the cores between workers instead of every worker grabbing all of them."""
+    torch.set_num_threads(torch_threads)
+
+
+def _run_in_workers(
+    args: argparse.Namespace,
+    settings: Settings,
+    *,
+    workers: int,
+    will_summarize: bool,
+) -> None:
+    """Process inputs in ``workers`` forked processes sharing one copy of the weights.
+
+    The whisper model is loaded once here, its tensors are moved to shared
+    memory, and only then are the workers forked — each one finds the model
+    already resident in its inherited registry and maps the same pages.
+    """
+    plt.preload_whisper_model(settings.whisper_model_size, "cpu")
+    shared = MODEL_REGISTRY.share_memory()
+    my_logger.info(
+        f"Sharing {shared / (1024 * 1024):.0f} MB of model weights across {workers} workers",
+    )
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(torch_threads,),
+    ) as pool:
+        futures = [
+            pool.submit(_process_input, path, args, settings, will_summarize=will_summarize)
+            for path in args.input_path
+        ]
+        for future in futures:
+            future.result()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,15 @@ from typing import Any, Literal
 TranscriptSource = Literal["yt_manual", "yt_auto", "whisper", "file"]
 
 
+@dataclass(frozen=True)
+class Chapter:
+    """One chapter of a video, as published by the uploader (yt-dlp's ``chapters``)."""
+
+    title: str
+    start: float  # seconds
+    end: float  # seconds
+
+
 @dataclass(frozen=True)
 class Transcript:
     """In-memory representation of a transcript ready to be written / summarized."""
@@ -22,4 +31,8 @@ class Transcript:
     source: TranscriptSource
     diarized: bool
     segments: list[dict[str, Any]] = field(default_factory=list[dict[str, Any]])
-    """Whisper-style per-cue segments for SRT/VTT export. Empty when N/A."""
+    """Whisper-style per-cue segments (whisper or YT caption cues) for SRT/VTT export. Empty when N/A."""
+    chapters: list[Chapter] = field(default_factory=list[Chapter])
+    """The video's chapters (YouTube only), for per-chapter summaries. Empty when N/A."""
+    written: bool = False
+    """True when the transcript files were already streamed to disk while decoding."""
@@ -1,8 +1,9 @@
 """Command-line parser.
 
-Two subcommands:
+Three subcommands:
 - ``scriber transcribe <input>...``  — write a transcript (and optional subtitles).
 - ``scriber summarize <input>...``   — transcribe if needed, then summarize.
+- ``scriber prefetch [ids_file]``    — warm the YouTube metadata/caption caches.
 """
 
 import argparse
@@ -50,6 +51,15 @@ def classify_input(path: str) -> dict[str, bool]:
     }
 
 
+def _enrollment(value: str) -> tuple[str, str]:
+    """Parse ``LABEL=NAME`` for ``--enroll``."""
+    label, sep, name = value.partition("=")
+    if not sep or not label.strip() or not name.strip():
+        err_msg = f"expected LABEL=NAME (e.g. SPEAKER_00=Alice), got {value!r}"
+        raise argparse.ArgumentTypeError(err_msg)
+    return label.strip(), name.strip()
+
+
 def _add_shared_args(sub: argparse.ArgumentParser) -> None:
     """Flags shared between transcribe and summarize (both run the transcription pipeline)."""
     sub.add_argument(
@@ -76,6 +86,18 @@ def _add_shared_args(sub: argparse.ArgumentParser) -> None:
         default=False,
         help="Diarize the audio (identify speakers) in the transcript (default: False)",
     )
+    sub.add_argument(
+        "--speech-detection",
+        dest="speech_detection",
+        choices={"diarization", "vad"},
+        default=None,
+        help=(
+            "Where --diarize takes speech regions from: 'diarization' reuses the "
+            "diarization pipeline's own segmentation (one pyannote pass), 'vad' "
+            "also runs the VAD pipeline, concurrently. "
+            "Default: env SPEECH_DETECTION, or 'diarization'."
+        ),
+    )
     sub.add_argument(
         "--model-size",
         dest="model_size",
@@ -106,14 +128,71 @@ def _add_shared_args(sub: argparse.ArgumentParser) -> None:
         default=False,
         help="Re-download audio and re-transcribe even if cached outputs exist.",
     )
+    sub.add_argument(
+        "--offline",
+        action="store_true",
+        default=False,
+        help=(
+            "Make no YouTube request: metadata, captions and audio come only from "
+            "the local caches (CACHE_DIR, DOWNLOADS_DIR), whatever their age; URLs "
+            "missing from them are skipped (default: False)."
+        ),
+    )
     sub.add_argument(
         "--subtitles",
         action="store_true",
         default=False,
         help=(
             "Also write .srt and .vtt subtitle files alongside the .txt "
-            "transcript (whisper transcription only, not for YT captions or "
-            "diarized output)."
+            "transcript (from whisper or from the timed YT caption cues; "
+            "diarized cues are tagged with their speaker)."
+        ),
+    )
+    sub.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Process batch inputs in this many CPU worker processes. The whisper "
+            "model is loaded once and its weights are shared by all workers "
+            "(default: 1 — sequential)."
+        ),
+    )
+    sub.add_argument(
+        "--channel-speakers",
+        dest="channel_speakers",
+        action="store_true",
+        default=False,
+        help=(
+            "With --diarize: when each speaker has their own audio channel "
+            "(calls, many podcasts), take speaker turns from per-channel "
+            "energy and skip pyannote. Falls back to pyannote when the "
+            "channels do not separate speakers (default: False)."
+        ),
+    )
+    sub.add_argument(
+        "--diarization-window",
+        dest="diarization_window",
+        type=int,
+        default=None,
+        metavar="MINUTES",
+        help=(
+            "With --diarize: process the audio in overlapping windows of MINUTES "
+            "so memory stays flat on very long recordings; speakers are matched "
+            "across windows by voice. 0 = whole file at once. "
+            "Default: env DIARIZATION_WINDOW_MINUTES, or 0."
+        ),
+    )
+    sub.add_argument(
+        "--enroll",
+        action="append",
+        type=_enrollment,
+        default=None,
+        metavar="LABEL=NAME",
+        help=(
+            "With --diarize: save the voice of diarization label LABEL (e.g. "
+            "SPEAKER_00) as NAME in the speaker index, so later recordings "
+            "label that voice NAME. Repeatable. Index path: env SPEAKER_INDEX."
         ),
     )
     sub.add_argument(
@@ -182,6 +261,65 @@ def _add_summarize_args(sub: argparse.ArgumentParser) -> None:
     )
 
 
+def _add_prefetch_args(sub: argparse.ArgumentParser) -> None:
+    """Flags of the prefetch subcommand (no transcription pipeline)."""
+    sub.add_argument(
+        "ids_file",
+        nargs="?",
+        default="-",
+        help="File with one YouTube video ID or URL per line. Default: stdin ('-').",
+    )
+    sub.add_argument(
+        "-l",
+        "--language",
+        choices={"en", "fr"},
+        default=None,
+        help="Preferred caption language, as for transcribe (default: ladder without a preference).",
+    )
+    sub.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Videos fetched at the same time (default: 4).",
+    )
+    sub.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        metavar="REQUESTS_PER_SECOND",
+        help="Cap on requests to YouTube across all workers (default: 1.0).",
+    )
+    sub.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help=(
+            "CSV report: per video, 'captions', 'whisper' (needs the whisper "
+            "fallback) or 'error'. Default: <output dir>/prefetch report.csv."
+        ),
+    )
+    sub.add_argument(
+        "--output-dir",
+        dest="output_dir",
+        type=Path,
+        default=None,
+        help="Where the report lands by default. Default: env OUTPUT_DIR, or ./results.",
+    )
+    sub.add_argument(
+        "--force",
+        action="store_true",
+        default=False,
+        help="Refetch metadata and captions even when cached.",
+    )
+    sub.add_argument(
+        "-d",
+        "--debug",
+        action="store_true",
+        default=False,
+        help="Debug mode: enable DEBUG-level logging (default: False)",
+    )
+
+
 def parse_args() -> argparse.Namespace:
     """Define then parse command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -191,7 +329,11 @@ def parse_args() -> argparse.Namespace:
             "or existing text transcripts."
         ),
     )
-    sub = parser.add_subparsers(dest="command", required=True, metavar="{transcribe,summarize}")
+    sub = parser.add_subparsers(
+        dest="command",
+        required=True,
+        metavar="{transcribe,summarize,prefetch}",
+    )
 
     transcribe = sub.add_parser(
         "transcribe",
@@ -211,11 +353,22 @@ def parse_args() -> argparse.Namespace:
     _add_shared_args(summarize)
     _add_summarize_args(summarize)
 
+    prefetch = sub.add_parser(
+        "prefetch",
+        help="Cache YouTube metadata and captions for many videos. No transcription.",
+        description=(
+            "Read video IDs or URLs (one per line) and cache each video's metadata "
+            "and best caption track, rate-limited, for later transcribe/summarize "
+            "runs. Writes a CSV report of the videos that will need whisper."
+        ),
+    )
+    _add_prefetch_args(prefetch)
+
     args = parser.parse_args()
 
     # Validate every input path eagerly so the user gets an error before any
     # slow work begins.
-    for path in args.input_path:
+    for path in getattr(args, "input_path", []):
         classify_input(path)  # raises ArgumentTypeError on invalid input
 
     return args
@@ -0,0 +1,175 @@
+"""``scriber prefetch``: warm the metadata and caption caches for many videos.
+
+Reads YouTube video IDs (or URLs) one per line from a file or stdin and, for
+each, gets the metadata and the caption track the language ladder picks —
+through the same caches ``handle_url`` reads — with a bounded number of
+videos in flight and a global cap on the request rate (see
+:mod:`~scriber.transcription.rate_limit`). Nothing is transcribed or
+summarized; a later ``transcribe``/``summarize`` run over the same videos
+then makes no request for them.
+
+The run writes a CSV report, one row per video: ``captions`` (cached and
+ready), ``whisper`` (no usable caption track — a later run will download
+the audio and transcribe it) or ``error`` (metadata or caption download
+failed; worth retrying).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import sys
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import astuple, dataclass, fields
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from scriber import handlers
+from scriber.logger import my_logger
+from scriber.parser import is_valid_url
+from scriber.transcription import youtube_audio as pya
+from scriber.transcription.rate_limit import (
+    RATE_STATE_FILE,
+    YOUTUBE_LIMITER,
+    YouTubeThrottledError,
+)
+from scriber.transcription.youtube_captions import TranscriptUnavailableError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from scriber.settings import Settings
+
+PrefetchStatus = Literal["captions", "whisper", "error"]
+
+# Caption failures worth retrying later, as opposed to "this video has none".
+_TRANSIENT_REASONS = frozenset({"list_failed", "download_failed"})
+
+
+@dataclass(frozen=True)
+class PrefetchResult:
+    """One report row."""
+
+    video_id: str
+    status: PrefetchStatus
+    lang: str = ""
+    kind: str = ""
+    detail: str = ""
+
+
+def read_video_ids(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the video ID of each line (bare ID or URL), skipping blanks, ``#`` comments and repeats."""
+    seen: set[str] = set()
+    for raw in lines:
+        entry = raw.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        if is_valid_url(entry):
+            try:
+                entry = pya.extract_video_id(entry)
+            except ValueError as exc:
+                my_logger.warning(f"Skipping {entry!r}: {exc}")
+                continue
+        if entry not in seen:
+            seen.add(entry)
+            yield entry
+
+
+def prefetch_video(
+    video_id: str,
+    settings: Settings,
+    *,
+    language: str | None = None,
+    force: bool = False,
+) -> PrefetchResult:
+    """Cache ``video_id``'s metadata and picked caption track; report the outcome."""
+    args = argparse.Namespace(
+        input_path=f"https://www.youtube.com/watch?v={video_id}",
+        language=language,
+        force=force,
+    )
+    try:
+        metadata = handlers.fetch_metadata(args, settings, video_id, refresh=force)
+        if metadata is None:
+            return PrefetchResult(video_id, "error", detail="metadata unavailable")
+        track = handlers.fetch_captions(args, settings, video_id, metadata)
+    except YouTubeThrottledError:
+        return PrefetchResult(video_id, "error", detail="throttled")
+    except TranscriptUnavailableError as exc:
+        status: PrefetchStatus = "error" if exc.reason in _TRANSIENT_REASONS else "whisper"
+        return PrefetchResult(video_id, status, detail=exc.reason)
+    return PrefetchResult(video_id, "captions", lang=track.lang, kind=track.kind)
+
+
+def prefetch(
+    video_ids: Iterable[str],
+    settings: Settings,
+    *,
+    concurrency: int = 4,
+    language: str | None = None,
+    force: bool = False,
+) -> Iterator[PrefetchResult]:
+    """Prefetch ``video_ids`` with at most ``concurrency`` in flight; yield results as they finish.
+
+    IDs are consumed lazily, so a file of any length streams through.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="prefetch") as pool:
+        pending: set[Future[PrefetchResult]] = set()
+        for video_id in video_ids:
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            pending.add(
+                pool.submit(
+                    prefetch_video,
+                    video_id,
+                    settings,
+                    language=language,
+                    force=force,
+                ),
+            )
+        for future in pending:
+            yield future.result()
+
+
+def run(args: argparse.Namespace, settings: Settings) -> None:
+    """Entry point of the ``prefetch`` subcommand; exits with status 2 on unusable settings."""
+    if args.concurrency < 1:
+        my_logger.error(f"--concurrency must be at least 1, got {args.concurrency}")
+        sys.exit(2)
+    if settings.metadata_ttl_hours <= 0:
+        # Metadata would be fetched and thrown away, and the report would read
+        # as a warm cache while every later run still extracts it again.
+        my_logger.error(
+            "METADATA_TTL_HOURS=0 disables the metadata cache; nothing to prefetch into",
+        )
+        sys.exit(2)
+    YOUTUBE_LIMITER.configure(args.rate, state_path=settings.cache_dir / RATE_STATE_FILE)
+    report = args.report or settings.output_dir / "prefetch report.csv"
+    report.parent.mkdir(parents=True, exist_ok=True)
+    ids_file = (
+        contextlib.nullcontext(sys.stdin)
+        if args.ids_file == "-"
+        else Path(args.ids_file).open(encoding="utf-8")  # noqa: SIM115 — closed by the with below
+    )
+    counts: Counter[str] = Counter()
+    with ids_file as source, report.open("w", newline="", encoding="utf-8") as out:
+        writer = csv.writer(out)
+        writer.writerow(field.name for field in fields(PrefetchResult))
+        for result in prefetch(
+            read_video_ids(source),
+            settings,
+            concurrency=args.concurrency,
+            language=args.language,
+            force=args.force,
+        ):
+            writer.writerow(astuple(result))
+            out.flush()
+            counts[result.status] += 1
+            my_logger.debug(f"{result.video_id}: {result.status} {result.detail}")
+    my_logger.info(
+        f"Prefetched {counts.total()} videos: {counts['captions']} with captions, "
+        f"{counts['whisper']} need whisper, {counts['error']} failed. Report: {report}",
+    )
@@ -15,6 +15,12 @@ _DEFAULT_OLLAMA_MODEL = "mistral"
 _DEFAULT_LLM_PROVIDER = "openai"
 _DEFAULT_WRAP_WIDTH = 80
 _DEFAULT_SUMMARY_MODE = "auto"
+_DEFAULT_MODEL_MEMORY_BUDGET_MB = 0  # 0 = unbounded
+_DEFAULT_SPEECH_DETECTION = "diarization"
+_DEFAULT_DIARIZATION_WINDOW_MINUTES = 0  # 0 = diarize the whole file at once
+_DEFAULT_METADATA_TTL_HOURS = 168  # 0 = do not cache video metadata
+_DEFAULT_SUMMARY_CONCURRENCY = 4  # chapter summaries requested at once
+_DEFAULT_YOUTUBE_RATE_LIMIT = 0.0  # requests/second across processes; 0 = no cap
 
 
 def _load_dotenv(path: Path = Path(".env")) -> None:
@@ -51,8 +57,16 @@ class Settings:
     whisper_model_size: str = _DEFAULT_WHISPER_MODEL_SIZE
     output_dir: Path = field(default_factory=lambda: Path("results"))
     downloads_dir: Path = field(default_factory=lambda: Path("downloads"))
+    cache_dir: Path = field(default_factory=lambda: Path("cache"))
+    speaker_index_path: Path = field(default_factory=lambda: Path("speakers.npz"))
     wrap_width: int = _DEFAULT_WRAP_WIDTH
     summary_mode: str = _DEFAULT_SUMMARY_MODE
+    model_memory_budget_mb: int = _DEFAULT_MODEL_MEMORY_BUDGET_MB
+    speech_detection: str = _DEFAULT_SPEECH_DETECTION
+    diarization_window_minutes: int = _DEFAULT_DIARIZATION_WINDOW_MINUTES
+    metadata_ttl_hours: int = _DEFAULT_METADATA_TTL_HOURS
+    summary_concurrency: int = _DEFAULT_SUMMARY_CONCURRENCY
+    youtube_rate_limit: float = _DEFAULT_YOUTUBE_RATE_LIMIT
 
     @classmethod
     def from_env(cls) -> Settings:
@@ -73,6 +87,27 @@ class Settings:
             ),
             output_dir=Path(os.environ.get("OUTPUT_DIR", "results")),
             downloads_dir=Path(os.environ.get("DOWNLOADS_DIR", "downloads")),
+            cache_dir=Path(os.environ.get("CACHE_DIR", "cache")),
+            speaker_index_path=Path(os.environ.get("SPEAKER_INDEX", "speakers.npz")),
             wrap_width=int(os.environ.get("WRAP_WIDTH", str(_DEFAULT_WRAP_WIDTH))),
             summary_mode=os.environ.get("SUMMARY_MODE", _DEFAULT_SUMMARY_MODE),
+            model_memory_budget_mb=int(
+                os.environ.get("MODEL_MEMORY_BUDGET_MB", str(_DEFAULT_MODEL_MEMORY_BUDGET_MB)),
+            ),
+            speech_detection=os.environ.get("SPEECH_DETECTION", _DEFAULT_SPEECH_DETECTION),
+            diarization_window_minutes=int(
+                os.environ.get(
+                    "DIARIZATION_WINDOW_MINUTES",
+                    str(_DEFAULT_DIARIZATION_WINDOW_MINUTES),
+                ),
+            ),
+            metadata_ttl_hours=int(
+                os.environ.get("METADATA_TTL_HOURS", str(_DEFAULT_METADATA_TTL_HOURS)),
+            ),
+            summary_concurrency=int(
+                os.environ.get("SUMMARY_CONCURRENCY", str(_DEFAULT_SUMMARY_CONCURRENCY)),
+            ),
+            youtube_rate_limit=float(
+                os.environ.get("YOUTUBE_RATE_LIMIT", str(_DEFAULT_YOUTUBE_RATE_LIMIT)),
+            ),
         )
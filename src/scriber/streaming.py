@@ -0,0 +1,88 @@
+"""Segment-by-segment transcript output while whisper is still decoding.
+
+:class:`TranscriptStreamWriter` appends each whisper segment to the ``.txt``
+(soft-wrapped) and, optionally, the ``.srt`` / ``.vtt`` outputs as soon as it
+is produced, so a 3-hour file shows progress within minutes instead of
+after the whole run.
+
+While streaming, output goes to ``<name>.part`` siblings; they are renamed
+to their final names only once the stream completes. A crashed run therefore
+never leaves a truncated ``.txt`` that the transcript cache would later
+mistake for a finished one.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self, TextIO
+
+from scriber.formatting import LineWrapper
+from scriber.logger import my_logger
+from scriber.subtitles import VTT_HEADER, srt_cue, vtt_cue
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+
+def _part(path: Path) -> Path:
+    return path.with_name(f"{path.name}.part")
+
+
+class TranscriptStreamWriter:
+    """Context manager appending whisper-style segments to transcript + subtitle files."""
+
+    def __init__(
+        self,
+        txt_path: Path,
+        *,
+        wrap_width: int,
+        srt_path: Path | None = None,
+        vtt_path: Path | None = None,
+    ) -> None:
+        """Bind output paths; nothing is opened until ``__enter__``."""
+        self.paths = [p for p in (txt_path, srt_path, vtt_path) if p is not None]
+        self._txt_path = txt_path
+        self._srt_path = srt_path
+        self._vtt_path = vtt_path
+        self._wrapper = LineWrapper(wrap_width)
+        self._files: dict[Path, TextIO] = {}
+        self._cues = 0
+
+    def __enter__(self) -> Self:
+        """Open the ``.part`` files for writing."""
+        self._txt_path.parent.mkdir(parents=True, exist_ok=True)
+        for path in self.paths:
+            # Line-buffered so `tail -f` on a .part file sees each segment.
+            self._files[path] = _part(path).open("w", encoding="utf8", buffering=1)
+        if self._vtt_path is not None:
+            self._files[self._vtt_path].write(VTT_HEADER)
+        my_logger.info(f"Streaming transcript to {_part(self._txt_path)}")
+        return self
+
+    def write(self, segment: dict[str, Any]) -> None:
+        """Append one segment to every open output."""
+        self._cues += 1
+        txt = self._files[self._txt_path]
+        for line in self._wrapper.feed(str(segment.get("text", ""))):
+            txt.write(f"{line}\n")
+        if self._srt_path is not None:
+            separator = "\n" if self._cues > 1 else ""
+            self._files[self._srt_path].write(separator + srt_cue(self._cues, segment))
+        if self._vtt_path is not None:
+            self._files[self._vtt_path].write(f"\n{vtt_cue(segment)}")
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close outputs; promote ``.part`` files to final names only on success."""
+        self._files[self._txt_path].write(self._wrapper.flush())
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+        if exc_type is not None:
+            return
+        for path in self.paths:
+            _part(path).replace(path)
@@ -5,7 +5,9 @@ Whisper returns ``segments`` like::
     [{"start": 0.0, "end": 2.4, "text": " Hello world"}, ...]
 
 We accept that loose shape (a list of dicts with ``start``/``end``/``text``)
-and emit standard SRT and VTT files.
+and emit standard SRT and VTT files. Diarized segments also carry a
+``speaker`` key, rendered as a ``SPEAKER: `` prefix in SRT and as a WebVTT
+voice tag (``<v SPEAKER>``).
 """
 
 from __future__ import annotations
@@ -30,28 +32,37 @@ def _format_timestamp(seconds: float, *, separator: str) -> str:
     return f"{h:02d}:{m:02d}:{s:02d}{separator}{ms:03d}"
 
 
+def srt_cue(index: int, seg: dict[str, Any]) -> str:
+    """Return one SRT cue (index, timing line, text) terminated by a newline."""
+    start = _format_timestamp(float(seg.get("start", 0.0)), separator=",")
+    end = _format_timestamp(float(seg.get("end", 0.0)), separator=",")
+    text = str(seg.get("text", "")).strip()
+    if "speaker" in seg:
+        text = f"{seg['speaker']}: {text}"
+    return f"{index}\n{start} --> {end}\n{text}\n"
+
+
+def vtt_cue(seg: dict[str, Any]) -> str:
+    """Return one WebVTT cue (timing line, text) terminated by a newline."""
+    start = _format_timestamp(float(seg.get("start", 0.0)), separator=".")
+    end = _format_timestamp(float(seg.get("end", 0.0)), separator=".")
+    text = str(seg.get("text", "")).strip()
+    if "speaker" in seg:
+        text = f"<v {seg['speaker']}>{text}"
+    return f"{start} --> {end}\n{text}\n"
+
+
+VTT_HEADER = "WEBVTT\n"
+"""First line of every WebVTT file; each cue follows after a blank line."""
+
+
 def write_srt(segments: list[dict[str, Any]], path: Path) -> None:
     """Write whisper-style segments to ``path`` in SRT format."""
-    lines: list[str] = []
-    for i, seg in enumerate(segments, start=1):
-        start = _format_timestamp(float(seg.get("start", 0.0)), separator=",")
-        end = _format_timestamp(float(seg.get("end", 0.0)), separator=",")
-        text = str(seg.get("text", "")).strip()
-        lines.append(str(i))
-        lines.append(f"{start} --> {end}")
-        lines.append(text)
-        lines.append("")  # blank line between cues
-    path.write_text("\n".join(lines), encoding="utf-8")
+    cues = [srt_cue(i, seg) for i, seg in enumerate(segments, start=1)]
+    path.write_text("\n".join(cues), encoding="utf-8")  # blank line between cues
 
 
 def write_vtt(segments: list[dict[str, Any]], path: Path) -> None:
     """Write whisper-style segments to ``path`` in WebVTT format."""
-    lines: list[str] = ["WEBVTT", ""]
-    for seg in segments:
-        start = _format_timestamp(float(seg.get("start", 0.0)), separator=".")
-        end = _format_timestamp(float(seg.get("end", 0.0)), separator=".")
-        text = str(seg.get("text", "")).strip()
-        lines.append(f"{start} --> {end}")
-        lines.append(text)
-        lines.append("")
-    path.write_text("\n".join(lines), encoding="utf-8")
+    cues = [f"\n{vtt_cue(seg)}" for seg in segments]
+    path.write_text(VTT_HEADER + "".join(cues), encoding="utf-8")
@@ -1,10 +1,17 @@
 """Markdown formatter for Obsidian-compatible meeting summaries."""
 
+from __future__ import annotations
+
 import re
+from typing import TYPE_CHECKING
 
+from scriber.chapters import format_offset, timestamp_url
 from scriber.constants import RAG_SECTION_TITLES
 from scriber.logger import my_logger
 
+if TYPE_CHECKING:
+    from scriber.model import Chapter
+
 
 def extract_sections(summary: str, language: str) -> dict[str, str]:
     """Return mapping of section title -> content from raw text.
@@ -81,6 +88,32 @@ def format_summary_markdown(raw_summary: str, filename_stem: str, language: str)
     return "\n".join(lines)
 
 
+def format_chapter_summaries(
+    summaries: list[tuple[Chapter, str]],
+    video_url: str,
+    language: str,
+) -> str:
+    """Return per-chapter summaries as a linked table of contents followed by one section each.
+
+    Args:
+        summaries (list[tuple[Chapter, str]]): Each chapter with its summary, in order.
+        video_url (str): The video URL the ``?t=<ss>`` deep-links point into.
+        language (str): 'fr' or 'en'
+
+    Returns:
+        str: Markdown body, to be wrapped by :func:`simple_format_markdown`.
+
+    """
+    heading = "Chapitres" if language == "fr" else "Chapters"
+    toc = [f"#### {heading}"]
+    sections: list[str] = []
+    for chapter, summary in summaries:
+        link = f"[{format_offset(chapter.start)}]({timestamp_url(video_url, chapter.start)})"
+        toc.append(f"- {link} {chapter.title}")
+        sections.append(f"#### {link} {chapter.title}\n{summary.strip()}")
+    return "\n".join(toc) + "\n\n" + "\n\n".join(sections)
+
+
 def simple_format_markdown(
     video_title: str,
     video_path: str,
@@ -2,19 +2,22 @@
 
 from __future__ import annotations
 
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 import openai
 from openai import OpenAI
 
+from scriber.chapters import split_by_chapters
 from scriber.logger import my_logger
-from scriber.summarizers.markdown import simple_format_markdown
+from scriber.summarizers.markdown import format_chapter_summaries, simple_format_markdown
 
 from .base import analyze_sentiment
 from .modes import get_prompt, resolve_mode
 
 if TYPE_CHECKING:
-    from scriber.model import Transcript
+    from scriber.model import Chapter, Transcript
     from scriber.settings import Settings
 
 
@@ -41,20 +44,9 @@ class OpenAICompatibleSummarizer:
         """Return the model id sent in the API call (CLI/env overrides win)."""
         return self.settings.llm_model or self.settings.openai_model
 
-    def summarize(self, transcript: Transcript, *, input_path: str) -> None:
-        """Send the prompt to the API and write the resulting summary to disk."""
-        from typing import cast
-
-        from .modes import SummaryMode
-
-        mode = resolve_mode(cast(SummaryMode, self.settings.summary_mode), transcript)
-        prompt = get_prompt(mode, transcript.language) + transcript.text
-        my_logger.info(f"Summary mode: {mode}")
-
-        sentiment = analyze_sentiment(transcript.text)
-
+    def _complete(self, client: OpenAI, prompt: str) -> str | None:
+        """Return the model's answer to ``prompt``, or ``None`` (logged) on failure."""
         try:
-            client = self._build_client()
             response = client.chat.completions.create(
                 model=self._model_name(),
                 messages=[
@@ -64,20 +56,73 @@ class OpenAICompatibleSummarizer:
             )
         except openai.AuthenticationError:
             my_logger.exception("AuthenticationError while performing API request")
-            return
+            return None
         except openai.APITimeoutError:
             my_logger.exception("Timeout while performing API request")
-            return
+            return None
         except openai.OpenAIError:
             my_logger.exception(
                 "API error — is the relevant API key set in .env or the environment?",
             )
-            return
+            return None
 
         content = response.choices[0].message.content
         if content is None:
             my_logger.error("LLM returned empty content")
+        return content
+
+    def _summarize_chapters(
+        self,
+        client: OpenAI,
+        instructions: str,
+        chapters: list[tuple[Chapter, str]],
+    ) -> list[tuple[Chapter, str]] | None:
+        """Summarize every chapter, ``summary_concurrency`` requests at a time; ``None`` if any fails."""
+        prompts = [f"{instructions}[{chapter.title}]\n{text}" for chapter, text in chapters]
+        workers = max(1, min(self.settings.summary_concurrency, len(prompts)))
+        my_logger.info(f"Summarizing {len(prompts)} chapters, {workers} at a time")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary") as pool:
+            results = list(pool.map(functools.partial(self._complete, client), prompts))
+        summaries: list[tuple[Chapter, str]] = []
+        for (chapter, _), result in zip(chapters, results, strict=True):
+            if result is None:
+                return None
+            summaries.append((chapter, result))
+        return summaries
+
+    def summarize(self, transcript: Transcript, *, input_path: str) -> None:
+        """Send the prompt to the API and write the resulting summary to disk.
+
+        A video with chapters and a timed transcript is summarized chapter by
+        chapter, in parallel, into one file with a deep-link to each chapter.
+        """
+        from typing import cast
+
+        from .modes import SummaryMode
+
+        mode = resolve_mode(cast(SummaryMode, self.settings.summary_mode), transcript)
+        instructions = get_prompt(mode, transcript.language)
+        my_logger.info(f"Summary mode: {mode}")
+
+        sentiment = analyze_sentiment(transcript.text)
+        chapters = split_by_chapters(transcript.segments, transcript.chapters)
+
+        try:
+            client = self._build_client()
+        except openai.OpenAIError:
+            my_logger.exception(
+                "API error — is the relevant API key set in .env or the environment?",
+            )
             return
+        if len(chapters) > 1:
+            summaries = self._summarize_chapters(client, instructions, chapters)
+            if summaries is None:
+                return
+            content = format_chapter_summaries(summaries, input_path, transcript.language)
+        else:
+            content = self._complete(client, instructions + transcript.text)
+            if content is None:
+                return
 
         markdown_output = simple_format_markdown(
             transcript.title,
@@ -0,0 +1,111 @@
+"""On-disk cache of parsed YouTube caption tracks.
+
+With the metadata cached (see :mod:`~scriber.transcription.metadata_cache`),
+the caption download was the last request a re-run of a captioned video
+still made. :class:`CaptionCache` keeps the parsed text and cue segments of
+each fetched track in ``<cache_dir>/captions.sqlite``, keyed by
+``(video_id, lang_key, kind)``, together with the source format and fetch
+time, so re-summarizing an old corpus reads its captions from disk.
+
+Published captions rarely change, so entries do not expire; ``--force``
+refetches. Entries written by an older parser (``PARSER_VERSION``) are
+ignored.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Any, cast
+
+from scriber.logger import my_logger
+from scriber.transcription.youtube_captions import CaptionKind, CaptionTrack
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+# Bump when caption parsing changes what is stored, to retire older entries.
+PARSER_VERSION = 2  # 2: manual SRT/VTT tracks no longer go through the overlap filter
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS captions (
+    video_id TEXT NOT NULL,
+    lang_key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    parser_version INTEGER NOT NULL,
+    source_format TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    text TEXT NOT NULL,
+    segments TEXT NOT NULL,
+    PRIMARY KEY (video_id, lang_key, kind)
+)
+"""
+
+
+class CaptionCache:
+    """Store and retrieve parsed caption tracks per ``(video_id, lang_key, kind)``."""
+
+    def __init__(self, root: Path) -> None:
+        """Cache entries in ``root / "captions.sqlite"``."""
+        self.path = root / "captions.sqlite"
+
+    @contextlib.contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.closing(sqlite3.connect(self.path, timeout=30.0)) as conn:
+            conn.execute(_SCHEMA)
+            with conn:  # commit on success, roll back on error
+                yield conn
+
+    def load(self, video_id: str, lang_key: str, kind: CaptionKind) -> CaptionTrack | None:
+        """Return the cached track, or ``None`` on a miss, an old entry or an unreadable one."""
+        if not self.path.exists():
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT parser_version, text, segments FROM captions "
+                    "WHERE video_id = ? AND lang_key = ? AND kind = ?",
+                    (video_id, lang_key, kind),
+                ).fetchone()
+            if row is None or int(row[0]) != PARSER_VERSION:
+                return None
+            segments = cast(list[dict[str, Any]], json.loads(row[2]))
+        except (sqlite3.Error, ValueError):
+            my_logger.warning(f"Ignoring unreadable caption cache entry for {video_id}")
+            return None
+        my_logger.info(f'Using cached {kind} captions "{lang_key}" for {video_id}')
+        return CaptionTrack(
+            text=str(row[1]),
+            lang=lang_key.split("-", maxsplit=1)[0],
+            kind=kind,
+            segments=segments,
+        )
+
+    def save(
+        self,
+        video_id: str,
+        lang_key: str,
+        track: CaptionTrack,
+        source_format: str,
+    ) -> None:
+        """Store ``track`` (fetched as ``source_format``), replacing any older entry."""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO captions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        video_id,
+                        lang_key,
+                        track.kind,
+                        PARSER_VERSION,
+                        source_format,
+                        time.time(),
+                        track.text,
+                        json.dumps(track.segments),
+                    ),
+                )
+        except sqlite3.Error as exc:
+            my_logger.warning(f"Could not cache captions for {video_id}: {exc}")
@@ -0,0 +1,126 @@
+# Boundary to partially-typed numpy / ffmpeg APIs.
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+"""Speaker turns from channel-separated recordings, without a neural model.
+
+Call recordings and many podcasts put each participant on their own channel.
+There, "who speaks when" is just "which channel is loud when": frame
+energies per channel, a dominance test against the loudest channel (to
+ignore crosstalk bleeding into the other mics), and run-length encoding.
+That costs milliseconds where pyannote costs minutes, so the diarized path
+tries it first when ``--channel-speakers`` is set and falls back to pyannote
+when the channels do not look separated (e.g. a stereo mix of one room).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+import ffmpeg
+import numpy as np
+
+from scriber.logger import my_logger
+from scriber.transcription.turns import SpeakerTurns
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+SAMPLE_RATE = 16_000
+FRAME_SECONDS = 0.05
+_SILENCE_DB = -45.0  # frames quieter than this (dBFS) on every channel are silence
+_BLEED_DB = 12.0  # a channel this far below the loudest one only carries crosstalk
+_MIN_EXCLUSIVE = 0.7  # share of active frames with a single speaking channel
+_MIN_CHANNEL_SHARE = 0.05  # each speaking channel holds at least this share of the speech
+_FILL_GAP_SECONDS = 0.3  # same-channel pauses shorter than this stay inside one turn
+_MIN_SPEAKERS = 2
+
+
+def load_audio_channels(path: str) -> npt.NDArray[np.float32]:
+    """Decode ``path`` to 16 kHz float32 ``(channels, samples)``, keeping every channel."""
+    probe = cast(dict[str, Any], ffmpeg.probe(path))
+    streams = [s for s in probe["streams"] if s.get("codec_type") == "audio"]
+    if not streams:
+        err_msg = f"No audio stream in {path}"
+        raise ValueError(err_msg)
+    channels = int(streams[0]["channels"])
+    out, _ = (
+        ffmpeg.input(path)
+        .output("-", format="s16le", acodec="pcm_s16le", ar=str(SAMPLE_RATE))
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    samples = np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+    return samples[: len(samples) // channels * channels].reshape(-1, channels).T.copy()
+
+
+def _frame_db(audio: npt.NDArray[np.float32], frame: int) -> npt.NDArray[np.float64]:
+    """Per-channel frame energy in dBFS, shape ``(channels, frames)``."""
+    usable = audio[:, : audio.shape[1] // frame * frame].astype(np.float64)
+    power = (usable.reshape(audio.shape[0], -1, frame) ** 2).mean(axis=2)
+    return 10.0 * np.log10(np.maximum(power, 1e-12))
+
+
+def channel_turns(
+    audio: npt.NDArray[np.float32],
+    sample_rate: int = SAMPLE_RATE,
+) -> tuple[SpeakerTurns, tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]] | None:
+    """Return ``(turns, speech regions)`` if ``audio`` has one speaker per channel, else ``None``.
+
+    ``audio`` is ``(channels, samples)``. Channel ``i`` becomes speaker
+    ``SPEAKER_{i:02d}``. A channel speaks in a frame when it is above the
+    silence floor and within ``_BLEED_DB`` of the loudest channel; the
+    recording counts as channel-separated when most speech frames have a
+    single speaking channel and at least two channels speak.
+    """
+    if audio.ndim != 2 or audio.shape[0] < _MIN_SPEAKERS:
+        return None
+    frame = int(FRAME_SECONDS * sample_rate)
+    db = _frame_db(audio, frame)
+    loudest = db.max(axis=0)
+    speaking = (db > _SILENCE_DB) & (db >= loudest - _BLEED_DB)
+    active = speaking.any(axis=0)
+    if not active.any():
+        return None
+    exclusive = float((speaking.sum(axis=0) == 1)[active].mean())
+    shares = speaking[:, active].mean(axis=1)
+    talkers = int((shares >= _MIN_CHANNEL_SHARE).sum())
+    my_logger.debug(
+        f"Channel separation: {exclusive:.0%} single-channel speech, "
+        f"channel shares {np.round(shares, 2).tolist()}",
+    )
+    if exclusive < _MIN_EXCLUSIVE or talkers < _MIN_SPEAKERS:
+        return None
+
+    seconds = frame / sample_rate
+    fill = _FILL_GAP_SECONDS / seconds
+    labels: list[str] = []
+    starts: list[npt.NDArray[np.float64]] = []
+    ends: list[npt.NDArray[np.float64]] = []
+    for channel, row in enumerate(speaking):
+        first, last = _runs(row, fill)
+        if not len(first):
+            continue
+        labels.extend([f"SPEAKER_{channel:02d}"] * len(first))
+        starts.append(first * seconds)
+        ends.append(last * seconds)
+    all_starts, all_ends = np.concatenate(starts), np.concatenate(ends)
+    names = tuple(dict.fromkeys(labels))
+    codes = np.array([names.index(label) for label in labels], dtype=np.intp)
+    turns = SpeakerTurns(names, codes, all_starts, all_ends).sorted()
+    speech_first, speech_last = _runs(active, fill)
+    my_logger.info(
+        f"\tChannel-separated speakers: {len(names)} channels, {len(turns)} turns "
+        "(skipping neural diarization)",
+    )
+    return turns, (speech_first * seconds, speech_last * seconds)
+
+
+def _runs(
+    mask: npt.NDArray[np.bool_],
+    fill: float,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Return ``(first, end)`` frame indices of the True runs, bridging gaps up to ``fill``."""
+    edges = np.flatnonzero(np.diff(np.r_[0, mask.astype(np.int8), 0]))
+    first, last = edges[0::2].astype(np.float64), edges[1::2].astype(np.float64)
+    if len(first) > 1:
+        keep = np.r_[True, first[1:] - last[:-1] > fill]
+        first, last = first[keep], np.r_[last[:-1][keep[1:]], last[-1]]
+    return first, last
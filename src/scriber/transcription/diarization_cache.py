@@ -0,0 +1,101 @@
+# Boundary to partially-typed numpy APIs.
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+"""On-disk cache of diarization results, keyed by audio content.
+
+Diarization and VAD depend only on the audio (plus the pipelines that
+produced them), not on ``--model-size`` or ``--language``. Re-running a
+meeting with different whisper settings therefore reuses the stored speaker
+turns, voice embeddings and speech regions instead of repeating the pyannote
+pass — on CPU often the slowest step of the whole run.
+
+Entries are ``.npz`` files under ``<cache_dir>/diarization/``, named by a
+hash of the audio fingerprint, the pipeline ids, and the installed
+``pyannote.audio`` version, so an upgrade or a different
+``speech_detection`` mode never serves stale turns.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import zipfile
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from scriber.logger import my_logger
+from scriber.transcription.turns import SpeakerTurns
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import numpy.typing as npt
+
+
+def _pyannote_version() -> str:
+    try:
+        return importlib.metadata.version("pyannote.audio")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class DiarizationCache:
+    """Store and retrieve ``(SpeakerTurns, speech regions)`` per audio + pipeline."""
+
+    def __init__(self, root: Path) -> None:
+        """Cache entries under ``root / "diarization"``."""
+        self.root = root / "diarization"
+
+    def path_for(self, fingerprint: str, pipelines: tuple[str, ...]) -> Path:
+        """Return the entry path for audio ``fingerprint`` diarized by ``pipelines``."""
+        key = "|".join((fingerprint, *pipelines, _pyannote_version()))
+        return self.root / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.npz"
+
+    def load(
+        self,
+        fingerprint: str,
+        pipelines: tuple[str, ...],
+    ) -> tuple[SpeakerTurns, tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]] | None:
+        """Return the cached result, or ``None`` on a miss or an unreadable entry."""
+        path = self.path_for(fingerprint, pipelines)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                turns = SpeakerTurns(
+                    names=tuple(str(name) for name in data["names"]),
+                    codes=data["codes"].astype(np.intp),
+                    starts=data["starts"],
+                    ends=data["ends"],
+                    voices=data["voices"] if data["voices"].size else None,
+                )
+                speech = (data["speech_starts"], data["speech_ends"])
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            my_logger.warning(f"Ignoring unreadable diarization cache entry {path}")
+            return None
+        my_logger.info(f"\tUsing cached diarization ({len(turns)} turns) from {path}")
+        return turns, speech
+
+    def save(
+        self,
+        fingerprint: str,
+        pipelines: tuple[str, ...],
+        turns: SpeakerTurns,
+        speech: tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]],
+    ) -> Path:
+        """Store a result atomically (temp file + rename); return its path."""
+        path = self.path_for(fingerprint, pipelines)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.tmp.npz")
+        np.savez(
+            tmp,
+            names=np.array(turns.names, dtype=str),
+            codes=turns.codes,
+            starts=turns.starts,
+            ends=turns.ends,
+            voices=np.empty((0, 0), dtype=np.float32) if turns.voices is None else turns.voices,
+            speech_starts=speech[0],
+            speech_ends=speech[1],
+        )
+        tmp.replace(path)
+        return path
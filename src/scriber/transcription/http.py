@@ -0,0 +1,56 @@
+"""Process-wide HTTP session for direct requests to YouTube (captions, ...).
+
+One keep-alive :class:`requests.Session` is shared by every caller, so a
+batch of videos reuses its TLS connections instead of opening one per
+request. Transient server errors are retried with backoff by the adapter;
+everything else surfaces as :class:`requests.RequestException`.
+"""
+
+from __future__ import annotations
+
+import functools
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scriber.transcription import replay
+from scriber.transcription.rate_limit import YOUTUBE_LIMITER
+
+REQUEST_TIMEOUT: float = 30.0  # seconds, connect + read
+_POOL_SIZE = 8
+_RETRIES = Retry(total=2, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+
+
+@functools.cache
+def session() -> requests.Session:
+    """Return the shared session (created on first use)."""
+    shared = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE, max_retries=_RETRIES
+    )
+    shared.mount("https://", adapter)
+    shared.mount("http://", adapter)
+    return shared
+
+
+def get_text(url: str) -> str:
+    """GET ``url`` through the shared session and return the body as text.
+
+    Under ``YT_REPLAY_DIR`` the body comes from, or is saved to, a recording
+    (see :mod:`~scriber.transcription.replay`). A 429 is retried after a
+    backoff shared by every caller (see :mod:`~scriber.transcription.rate_limit`).
+
+    Raises:
+        requests.RequestException: Network failure or non-2xx status.
+        YouTubeThrottledError: Still answered 429 after the retries.
+
+    """
+    return YOUTUBE_LIMITER.call(functools.partial(replay.get_text, url, _fetch))
+
+
+def _fetch(url: str) -> str:
+    response = session().get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    response.encoding = response.encoding or "utf-8"
+    return response.text
@@ -3,8 +3,13 @@
 # pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false, reportUnknownParameterType=false
 """Retrieve the text transcript from a local media file."""
 
+import dataclasses
+import functools
 import os
 import tempfile
+import time
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, cast
 
@@ -12,17 +17,45 @@ import ffmpeg
 import numpy as np
 import numpy.typing as npt
 import torch.cuda
-import torchaudio
 import whisper
 from pyannote.audio import Pipeline
-from pyannote.core import Segment, Timeline
+from pyannote.core import Annotation, Segment, Timeline
 from tqdm import tqdm
 
 from scriber.logger import my_logger
-
-MIN_SEGMENT_DURATION: float = 1.5  # seconds; skip whisper output shorter than this
+from scriber.transcription.channels import channel_turns, load_audio_channels
+from scriber.transcription.checkpoint import (
+    Checkpoint,
+    append_checkpoint,
+    audio_fingerprint,
+    load_checkpoint,
+    save_checkpoint,
+)
+from scriber.transcription.diarization_cache import DiarizationCache
+from scriber.transcription.models import MODEL_REGISTRY
+from scriber.transcription.speakers import SpeakerClusters, SpeakerIndex, usable_voice
+from scriber.transcription.turns import (
+    SpeakerTurns,
+    assign_speakers,
+    speaker_text,
+    speech_regions,
+)
+
+MIN_SEGMENT_DURATION: float = 1.5  # seconds; skip speaker turns shorter than this
 _MAX_SPEAKER_GAP: float = 1.0  # seconds; merge consecutive same-speaker segments within this gap
-_MODEL_CACHE: dict[tuple[str, str], whisper.Whisper] = {}
+DIARIZATION_PIPELINE = "pyannote/speaker-diarization-3.1"
+VAD_PIPELINE = "pyannote/voice-activity-detection"
+SPEECH_DETECTION_MODES = ("diarization", "vad")
+LANGUAGE_MAX_WINDOWS: int = 6  # 30 s windows considered for language detection
+LANGUAGE_BATCH_SIZE: int = 3  # windows per batched encoder pass
+LANGUAGE_CONFIDENCE: float = 0.8  # averaged top probability needed to stop early
+STREAM_CHUNK_SECONDS: float = 300.0  # audio handed to whisper per call when streaming
+_PROMPT_TAIL_CHARS = 200  # previous text carried into the next chunk as initial_prompt
+_MIN_CHUNK_ADVANCE: float = 1.0  # seconds; keep a boundary segment rather than advance less
+WINDOW_OVERLAP_SECONDS: float = 30.0  # shared audio between consecutive diarization windows
+
+AudioInput = str | Mapping[str, Any]
+"""A path, or an in-memory ``{"waveform": (channel, time) tensor, "sample_rate": int}``."""
 
 
 class TqdmProgressBar:
@@ -46,8 +79,12 @@ def patch_whisper_progress_bar() -> None:
     cast(Any, whisper).utils.ProgressBar = TqdmProgressBar
 
 
-def extract_audio(input_file: str, output_format: str = "wav") -> str:
-    """Extract audio from a video file and returns the path to the audio file."""
+def extract_audio(input_file: str, output_format: str = "wav", channels: int | None = 1) -> str:
+    """Extract audio from a video file and returns the path to the audio file.
+
+    ``channels=None`` keeps the source channel layout (see
+    :mod:`~scriber.transcription.channels`); the default downmixes to mono.
+    """
     if not Path(input_file).exists():
         err_msg = f"File not found: {input_file}"
         raise FileNotFoundError(err_msg)
@@ -56,11 +93,12 @@ def extract_audio(input_file: str, output_format: str = "wav") -> str:
     with tempfile.NamedTemporaryFile(suffix=f".{output_format}", delete=False) as tmp_audio_file:
         tmp_audio_path = tmp_audio_file.name
 
+    layout = {} if channels is None else {"ac": channels}
     ffmpeg.input(input_file).output(
         tmp_audio_path,
         format=output_format,
-        ac=1,
         ar="16000",
+        **layout,
     ).run(quiet=True, overwrite_output=True)
     return tmp_audio_path
 
@@ -70,33 +108,322 @@ def get_device() -> str:
     return "cuda" if torch.cuda.is_available() else "cpu"
 
 
-def detect_language(audio_file: str, model: whisper.Whisper, device: str) -> str:
-    """Detect the language of the audio file using Whisper."""
-    audio = whisper.load_audio(audio_file)
-    audio = whisper.pad_or_trim(audio)
-    mel = whisper.log_mel_spectrogram(audio).to(device)
-    _, probs = model.detect_language(mel)
-    probs_dict = cast(dict[str, float], probs)
-    return max(probs_dict, key=lambda k: probs_dict[k])
+def _pick_language_windows(
+    audio: npt.NDArray[np.float32],
+    max_windows: int,
+) -> list[int]:
+    """Return start samples of up to ``max_windows`` 30 s windows, loudest first.
+
+    The file is split into ``max_windows`` equal regions and the
+    highest-energy window of each region is kept, so the picks are spread
+    over the whole recording instead of clustering on one loud passage —
+    and a silent or music-only intro never decides the language on its own.
+    """
+    window = whisper.audio.N_SAMPLES
+    hop = whisper.audio.SAMPLE_RATE  # candidate starts every second
+    n_starts = (len(audio) - window) // hop + 1
+    if n_starts <= 1:
+        return [0]
+
+    # Per-second energy, then a sliding 30 s sum via cumsum — O(len(audio)).
+    n_seconds = len(audio) // hop
+    frame_energy = np.square(audio[: n_seconds * hop].reshape(n_seconds, hop)).sum(axis=1)
+    cumulative = np.concatenate(([0.0], np.cumsum(frame_energy)))
+    frames_per_window = window // hop
+    window_energy = (
+        cumulative[frames_per_window : frames_per_window + n_starts] - cumulative[:n_starts]
+    )
+
+    regions = np.array_split(np.arange(n_starts), min(max_windows, n_starts))
+    picks = [int(region[np.argmax(window_energy[region])]) for region in regions if len(region)]
+    picks.sort(key=lambda i: -window_energy[i])
+    return [i * hop for i in picks]
+
+
+def detect_language(
+    audio_file: str | npt.NDArray[np.float32],
+    model: whisper.Whisper,
+    device: str,
+    *,
+    max_windows: int = LANGUAGE_MAX_WINDOWS,
+    batch_size: int = LANGUAGE_BATCH_SIZE,
+    confidence: float = LANGUAGE_CONFIDENCE,
+) -> str:
+    """Detect the spoken language from several 30 s windows spread over the file.
+
+    Windows are ranked by energy and fed to whisper's encoder ``batch_size``
+    at a time. After each batch the per-window probabilities are averaged;
+    when every window so far agrees and the averaged top language reaches
+    ``confidence``, detection stops without looking at the remaining windows.
+    ``audio_file`` may also be an already-decoded 16 kHz waveform.
+    """
+    audio = whisper.load_audio(audio_file) if isinstance(audio_file, str) else audio_file
+    starts = _pick_language_windows(audio, max_windows)
+
+    totals: dict[str, float] = {}
+    votes: set[str] = set()
+    seen = 0
+    for i in range(0, len(starts), batch_size):
+        mel = torch.stack(
+            [
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(audio[start : start + whisper.audio.N_SAMPLES]),
+                    model.dims.n_mels,
+                )
+                for start in starts[i : i + batch_size]
+            ],
+        ).to(device)
+        _, batch_probs = model.detect_language(mel)
+        for probs in cast(list[dict[str, float]], batch_probs):
+            for lang, p in probs.items():
+                totals[lang] = totals.get(lang, 0.0) + p
+            votes.add(max(probs, key=lambda k: probs[k]))
+            seen += 1
+        best = max(totals, key=lambda k: totals[k])
+        if len(votes) == 1 and totals[best] / seen >= confidence:
+            break
+
+    best = max(totals, key=lambda k: totals[k])
+    my_logger.debug(
+        f"Language detection: {best!r} (p={totals[best] / seen:.2f}) "
+        f"from {seen}/{len(starts)} windows",
+    )
+    return best
 
 
 def _load_model(model_size: str, device: str) -> whisper.Whisper:
-    """Return a cached Whisper model, loading it on first use."""
-    key = (model_size, device)
-    if key not in _MODEL_CACHE:
-        _MODEL_CACHE[key] = whisper.load_model(model_size, device=device)
-    return _MODEL_CACHE[key]
+    """Return a registry-cached Whisper model, loading it on first use."""
+    return MODEL_REGISTRY.get(
+        (f"whisper:{model_size}", device),
+        lambda: whisper.load_model(model_size, device=device),
+    )
 
 
-def transcribe_audio_full(
+def preload_whisper_model(model_size: str, device: str | None = None) -> int:
+    """Load a Whisper model into the registry ahead of time; return its resident bytes."""
+    device = device or get_device()
+    return MODEL_REGISTRY.preload(
+        (f"whisper:{model_size}", device),
+        lambda: whisper.load_model(model_size, device=device),
+    )
+
+
+def evict_whisper_model(model_size: str, device: str | None = None) -> bool:
+    """Drop a Whisper model from the registry; return False when it wasn't loaded."""
+    return MODEL_REGISTRY.evict((f"whisper:{model_size}", device or get_device()))
+
+
+def _hf_token() -> str:
+    """Return ``HUGGINGFACE_TOKEN`` from the process env or raise ``OSError``."""
+    token = os.getenv("HUGGINGFACE_TOKEN")
+    if not token:
+        err_msg = "Missing Hugging Face token in HUGGINGFACE_TOKEN env variable"
+        raise OSError(err_msg)
+    return token
+
+
+def _pipeline_loader(model_id: str, device: str) -> Callable[[], Pipeline]:
+    def _load() -> Pipeline:
+        started = time.perf_counter()
+        pipeline = Pipeline.from_pretrained(model_id, use_auth_token=_hf_token())
+        pipeline.to(torch.device(device))
+        my_logger.info(
+            f"\tLoaded {model_id} on {device} in {time.perf_counter() - started:.1f}s",
+        )
+        return pipeline
+
+    return _load
+
+
+def _load_pipeline(model_id: str, device: str) -> Pipeline:
+    """Return a registry-cached pyannote pipeline, loading it on first use."""
+    return MODEL_REGISTRY.get((model_id, device), _pipeline_loader(model_id, device))
+
+
+def preload_pipeline(model_id: str, device: str | None = None) -> int:
+    """Load a pyannote pipeline into the registry ahead of time; return its resident bytes.
+
+    Batch runs call this once up front so that the per-file timings logged by
+    :func:`diarize_with_speech_timeline` / :func:`detect_speech_segments` are
+    inference only.
+    """
+    device = device or get_device()
+    return MODEL_REGISTRY.preload((model_id, device), _pipeline_loader(model_id, device))
+
+
+def _offset_segment(segment: dict[str, Any], offset: float) -> dict[str, Any]:
+    """Keep the exportable fields of a whisper segment, shifted by ``offset`` seconds."""
+    out: dict[str, Any] = {
+        "start": float(segment["start"]) + offset,
+        "end": float(segment["end"]) + offset,
+        "text": str(segment["text"]),
+    }
+    if "words" in segment:
+        out["words"] = [
+            {**word, "start": float(word["start"]) + offset, "end": float(word["end"]) + offset}
+            for word in cast(list[dict[str, Any]], segment["words"])
+        ]
+    return out
+
+
+def _iter_segments(
+    model: whisper.Whisper,
+    audio: npt.NDArray[np.float32],
+    language: str,
+    device: str,
+    *,
+    chunk_seconds: float,
+    start: float = 0.0,
+    prompt: str | None = None,
+    on_chunk: Callable[[float], None] | None = None,
+    **decode_options: Any,
+) -> Iterator[dict[str, Any]]:
+    """Yield absolute-time segments by running whisper over consecutive chunks.
+
+    A chunk's last segment may be cut mid-word by the chunk boundary, so it
+    is dropped and the next chunk starts where it started; the tail of the
+    text decoded so far is passed as ``initial_prompt`` to keep context.
+    A boundary segment starting within ``_MIN_CHUNK_ADVANCE`` of the chunk
+    start is kept instead, so every chunk moves decoding forward.
+    ``on_chunk`` is called with the new decoded-up-to offset (seconds) once a
+    chunk's segments have all been yielded.
+    """
+    sample_rate = whisper.audio.SAMPLE_RATE
+    chunk = int(chunk_seconds * sample_rate)
+    pos = int(start * sample_rate)
+    while pos < len(audio):
+        end = min(pos + chunk, len(audio))
+        result = model.transcribe(
+            audio[pos:end],
+            fp16=(device == "cuda"),
+            language=language,
+            initial_prompt=prompt,
+            **decode_options,
+        )
+        segments = cast(list[dict[str, Any]], result.get("segments", []))
+        next_pos = end
+        if end < len(audio) and segments:
+            cut = pos + int(float(segments[-1]["start"]) * sample_rate)
+            if cut - pos >= _MIN_CHUNK_ADVANCE * sample_rate:
+                next_pos = cut
+                segments = segments[:-1]
+        offset = pos / sample_rate
+        my_logger.debug(
+            f"Decoded {offset:.0f}s-{next_pos / sample_rate:.0f}s ({len(segments)} segments)",
+        )
+        for segment in segments:
+            yield _offset_segment(segment, offset)
+        if segments:
+            prompt = _prompt_tail(segments)
+        pos = next_pos
+        if on_chunk is not None:
+            on_chunk(pos / sample_rate)
+
+
+def _prompt_tail(segments: list[dict[str, Any]]) -> str:
+    return "".join(str(seg["text"]) for seg in segments)[-_PROMPT_TAIL_CHARS:]
+
+
+def _checkpointed(
+    stream: Callable[[float, str | None, Callable[[float], None]], Iterator[dict[str, Any]]],
+    path: Path,
+    state: Checkpoint,
+) -> Iterator[dict[str, Any]]:
+    """Replay ``state.segments``, then decode the rest while checkpointing each chunk.
+
+    The log is rewritten once from ``state`` (dropping any line a crash tore),
+    then each decoded chunk is appended to it.
+    """
+    yield from state.segments
+    save_checkpoint(path, state)
+    pending: list[dict[str, Any]] = []
+
+    def _save(offset: float) -> None:
+        append_checkpoint(path, offset, pending)
+        pending.clear()
+
+    prompt = _prompt_tail(state.segments) if state.segments else None
+    for segment in stream(state.offset, prompt, _save):
+        pending.append(segment)
+        yield segment
+    path.unlink(missing_ok=True)  # finished — nothing left to resume
+
+
+def _resume_state(
+    path: Path,
+    audio: npt.NDArray[np.float32],
+    model_size: str,
+    language: str | None,
+) -> tuple[str, Checkpoint | None]:
+    """Return ``(fingerprint, resumed)``: ``resumed`` is the checkpoint at ``path`` if it matches."""
+    fingerprint = audio_fingerprint(audio)
+    resumed = load_checkpoint(path)
+    if resumed is not None and not resumed.matches(fingerprint, model_size, language):
+        my_logger.info(f"Discarding stale checkpoint at {path}")
+        return fingerprint, None
+    if resumed is not None:
+        my_logger.info(
+            f"\tResuming from checkpoint at {resumed.offset:.0f}s "
+            f"({len(resumed.segments)} segments, language: {resumed.language})",
+        )
+    return fingerprint, resumed
+
+
+def _decode(
+    model: whisper.Whisper,
+    audio: npt.NDArray[np.float32],
+    device: str,
+    state: Checkpoint,
+    *,
+    chunk_seconds: float,
+    checkpoint_path: Path | None,
+    **decode_options: Any,
+) -> Iterator[dict[str, Any]]:
+    """Decode ``audio`` from ``state``, checkpointing each chunk to ``checkpoint_path`` if set."""
+    if checkpoint_path is None:
+        return _iter_segments(
+            model, audio, state.language, device, chunk_seconds=chunk_seconds, **decode_options
+        )
+
+    def _stream(
+        start: float,
+        prompt: str | None,
+        on_chunk: Callable[[float], None],
+    ) -> Iterator[dict[str, Any]]:
+        return _iter_segments(
+            model,
+            audio,
+            state.language,
+            device,
+            chunk_seconds=chunk_seconds,
+            start=start,
+            prompt=prompt,
+            on_chunk=on_chunk,
+            **decode_options,
+        )
+
+    return _checkpointed(_stream, checkpoint_path, state)
+
+
+def stream_transcription(
     audio_file: str,
     model_size: str = "base",
     language: str | None = None,
-) -> tuple[str, str, list[dict[str, Any]]]:
-    """Transcribe + return ``(text, language, segments)``.
-
-    ``segments`` is whisper's per-cue list with ``start`` / ``end`` /
-    ``text`` keys, suitable for SRT / VTT export.
+    *,
+    chunk_seconds: float = STREAM_CHUNK_SECONDS,
+    checkpoint_path: Path | None = None,
+) -> tuple[str, Iterator[dict[str, Any]]]:
+    """Start transcribing and return ``(language, segments)`` with ``segments`` lazy.
+
+    The model is loaded and the language settled up front; decoding happens
+    as the iterator is consumed, one ``chunk_seconds`` slice at a time, so
+    downstream consumers (stream writers, progress UIs, early summarizers)
+    see segments long before the whole file is done.
+
+    With ``checkpoint_path``, progress is saved there after every chunk and a
+    matching checkpoint from an interrupted run is resumed: its segments are
+    replayed and decoding continues from its offset. The checkpoint is
+    deleted once the iterator is exhausted.
     """
     my_logger.info(f"Transcribing audio file: {audio_file}")
 
@@ -104,52 +431,247 @@ def transcribe_audio_full(
     my_logger.info(f"\tUsing device: {device}")
     patch_whisper_progress_bar()
     model = _load_model(model_size, device)
+    audio = whisper.load_audio(audio_file)
+
+    fingerprint, resumed = "", None
+    if checkpoint_path is not None:
+        fingerprint, resumed = _resume_state(checkpoint_path, audio, model_size, language)
 
-    if language is None:
-        used_lang = detect_language(audio_file, model, device)
+    if resumed is not None:
+        used_lang = resumed.language
+    elif language is None:
+        used_lang = detect_language(audio, model, device)
         my_logger.info(f"\tDetected language: {used_lang}")
     else:
         used_lang = language
         my_logger.info(f"\tForced language: {used_lang}")
 
-    result = model.transcribe(
-        audio_file,
-        fp16=(device == "cuda"),
+    state = resumed or Checkpoint(
+        audio_fingerprint=fingerprint,
+        model_size=model_size,
+        requested_language=language,
         language=used_lang,
+        offset=0.0,
+    )
+    return used_lang, _decode(
+        model,
+        audio,
+        device,
+        state,
+        chunk_seconds=chunk_seconds,
+        checkpoint_path=checkpoint_path,
     )
-    segments = cast(list[dict[str, Any]], result.get("segments", []))
-    return cast(str, result["text"]), used_lang, segments
 
 
-def diarize_speakers(audio_file: str) -> list[tuple[str, Segment]]:
-    """Diarize speakers in the audio file using PyAnnote.
+def transcribe_audio_full(
+    audio_file: str,
+    model_size: str = "base",
+    language: str | None = None,
+) -> tuple[str, str, list[dict[str, Any]]]:
+    """Transcribe + return ``(text, language, segments)``.
 
-    Reads ``HUGGINGFACE_TOKEN`` from the process env — caller is expected to
-    have populated it (e.g. via ``Settings.from_env()``).
+    ``segments`` is whisper's per-cue list with ``start`` / ``end`` /
+    ``text`` keys, suitable for SRT / VTT export. Eager wrapper around
+    :func:`stream_transcription`.
     """
-    my_logger.info(f"Diarizing speakers in: {audio_file}")
-    hf_token = os.getenv("HUGGINGFACE_TOKEN")
-    if not hf_token:
-        err_msg = "Missing Hugging Face token in HUGGINGFACE_TOKEN env variable"
-        raise OSError(err_msg)
+    used_lang, stream = stream_transcription(audio_file, model_size=model_size, language=language)
+    segments = list(stream)
+    return "".join(seg["text"] for seg in segments), used_lang, segments
+
+
+def waveform_input(audio: npt.NDArray[np.float32]) -> dict[str, Any]:
+    """Wrap a decoded 16 kHz mono waveform (``whisper.load_audio``) for pyannote.
+
+    Passing this mapping instead of a path spares pyannote its own decode and
+    resample of the file; the tensor shares memory with ``audio``.
+    """
+    return {
+        "waveform": torch.from_numpy(audio).unsqueeze(0),
+        "sample_rate": whisper.audio.SAMPLE_RATE,
+    }
+
+
+def _describe_audio(audio_file: AudioInput) -> str:
+    if isinstance(audio_file, str):
+        return audio_file
+    seconds = audio_file["waveform"].shape[-1] / audio_file["sample_rate"]
+    return f"in-memory waveform ({seconds:.1f}s)"
+
+
+def _diarize(audio_file: AudioInput) -> tuple[Annotation, dict[str, npt.NDArray[np.float32]]]:
+    """Run the pyannote diarization pipeline; return its annotation and per-label voices.
+
+    The pipeline computes one embedding per speaker for clustering anyway;
+    ``return_embeddings=True`` hands them back (rows in ``labels()`` order)
+    for speaker identification at no extra cost.
+    """
+    my_logger.info(f"Diarizing speakers in: {_describe_audio(audio_file)}")
     # Needs token with access to pyannote models:
     # - https://huggingface.co/pyannote/speaker-diarization-3.1
     # - https://huggingface.co/pyannote/segmentation-3.0
-    pipeline = Pipeline.from_pretrained(
-        "pyannote/speaker-diarization-3.1",
-        use_auth_token=hf_token,
+    pipeline = _load_pipeline(DIARIZATION_PIPELINE, get_device())
+    started = time.perf_counter()
+    diarization, embeddings = cast(
+        tuple[Annotation, npt.NDArray[np.float32]],
+        pipeline(audio_file, return_embeddings=True),
     )
-    diarization = pipeline(audio_file)
-    return [(str(label), segment) for segment, _, label in diarization.itertracks(yield_label=True)]
+    my_logger.info(f"\tDiarization inference took {time.perf_counter() - started:.1f}s")
+    voices = {
+        str(label): np.asarray(embeddings[row], dtype=np.float32)
+        for row, label in enumerate(diarization.labels())
+        if row < len(embeddings)
+    }
+    return diarization, voices
+
+
+@dataclasses.dataclass(frozen=True)
+class DiarizationWindow:
+    """One window of a windowed diarization run, in seconds.
+
+    pyannote sees ``[start, end)``; only turns inside ``[keep_start, keep_end)``
+    — the window minus half of each overlap — are kept, so every instant is
+    attributed by exactly one window, the one where it is furthest from an edge.
+    """
 
+    start: float
+    end: float
+    keep_start: float
+    keep_end: float
+
+
+def plan_windows(
+    duration: float,
+    window_seconds: float,
+    overlap_seconds: float = WINDOW_OVERLAP_SECONDS,
+) -> list[DiarizationWindow]:
+    """Split ``[0, duration)`` into overlapping windows of ``window_seconds``."""
+    if window_seconds <= 0 or duration <= window_seconds:
+        return [DiarizationWindow(0.0, duration, 0.0, duration)]
+    overlap = min(overlap_seconds, window_seconds / 4)
+    hop = window_seconds - overlap
+    count = max(1, int(np.ceil((duration - overlap) / hop)))
+    windows: list[DiarizationWindow] = []
+    for index in range(count):
+        start = index * hop
+        end = min(start + window_seconds, duration)
+        windows.append(
+            DiarizationWindow(
+                start=start,
+                end=end,
+                keep_start=0.0 if index == 0 else start + overlap / 2,
+                keep_end=duration if index == count - 1 else end - overlap / 2,
+            ),
+        )
+    return windows
+
+
+def _as_waveform(audio_file: AudioInput) -> Mapping[str, Any]:
+    if isinstance(audio_file, str):
+        return waveform_input(whisper.load_audio(audio_file))
+    return audio_file
+
+
+def _windowed(
+    audio_file: AudioInput,
+    window_seconds: float,
+) -> Iterator[tuple[DiarizationWindow, dict[str, Any]]]:
+    """Yield each window with its waveform slice (a view, no copy)."""
+    waveform = _as_waveform(audio_file)
+    samples, sample_rate = waveform["waveform"], int(waveform["sample_rate"])
+    for window in plan_windows(samples.shape[-1] / sample_rate, window_seconds):
+        first, last = int(window.start * sample_rate), int(window.end * sample_rate)
+        yield window, {"waveform": samples[..., first:last], "sample_rate": sample_rate}
+
+
+def _diarize_windowed(
+    audio_file: AudioInput,
+    window_seconds: float,
+) -> tuple[Annotation, dict[str, npt.NDArray[np.float32]]]:
+    """Diarize window by window; like :func:`_diarize`, with memory bounded by the window.
+
+    pyannote keeps frame-level segmentation and embeddings for its whole
+    input, so a full-day recording does not fit in RAM. Here each window is
+    diarized on its own and its speakers are matched to global ones through
+    their embeddings (:class:`SpeakerClusters`), keeping labels consistent
+    across windows. What stays resident between windows is the turn list
+    plus one centroid per speaker.
+    """
+    clusters = SpeakerClusters()
+    annotation = Annotation()
+    windows = list(_windowed(audio_file, window_seconds))
+    for number, (window, chunk) in enumerate(windows, start=1):
+        my_logger.info(f"\tWindow {number}/{len(windows)}: {window.start:.0f}s-{window.end:.0f}s")
+        local, voices = _diarize(chunk)
+        durations = {str(label): float(local.label_duration(label)) for label in local.labels()}
+        labels = clusters.assign(voices, durations)
+        keep = Segment(window.keep_start, window.keep_end)
+        for label, segment in _speaker_turns(local):
+            if label not in labels:
+                continue  # no usable embedding (NaN or zero-padded): too little speech here
+            kept = Segment(segment.start + window.start, segment.end + window.start) & keep
+            if kept:
+                annotation[kept, annotation.new_track(kept)] = labels[label]
+    my_logger.info(f"\t{len(clusters)} speakers across {len(windows)} windows")
+    return annotation, clusters.voices()
+
+
+def _detect_speech_windowed(audio_file: AudioInput, window_seconds: float) -> Timeline:
+    """Run :func:`detect_speech_segments` window by window; return the merged timeline."""
+    regions: list[Segment] = []
+    for window, chunk in _windowed(audio_file, window_seconds):
+        keep = Segment(window.keep_start, window.keep_end)
+        for region in detect_speech_segments(chunk):
+            kept = Segment(region.start + window.start, region.end + window.start) & keep
+            if kept:
+                regions.append(kept)
+    return Timeline(regions).support()
+
+
+def _speaker_turns(diarization: Annotation) -> list[tuple[str, Segment]]:
+    tracks = cast(
+        Iterator[tuple[Segment, Any, Any]],
+        diarization.itertracks(yield_label=True),
+    )
+    return [(str(label), segment) for segment, _, label in tracks]
 
-def load_audio_slice(audio_path: str, start: float, end: float) -> npt.NDArray[np.floating[Any]]:
-    """Load a slice of audio between `start` and `end` seconds."""
-    waveform, sample_rate = torchaudio.load(audio_path)
-    start_sample = int(start * sample_rate)
-    end_sample = int(end * sample_rate)
-    sliced_waveform = waveform[:, start_sample:end_sample]
-    return sliced_waveform.mean(dim=0).numpy()  # convert to mono np.array
+
+def diarize_with_speech_timeline(
+    audio_file: AudioInput,
+    speech_detection: str = "diarization",
+    window_seconds: float = 0.0,
+) -> tuple[list[tuple[str, Segment]], Timeline, dict[str, npt.NDArray[np.float32]]]:
+    """Return ``(speaker turns, speech timeline, voice embeddings)`` for ``audio_file``.
+
+    ``speech_detection="diarization"`` (default) takes the speech regions from
+    the diarization pipeline's own segmentation — the support of its turns —
+    so only one pyannote pass runs. ``"vad"`` additionally runs the dedicated
+    VAD pipeline, concurrently with diarization, for a stricter speech mask.
+    The embeddings map each speaker label to its voice vector.
+
+    ``window_seconds > 0`` processes the audio in overlapping windows of that
+    length so peak memory does not grow with the recording (see
+    :func:`_diarize_windowed`).
+    """
+    diarize: Callable[[AudioInput], tuple[Annotation, dict[str, npt.NDArray[np.float32]]]]
+    diarize, detect_speech = _diarize, detect_speech_segments
+    if window_seconds > 0:
+        audio_file = _as_waveform(audio_file)  # decode once for every window
+        diarize = functools.partial(_diarize_windowed, window_seconds=window_seconds)
+        detect_speech = functools.partial(_detect_speech_windowed, window_seconds=window_seconds)
+    if speech_detection == "diarization":
+        diarization, voices = diarize(audio_file)
+        return _speaker_turns(diarization), diarization.get_timeline().support(), voices
+    if speech_detection == "vad":
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            diarization_job = pool.submit(diarize, audio_file)
+            speech_job = pool.submit(detect_speech, audio_file)
+            diarization, voices = diarization_job.result()
+            return _speaker_turns(diarization), speech_job.result(), voices
+    err_msg = (
+        f"Unknown speech detection mode {speech_detection!r}; "
+        f"expected one of {SPEECH_DETECTION_MODES}"
+    )
+    raise ValueError(err_msg)
 
 
 def group_speaker_segments(
@@ -166,126 +688,234 @@ def group_speaker_segments(
         list: List of (speaker, merged Segment) tuples.
 
     """
-    grouped_segments: list[tuple[str, Segment]] = []
-    last_speaker: str | None = None
-    current_start: float = 0.0
-    current_end: float = 0.0
-
-    for speaker, segment in diarized_segments:
-        if speaker == last_speaker and (segment.start - current_end) <= max_gap:
-            current_end = segment.end  # extend current segment
-        else:
-            if last_speaker is not None:
-                grouped_segments.append(
-                    (last_speaker, Segment(current_start, current_end)),
-                )
-            last_speaker = speaker
-            current_start = segment.start
-            current_end = segment.end
-
-    if last_speaker is not None:
-        grouped_segments.append((last_speaker, Segment(current_start, current_end)))
+    return SpeakerTurns.from_pairs(diarized_segments).grouped(max_gap).to_pairs()
 
-    return grouped_segments
 
-
-def detect_speech_segments(audio_file: str) -> Timeline:
+def detect_speech_segments(audio_file: AudioInput) -> Timeline:
     """Run voice activity detection (VAD) and return speech regions as a Timeline.
 
     Reads ``HUGGINGFACE_TOKEN`` from the process env — caller is expected to
     have populated it (e.g. via ``Settings.from_env()``).
 
     Args:
-        audio_file (str): Path to the audio file.
+        audio_file (str | Mapping): Path to the audio file, or an
+            already-decoded waveform mapping (see :func:`waveform_input`).
 
     Returns:
         pyannote.core.Timeline: Detected speech segments.
 
     """
-    token = os.getenv("HUGGINGFACE_TOKEN")
-    if not token:
-        err_msg = "Missing Hugging Face token in HUGGINGFACE_TOKEN env variable"
-        raise OSError(err_msg)
-
     # Needs token with access to gated pyannote models:
     # - https://huggingface.co/pyannote/voice-activity-detection
     # - https://huggingface.co/pyannote/segmentation
-    vad_pipeline = Pipeline.from_pretrained(
-        "pyannote/voice-activity-detection",
-        use_auth_token=token,
-    )
-    vad_result = vad_pipeline(audio_file)
+    vad_pipeline = _load_pipeline(VAD_PIPELINE, get_device())
+    started = time.perf_counter()
+    vad_result = cast(Annotation, vad_pipeline(audio_file))
+    my_logger.info(f"\tVAD inference took {time.perf_counter() - started:.1f}s")
     return vad_result.get_timeline().support()
 
 
+def _diarize_columns(
+    audio: npt.NDArray[np.float32],
+    speech_detection: str,
+    cache: DiarizationCache | None,
+    *,
+    refresh: bool = False,
+    window_seconds: float = 0.0,
+) -> tuple[SpeakerTurns, tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]]:
+    """Return ``(turns, speech regions)``, from ``cache`` when it holds this audio.
+
+    pyannote gets the waveform already decoded for whisper, not the path.
+    """
+    pipelines = (DIARIZATION_PIPELINE,)
+    if speech_detection == "vad":
+        pipelines = (DIARIZATION_PIPELINE, VAD_PIPELINE)
+    if window_seconds > 0:
+        pipelines = (*pipelines, f"window={window_seconds:g}s")
+    fingerprint = audio_fingerprint(audio) if cache is not None else ""
+    if cache is not None and not refresh:
+        cached = cache.load(fingerprint, pipelines)
+        if cached is not None:
+            return cached
+    diarized_segments, speech_timeline, voices = diarize_with_speech_timeline(
+        waveform_input(audio),
+        speech_detection,
+        window_seconds,
+    )
+    turns = SpeakerTurns.from_pairs(diarized_segments, voices)
+    speech = speech_regions(speech_timeline)
+    if cache is not None:
+        cache.save(fingerprint, pipelines, turns, speech)
+    return turns, speech
+
+
+def _resolve_speaker_names(
+    turns: SpeakerTurns,
+    speaker_index: SpeakerIndex | None,
+    enroll: Mapping[str, str],
+) -> dict[str, str]:
+    """Enroll the requested voices, then return ``{label: name}`` for known voices."""
+    if speaker_index is None:
+        return {}
+    voices = turns.voice_map()
+    for label, name in enroll.items():
+        if label not in voices or not usable_voice(voices[label]):
+            my_logger.warning(f"Cannot enroll {label!r} as {name!r}: no voice for that label")
+            continue
+        speaker_index.enroll(name, voices[label])
+        my_logger.info(f"\tEnrolled {label} as {name!r}")
+    names = speaker_index.identify(voices)
+    for label, name in sorted(names.items()):
+        my_logger.info(f"\tIdentified {label} as {name!r}")
+    return names
+
+
 def transcribe_audio_with_diarization(
     audio_file: str,
     model_size: str = "base",
     language: str | None = None,
-) -> tuple[str, str]:
-    """Transcribe audio with speaker diarization.
+    speech_detection: str = "diarization",
+    cache_dir: Path | None = None,
+    *,
+    refresh_cache: bool = False,
+    speaker_index: SpeakerIndex | None = None,
+    enroll: Mapping[str, str] | None = None,
+    diarization_window: float = 0.0,
+    channel_speakers: bool = False,
+    checkpoint_path: Path | None = None,
+) -> tuple[str, str, list[dict[str, Any]]]:
+    """Transcribe audio with speaker diarization; return ``(text, language, segments)``.
+
+    Whisper runs once over the whole file with word timestamps, keeping
+    context across speaker changes; each word is then attributed to a
+    diarization turn (see :func:`~scriber.transcription.turns.assign_speakers`).
+    ``segments`` carry a ``speaker`` key and are usable for SRT / VTT export.
 
     ``language=None`` autodetects (default behavior); pass a code (e.g.
-    ``"fr"``) to force whisper to that language.
+    ``"fr"``) to force whisper to that language. ``speech_detection`` picks
+    where speech regions come from (see :func:`diarize_with_speech_timeline`).
+    With ``cache_dir``, diarization results are cached there by audio content
+    (see :class:`DiarizationCache`); ``refresh_cache`` recomputes and
+    overwrites the entry.
+
+    With ``speaker_index``, labels whose voice matches an enrolled one are
+    replaced by that name. ``enroll`` (``{label: name}``) first adds this
+    recording's voices to the index — the caller saves it.
+
+    ``diarization_window`` (seconds, ``0`` = whole file) diarizes in
+    overlapping windows for bounded memory on very long recordings.
+
+    ``channel_speakers`` first checks for one speaker per channel and, when
+    that holds, takes the turns from channel energy instead of pyannote
+    (see :func:`~scriber.transcription.channels.channel_turns`).
+
+    ``checkpoint_path`` checkpoints and resumes the whisper pass as in
+    :func:`stream_transcription`; diarization is not checkpointed, but with
+    ``cache_dir`` a rerun reads it back from the cache.
     """
     device = get_device()
     my_logger.info(f"\tUsing device: {device}")
     patch_whisper_progress_bar()
     model = _load_model(model_size, device)
+    separated = None
+    if channel_speakers:
+        channels = load_audio_channels(audio_file)
+        audio = channels.mean(axis=0, dtype=np.float32)  # one decode serves both
+        separated = channel_turns(channels)
+        if separated is None:
+            my_logger.info("\tChannels do not separate speakers; using neural diarization")
+    else:
+        audio = whisper.load_audio(audio_file)
+
+    fingerprint, resumed = "", None
+    if checkpoint_path is not None:
+        fingerprint, resumed = _resume_state(checkpoint_path, audio, model_size, language)
 
-    if language is None:
-        used_lang = detect_language(audio_file, model, device)
+    if resumed is not None:
+        used_lang = resumed.language
+    elif language is None:
+        used_lang = detect_language(audio, model, device)
         my_logger.info(f"Detected language: {used_lang}")
     else:
         used_lang = language
         my_logger.info(f"Forced language: {used_lang}")
 
-    # Diarize speakers
-    diarized_segments = diarize_speakers(audio_file)
-    speech_timeline = detect_speech_segments(audio_file)
-
-    # Keep only diarized segments that intersect with actual speech
-    filtered_segments = [
-        (speaker, segment)
-        for speaker, segment in diarized_segments
-        if speech_timeline.crop(segment)  # returns non-empty Timeline if overlaps
-    ]
-
-    # Group segments from the same speaker
-    grouped_segments = group_speaker_segments(filtered_segments, max_gap=_MAX_SPEAKER_GAP)
-    full_text: list[str] = []
-    for speaker, segment in grouped_segments:
-        # Skip segments that are too short (silence or noise)
-        if segment.end - segment.start < MIN_SEGMENT_DURATION:
-            continue
-        sliced_audio = load_audio_slice(audio_file, segment.start, segment.end)
-        segment_result = model.transcribe(
-            sliced_audio,
-            fp16=(device == "cuda"),
-            language=used_lang,
-        )
-        text = cast(str, segment_result["text"]).strip()
-        if not text:  # Skip empty transcriptions
-            continue
-        full_text.append(f"{speaker}: {text}")
+    # Diarize speakers (or reuse a cached result for this audio)
+    diarized, speech = separated or _diarize_columns(
+        audio,
+        speech_detection,
+        DiarizationCache(cache_dir) if cache_dir is not None else None,
+        refresh=refresh_cache,
+        window_seconds=diarization_window,
+    )
 
-    return "\n".join(full_text), used_lang
+    names = _resolve_speaker_names(diarized, speaker_index, enroll or {})
+
+    # Keep only turns that intersect actual speech, then merge same-speaker runs
+    turns = diarized.within_regions(*speech).grouped(_MAX_SPEAKER_GAP)
+
+    state = resumed or Checkpoint(
+        audio_fingerprint=fingerprint,
+        model_size=model_size,
+        requested_language=language,
+        language=used_lang,
+        offset=0.0,
+    )
+    whisper_segments = list(
+        _decode(
+            model,
+            audio,
+            device,
+            state,
+            chunk_seconds=STREAM_CHUNK_SECONDS,
+            checkpoint_path=checkpoint_path,
+            word_timestamps=True,
+        ),
+    )
+    # Short turns take no words (silence or noise): words they share with a
+    # longer turn go to it, words over a short turn alone are dropped.
+    segments = assign_speakers(
+        whisper_segments,
+        turns,
+        max_gap=_MAX_SPEAKER_GAP,
+        min_turn_duration=MIN_SEGMENT_DURATION,
+    )
+    for segment in segments:
+        segment["speaker"] = names.get(segment["speaker"], segment["speaker"])
+    return speaker_text(segments), used_lang, segments
 
 
 def transcribe_video_file_with_diarization(
     video_file: str,
     model_size: str = "base",
     language: str | None = None,
-) -> tuple[str, str]:
+    speech_detection: str = "diarization",
+    cache_dir: Path | None = None,
+    *,
+    refresh_cache: bool = False,
+    speaker_index: SpeakerIndex | None = None,
+    enroll: Mapping[str, str] | None = None,
+    diarization_window: float = 0.0,
+    channel_speakers: bool = False,
+    checkpoint_path: Path | None = None,
+) -> tuple[str, str, list[dict[str, Any]]]:
     """Full pipeline: Extract audio from video, transcribe it with diarization."""
     my_logger.info(f"Processing with diarization: {video_file}")
-    audio_path = extract_audio(video_file)
+    audio_path = extract_audio(video_file, channels=None if channel_speakers else 1)
     try:
-        transcription, used_lang = transcribe_audio_with_diarization(
+        transcription, used_lang, segments = transcribe_audio_with_diarization(
             audio_path,
             model_size=model_size,
             language=language,
+            speech_detection=speech_detection,
+            cache_dir=cache_dir,
+            refresh_cache=refresh_cache,
+            speaker_index=speaker_index,
+            enroll=enroll,
+            diarization_window=diarization_window,
+            channel_speakers=channel_speakers,
+            checkpoint_path=checkpoint_path,
         )
     finally:
         Path(audio_path).unlink()
-    return transcription, used_lang
+    return transcription, used_lang, segments
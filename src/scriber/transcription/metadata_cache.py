@@ -0,0 +1,135 @@
+"""On-disk cache of yt-dlp video metadata, keyed by video ID.
+
+Every URL run used to start with an ``extract_info`` round-trip, even for a
+video processed the day before. :class:`MetadataCache` keeps a trimmed copy
+of the info dict (title, duration, caption track listing, chapters) in
+``<cache_dir>/metadata.sqlite`` and serves it while it is younger than the
+TTL, so re-running a batch with a different summary mode makes no metadata
+request at all. In offline mode the cache is the only source, whatever the
+age of the entry.
+
+The trimmed dict has no ``formats``: downloading audio from a cached entry
+re-extracts (see :attr:`VideoMetadata.has_formats`).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Any
+
+from scriber.logger import my_logger
+from scriber.transcription import youtube_metadata
+from scriber.transcription.youtube_metadata import NotCachedError, VideoMetadata
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+# Keys of the yt-dlp info dict kept in the cache; the rest (formats,
+# thumbnails, heatmaps, ...) is large and changes between extractions.
+KEPT_FIELDS = ("id", "title", "duration", "subtitles", "automatic_captions", "chapters")
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    video_id TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    info TEXT NOT NULL
+)
+"""
+
+
+class MetadataNotCachedError(NotCachedError):
+    """Offline mode and the video's metadata is not in the cache."""
+
+
+def trim_info(info: dict[str, Any]) -> dict[str, Any]:
+    """Return the subset of a yt-dlp info dict the cache keeps."""
+    return {key: info[key] for key in KEPT_FIELDS if info.get(key) is not None}
+
+
+class MetadataCache:
+    """Get-or-fetch video metadata through an SQLite table with a TTL."""
+
+    def __init__(self, root: Path, ttl_seconds: float) -> None:
+        """Cache entries in ``root / "metadata.sqlite"``; ``ttl_seconds <= 0`` disables it."""
+        self.path = root / "metadata.sqlite"
+        self.ttl_seconds = ttl_seconds
+
+    @contextlib.contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.closing(sqlite3.connect(self.path, timeout=30.0)) as conn:
+            conn.execute(_SCHEMA)
+            with conn:  # commit on success, roll back on error
+                yield conn
+
+    def load(self, video_id: str, *, max_age: float | None = None) -> VideoMetadata | None:
+        """Return the cached metadata, or ``None`` if missing, older than ``max_age`` or unreadable."""
+        if not self.path.exists():
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT fetched_at, info FROM metadata WHERE video_id = ?",
+                    (video_id,),
+                ).fetchone()
+            if row is None:
+                return None
+            fetched_at, info = float(row[0]), json.loads(row[1])
+        except (sqlite3.Error, ValueError):
+            my_logger.warning(f"Ignoring unreadable metadata cache entry for {video_id}")
+            return None
+        if max_age is not None and time.time() - fetched_at > max_age:
+            return None
+        return VideoMetadata(info, from_cache=True)
+
+    def save(self, metadata: VideoMetadata) -> None:
+        """Store the trimmed metadata, replacing any older entry for the video."""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO metadata (video_id, fetched_at, info) VALUES (?, ?, ?)",
+                    (metadata.video_id, time.time(), json.dumps(trim_info(metadata.info))),
+                )
+        except sqlite3.Error as exc:
+            my_logger.warning(f"Could not cache metadata for {metadata.video_id}: {exc}")
+
+    def fetch(
+        self,
+        url: str,
+        video_id: str,
+        *,
+        offline: bool = False,
+        refresh: bool = False,
+    ) -> VideoMetadata:
+        """Return ``video_id``'s metadata from the cache when fresh, else from YouTube.
+
+        Args:
+            url: The video URL, for the extraction on a miss.
+            video_id: The cache key.
+            offline: Serve only from the cache, ignoring the TTL.
+            refresh: Skip the cache lookup (the fresh result is still stored).
+
+        Raises:
+            MetadataNotCachedError: ``offline`` and no entry for ``video_id``.
+            yt_dlp.utils.DownloadError: The extraction failed.
+
+        """
+        if offline:
+            cached = self.load(video_id)
+            if cached is None:
+                err_msg = f"Offline mode: no cached metadata for video {video_id}"
+                raise MetadataNotCachedError(err_msg)
+            return cached
+        if self.ttl_seconds <= 0:
+            return youtube_metadata.fetch_video_metadata(url)
+        if not refresh:
+            cached = self.load(video_id, max_age=self.ttl_seconds)
+            if cached is not None:
+                my_logger.info(f"Using cached metadata for {video_id}")
+                return cached
+        metadata = youtube_metadata.fetch_video_metadata(url)
+        self.save(metadata)
+        return metadata
@@ -0,0 +1,219 @@
+# Boundary to untyped ML deps (torch modules inside whisper / pyannote objects).
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+"""Process-wide registry of loaded ML models with a memory budget.
+
+Whisper models and pyannote pipelines are expensive to load and large to keep
+around. A long-lived process (batch run, worker, daemon) that sees several
+``--model-size`` values would otherwise accumulate every model it ever
+touched. :class:`ModelRegistry` keeps them in LRU order and evicts the
+least-recently-used entries once the summed resident size exceeds
+``budget_bytes`` (``0`` = unbounded, the historical behavior).
+
+Keys are ``(name, device)`` tuples, e.g. ``("whisper:small", "cpu")`` or
+``("pyannote/speaker-diarization-3.1", "cuda")``.
+"""
+
+from __future__ import annotations
+
+import gc
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar, cast
+
+import torch
+
+from scriber.logger import my_logger
+
+ModelKey = tuple[str, str]
+T = TypeVar("T")
+
+_MB = 1024 * 1024
+_MAX_SCAN_DEPTH = 4  # how deep to look for nn.Modules inside wrapper objects (pipelines)
+
+
+@dataclass
+class _Entry:
+    model: Any
+    size_bytes: int
+
+
+def _find_modules(obj: object) -> list[torch.nn.Module]:
+    """Return every top-level ``torch.nn.Module`` reachable from ``obj``.
+
+    ``obj`` is either a module itself (whisper) or a wrapper holding modules
+    as attributes (pyannote ``Pipeline``).
+    """
+    modules: dict[int, torch.nn.Module] = {}
+    seen: set[int] = set()
+
+    def _scan(node: object, depth: int) -> None:
+        if id(node) in seen or depth > _MAX_SCAN_DEPTH:
+            return
+        seen.add(id(node))
+        if isinstance(node, torch.nn.Module):
+            modules[id(node)] = node
+            return
+        if isinstance(node, dict):
+            for value in cast(dict[Any, Any], node).values():
+                _scan(value, depth + 1)
+            return
+        if isinstance(node, (list, tuple)):
+            for value in cast(list[Any], node):
+                _scan(value, depth + 1)
+            return
+        attrs = getattr(node, "__dict__", None)
+        if isinstance(attrs, dict):
+            for value in cast(dict[str, Any], attrs).values():
+                _scan(value, depth + 1)
+
+    _scan(obj, 0)
+    return list(modules.values())
+
+
+def _dense_parts(tensor: torch.Tensor) -> tuple[torch.Tensor, ...]:
+    """Return the strided tensors holding ``tensor``'s data.
+
+    Sparse tensors have no storage of their own (whisper's ``alignment_heads``
+    buffer is one); their values and indices do.
+    """
+    if tensor.is_sparse:
+        return (tensor._values(), tensor._indices())  # noqa: SLF001 — no copy, unlike .coalesce()
+    return (tensor,)
+
+
+def estimate_model_bytes(obj: object) -> int:
+    """Return the summed size of every parameter/buffer tensor reachable from ``obj``.
+
+    Tensors sharing a storage are counted once. Objects without any
+    reachable module report ``0``.
+    """
+    storages: dict[int, int] = {}
+    for module in _find_modules(obj):
+        for tensor in (*module.parameters(), *module.buffers()):
+            for part in _dense_parts(tensor):
+                storage = part.untyped_storage()
+                storages[storage.data_ptr()] = storage.nbytes()
+    return sum(storages.values())
+
+
+class ModelRegistry:
+    """LRU cache of loaded models bounded by an approximate memory budget."""
+
+    def __init__(self, budget_bytes: int = 0) -> None:
+        """Create an empty registry; ``budget_bytes=0`` disables eviction."""
+        self.budget_bytes = budget_bytes
+        self._entries: OrderedDict[ModelKey, _Entry] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __contains__(self, key: object) -> bool:
+        """Return True when ``key`` is currently resident."""
+        return key in self._entries
+
+    def __len__(self) -> int:
+        """Return the number of resident models."""
+        return len(self._entries)
+
+    def get(self, key: ModelKey, loader: Callable[[], T]) -> T:
+        """Return the model for ``key``, calling ``loader`` on a miss.
+
+        A hit marks the entry most-recently-used. A miss loads, records the
+        resident size, and evicts LRU entries until the budget holds again.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return cast(T, entry.model)
+            model = loader()
+            size = estimate_model_bytes(model)
+            self._entries[key] = _Entry(model=model, size_bytes=size)
+            my_logger.debug(
+                f"Loaded model {key[0]!r} on {key[1]} ({size / _MB:.1f} MB); "
+                f"registry total {self.resident_bytes() / _MB:.1f} MB",
+            )
+            self._enforce_budget(keep=key)
+            return model
+
+    def preload(self, key: ModelKey, loader: Callable[[], object]) -> int:
+        """Load ``key`` ahead of time (no-op when resident); return its resident size."""
+        with self._lock:
+            self.get(key, loader)
+            return self._entries[key].size_bytes if key in self._entries else 0
+
+    def evict(self, key: ModelKey) -> bool:
+        """Drop ``key`` from the registry; return False when it wasn't resident."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        my_logger.debug(f"Evicted model {key[0]!r} on {key[1]} ({entry.size_bytes / _MB:.1f} MB)")
+        del entry
+        _release_memory()
+        return True
+
+    def clear(self) -> None:
+        """Drop every resident model."""
+        with self._lock:
+            self._entries.clear()
+        _release_memory()
+
+    def resident_sizes(self) -> dict[ModelKey, int]:
+        """Return ``{key: size_bytes}`` for resident models, LRU first."""
+        with self._lock:
+            return {key: entry.size_bytes for key, entry in self._entries.items()}
+
+    def resident_bytes(self) -> int:
+        """Return the summed resident size of every loaded model."""
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def share_memory(self) -> int:
+        """Move the weights of every resident CPU model into shared memory.
+
+        Call this in the parent *before* forking workers: children then map
+        the same physical pages instead of each holding a private copy
+        (plain fork copy-on-write is not enough on its own — any in-place
+        touch of a tensor's storage duplicates the page). Returns the number
+        of bytes now shared. CUDA models are skipped; CUDA cannot be forked.
+        Sparse tensors (whisper's tiny ``alignment_heads``) cannot be moved
+        to shared memory and stay private to each process.
+        """
+        storages: dict[int, int] = {}
+        with self._lock:
+            for (_, device), entry in self._entries.items():
+                if device != "cpu":
+                    continue
+                for module in _find_modules(entry.model):
+                    for tensor in (*module.parameters(), *module.buffers()):
+                        if tensor.is_sparse:
+                            continue
+                        tensor.share_memory_()
+                        storage = tensor.untyped_storage()
+                        storages[storage.data_ptr()] = storage.nbytes()
+        return sum(storages.values())
+
+    def _enforce_budget(self, *, keep: ModelKey) -> None:
+        if self.budget_bytes <= 0:
+            return
+        while self.resident_bytes() > self.budget_bytes:
+            victim = next((k for k in self._entries if k != keep), None)
+            if victim is None:
+                my_logger.warning(
+                    f"Model {keep[0]!r} alone ({self.resident_bytes() / _MB:.0f} MB) exceeds "
+                    f"the model memory budget ({self.budget_bytes / _MB:.0f} MB); keeping it.",
+                )
+                return
+            self.evict(victim)
+
+
+def _release_memory() -> None:
+    """Give freed tensors back to the allocator (and the GPU, when present)."""
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+MODEL_REGISTRY = ModelRegistry()
+"""The process-wide registry used by :mod:`scriber.transcription.local`."""
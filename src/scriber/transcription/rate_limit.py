@@ -0,0 +1,213 @@
+"""Process-wide cap on the rate of requests to YouTube, with adaptive backoff.
+
+Bulk runs (``scriber prefetch``, ``--workers``) fire metadata extractions,
+caption downloads and audio downloads from several threads or processes;
+without a cap YouTube answers with 429s and, eventually, a temporary IP
+block. Every request site goes through ``YOUTUBE_LIMITER.call()``:
+
+- a token bucket spaces requests to ``rate`` per second (``rate=None``, the
+  historical behavior, lets everything through);
+- a throttling answer (HTTP 429, yt-dlp's "Too Many Requests" / "try again
+  later" / bot check) is retried after a pause — ``Retry-After`` when given,
+  else exponential — that holds back every caller, and halves the rate
+  until requests succeed again;
+- once the retries are spent, :class:`YouTubeThrottledError` is raised, so
+  callers can tell "YouTube is refusing us" from "this video has no
+  captions" and do not fall back to a whisper download that would be
+  throttled too.
+
+With a ``state_path``, the bucket and the backoff live in a small JSON
+file under an exclusive ``flock``, so every scriber process on the machine
+shares one budget. Without ``fcntl`` (Windows) the limiter stays
+per-process.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, TypeVar
+
+import requests
+from yt_dlp.utils import DownloadError
+
+from scriber.logger import my_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover — Windows
+    fcntl = None
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+    from pathlib import Path
+
+T = TypeVar("T")
+
+RATE_STATE_FILE = "youtube_rate.json"  # under CACHE_DIR
+_ATTEMPTS = 4
+_TOO_MANY_REQUESTS = 429
+_BASE_BACKOFF = 5.0  # seconds; doubles with each consecutive throttle
+_MAX_BACKOFF = 300.0
+_MAX_HALVINGS = 4  # the rate never drops below rate / 16
+_THROTTLE_MESSAGE = re.compile(
+    r"HTTP Error 429|Too Many Requests|try again later|confirm you.re not a bot",
+    re.IGNORECASE,
+)
+
+
+class YouTubeThrottledError(RuntimeError):
+    """YouTube kept throttling a request through every retry."""
+
+
+def is_throttling(exc: BaseException) -> bool:
+    """Return whether ``exc`` is YouTube refusing to serve us, not a per-video failure."""
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code == _TOO_MANY_REQUESTS
+    if isinstance(exc, DownloadError):
+        return _THROTTLE_MESSAGE.search(str(exc)) is not None
+    return False
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    """Return the ``Retry-After`` delay (seconds form only) of a throttled HTTP response."""
+    if not isinstance(exc, requests.HTTPError) or exc.response is None:
+        return None
+    value = exc.response.headers.get("Retry-After")
+    if value is None:
+        return None
+    with contextlib.suppress(ValueError):  # an HTTP date: back off our own way
+        return max(0.0, float(value))
+    return None
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated: float  # time.time() of the last refill
+    blocked_until: float = 0.0  # no request before this time.time()
+    strikes: int = 0  # consecutive throttles, less one per later success
+
+
+class RateLimiter:
+    """Thread-safe (optionally cross-process) token bucket with adaptive backoff."""
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int = 1,
+        state_path: Path | None = None,
+    ) -> None:
+        """Create a limiter; ``rate=None`` only waits out throttling pauses."""
+        self._lock = threading.Lock()
+        self.configure(rate, burst, state_path)
+
+    def configure(
+        self,
+        rate: float | None,
+        burst: int = 1,
+        state_path: Path | None = None,
+    ) -> None:
+        """Set the rate (``None`` removes the cap), the burst and the shared state file."""
+        if (rate is not None and rate <= 0) or burst < 1:
+            err_msg = f"rate must be > 0 and burst >= 1, got rate={rate}, burst={burst}"
+            raise ValueError(err_msg)
+        if state_path is not None and fcntl is None:
+            my_logger.debug("No fcntl on this platform; YouTube rate limit is per-process")
+            state_path = None
+        with self._lock:
+            self.rate = rate
+            self.burst = burst
+            self.state_path = state_path
+            self._bucket = _Bucket(tokens=float(burst), updated=time.time())
+
+    @contextlib.contextmanager
+    def _state(self) -> Generator[_Bucket]:
+        """Yield the bucket to update, locked against other threads (and processes)."""
+        with self._lock:
+            if self.state_path is None or fcntl is None:
+                yield self._bucket
+                return
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.state_path.open("a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)  # released when the file closes
+                f.seek(0)
+                try:
+                    bucket = _Bucket(**json.loads(f.read()))
+                except (TypeError, ValueError):  # new, empty or foreign file
+                    bucket = _Bucket(tokens=float(self.burst), updated=time.time())
+                yield bucket
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(asdict(bucket)))
+
+    def acquire(self) -> float:
+        """Block until a request may go out; return the seconds waited.
+
+        Callers reserve their slot under the lock and sleep outside it, so
+        waiting threads queue up in arrival order without holding the lock.
+        """
+        with self._state() as bucket:
+            now = time.time()
+            wait = max(0.0, bucket.blocked_until - now)
+            if self.rate is not None:
+                rate = self.rate / 2 ** min(bucket.strikes, _MAX_HALVINGS)
+                refill = (now - bucket.updated) * rate
+                bucket.tokens = min(float(self.burst), bucket.tokens + refill)
+                bucket.updated = now
+                bucket.tokens -= 1.0
+                wait = max(wait, -bucket.tokens / rate)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def throttled(self, retry_after: float | None = None) -> float:
+        """Record a throttling answer: pause every caller and slow down. Return the pause."""
+        with self._state() as bucket:
+            bucket.strikes += 1
+            pause = retry_after
+            if pause is None:
+                pause = min(_MAX_BACKOFF, _BASE_BACKOFF * 2 ** (bucket.strikes - 1))
+            bucket.blocked_until = max(bucket.blocked_until, time.time() + pause)
+        my_logger.warning(f"YouTube is throttling requests; pausing them for {pause:.0f}s")
+        return pause
+
+    def succeeded(self) -> None:
+        """Record a served request: step the rate back up after throttling."""
+        if self.state_path is None and self._bucket.strikes == 0:
+            return  # nothing to undo; skip the lock on the hot path
+        with self._state() as bucket:
+            bucket.strikes = max(0, bucket.strikes - 1)
+
+    def call(self, request: Callable[[], T], *, attempts: int = _ATTEMPTS) -> T:
+        """Run ``request`` within the rate limit, retrying it while YouTube throttles.
+
+        Raises:
+            YouTubeThrottledError: Still throttled after ``attempts`` tries.
+
+        """
+        attempt = 1
+        while True:
+            self.acquire()
+            try:
+                result = request()
+            except (requests.HTTPError, DownloadError) as exc:
+                if not is_throttling(exc):
+                    raise
+                if attempt >= attempts:
+                    err_msg = (
+                        f"YouTube is throttling requests; gave up after {attempts} tries: {exc}"
+                    )
+                    raise YouTubeThrottledError(err_msg) from exc
+                self.throttled(_retry_after(exc))
+                attempt += 1
+                continue
+            self.succeeded()
+            return result
+
+
+YOUTUBE_LIMITER = RateLimiter()
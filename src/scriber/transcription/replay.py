@@ -0,0 +1,210 @@
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+"""Record/replay stand-in for the YouTube requests of the URL path.
+
+Every request to YouTube goes through two seams: :func:`youtube_dl` (the
+``yt_dlp.YoutubeDL`` of metadata extraction and audio download) and
+:func:`get_text` (caption payloads, from :mod:`~scriber.transcription.http`).
+With ``YT_REPLAY_DIR`` unset both pass straight through. With it set, they
+serve from — or, with ``YT_REPLAY_MODE=record``, save to — a fixture
+directory, so ``handle_url`` and ``scriber prefetch`` run end to end, and
+can be benchmarked, on a machine without network::
+
+    <YT_REPLAY_DIR>/info/<video_id>.json    yt-dlp info dict
+    <YT_REPLAY_DIR>/http/<sha1 of URL>.txt  response body (caption payloads)
+    <YT_REPLAY_DIR>/audio/<video_id>.wav    downloaded audio
+
+``YT_REPLAY_LATENCY_MS`` adds a sleep to every replayed request, to stand
+in for the network round-trip when measuring concurrency. A request with
+no recording fails the way the real one would on a network error
+(``DownloadError`` / ``requests.ConnectionError``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, Self, cast
+
+import requests
+import yt_dlp
+from yt_dlp.utils import DownloadError
+
+from scriber.logger import my_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
+ReplayMode = Literal["replay", "record"]
+
+
+@dataclass(frozen=True)
+class ReplayConfig:
+    """Where recordings live, whether to read or write them, and the injected latency."""
+
+    root: Path
+    mode: ReplayMode = "replay"
+    latency: float = 0.0  # seconds per replayed request
+
+    @classmethod
+    def from_env(cls) -> ReplayConfig | None:
+        """Return the configuration from ``YT_REPLAY_*``, or ``None`` when ``YT_REPLAY_DIR`` is unset."""
+        root = os.getenv("YT_REPLAY_DIR")
+        if not root:
+            return None
+        mode = os.getenv("YT_REPLAY_MODE", "replay")
+        if mode not in ("replay", "record"):
+            err_msg = f"YT_REPLAY_MODE must be 'replay' or 'record', got {mode!r}"
+            raise ValueError(err_msg)
+        latency_ms = float(os.getenv("YT_REPLAY_LATENCY_MS", "0"))
+        return cls(Path(root), mode, latency_ms / 1000.0)
+
+    def info_path(self, video_id: str) -> Path:
+        """Return the recording of ``video_id``'s info dict."""
+        return self.root / "info" / f"{video_id}.json"
+
+    def http_path(self, url: str) -> Path:
+        """Return the recording of the response body for ``url``."""
+        digest = hashlib.sha1(url.encode(), usedforsecurity=False).hexdigest()
+        return self.root / "http" / f"{digest}.txt"
+
+    def audio_path(self, video_id: str) -> Path:
+        """Return the recording of ``video_id``'s downloaded audio."""
+        return self.root / "audio" / f"{video_id}.wav"
+
+
+def _video_id(url: str) -> str:
+    from scriber.transcription.youtube_audio import extract_video_id  # noqa: PLC0415 — circular
+
+    return extract_video_id(url)
+
+
+def _write(path: Path, data: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(data, encoding="utf-8")
+
+
+class ReplayYoutubeDL:
+    """The slice of ``yt_dlp.YoutubeDL`` scriber uses, served from recordings."""
+
+    def __init__(self, opts: dict[str, Any], config: ReplayConfig) -> None:
+        """Mirror ``YoutubeDL(opts)``; only ``outtmpl`` matters (where audio lands)."""
+        self.opts = opts
+        self.config = config
+
+    def __enter__(self) -> Self:
+        """Enter the ``with`` block, as ``YoutubeDL`` does."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Nothing to release."""
+
+    def extract_info(self, url: str, download: bool = True) -> dict[str, Any]:  # noqa: FBT001, FBT002 — yt-dlp's signature
+        """Return the recorded info dict of ``url``'s video (and its audio when ``download``)."""
+        time.sleep(self.config.latency)
+        path = self.config.info_path(_video_id(url))
+        if not path.exists():
+            err_msg = f"No recorded metadata for {url} in {self.config.root}"
+            raise DownloadError(err_msg)
+        info = cast(dict[str, Any], json.loads(path.read_text(encoding="utf-8")))
+        return self.process_ie_result(info, download=download) if download else info
+
+    def process_ie_result(self, info: dict[str, Any], download: bool = True) -> dict[str, Any]:  # noqa: FBT001, FBT002 — yt-dlp's signature
+        """Place the recorded audio where ``outtmpl`` says the download lands."""
+        if download:
+            video_id = cast(str, info["id"])
+            recorded = self.config.audio_path(video_id)
+            if not recorded.exists():
+                err_msg = f"No recorded audio for {video_id} in {self.config.root}"
+                raise DownloadError(err_msg)
+            target = Path(str(self.opts["outtmpl"]) % {"id": video_id, "ext": "wav"})
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(recorded, target)
+        return info
+
+
+class RecordingYoutubeDL:
+    """A real ``yt_dlp.YoutubeDL`` that also saves what it returns as recordings."""
+
+    def __init__(self, opts: dict[str, Any], config: ReplayConfig) -> None:
+        """Wrap ``yt_dlp.YoutubeDL(opts)``."""
+        self.opts = opts
+        self.config = config
+        self._ydl: Any = yt_dlp.YoutubeDL(cast(Any, opts))
+
+    def __enter__(self) -> Self:
+        """Enter the wrapped ``YoutubeDL``."""
+        self._ydl.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Exit the wrapped ``YoutubeDL``."""
+        self._ydl.__exit__(exc_type, exc, tb)
+
+    def extract_info(self, url: str, download: bool = True) -> dict[str, Any]:  # noqa: FBT001, FBT002 — yt-dlp's signature
+        """Extract for real, then record the info dict (and the audio when ``download``)."""
+        return self._record(cast(dict[str, Any], self._ydl.extract_info(url, download=download)))
+
+    def process_ie_result(self, info: dict[str, Any], download: bool = True) -> dict[str, Any]:  # noqa: FBT001, FBT002 — yt-dlp's signature
+        """Process for real, then record the result."""
+        return self._record(
+            cast(dict[str, Any], self._ydl.process_ie_result(info, download=download))
+        )
+
+    def _record(self, info: dict[str, Any]) -> dict[str, Any]:
+        video_id = cast(str, info["id"])
+        sanitized = yt_dlp.YoutubeDL.sanitize_info(cast(Any, info))
+        _write(self.config.info_path(video_id), json.dumps(sanitized))
+        downloaded = Path(str(self.opts.get("outtmpl", "")) % {"id": video_id, "ext": "wav"})
+        if downloaded.is_file():
+            self.config.audio_path(video_id).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(downloaded, self.config.audio_path(video_id))
+        my_logger.debug(f"Recorded yt-dlp result for {video_id} in {self.config.root}")
+        return info
+
+
+def youtube_dl(opts: dict[str, Any]) -> Any:
+    """Return ``yt_dlp.YoutubeDL(opts)``, or its replaying/recording stand-in under ``YT_REPLAY_DIR``."""
+    config = ReplayConfig.from_env()
+    if config is None:
+        return yt_dlp.YoutubeDL(cast(Any, opts))
+    if config.mode == "record":
+        return RecordingYoutubeDL(opts, config)
+    return ReplayYoutubeDL(opts, config)
+
+
+def get_text(url: str, fetch: Callable[[str], str]) -> str:
+    """Return ``fetch(url)``, served from or saved to the recordings under ``YT_REPLAY_DIR``.
+
+    Raises:
+        requests.ConnectionError: Replay mode and ``url`` was never recorded.
+
+    """
+    config = ReplayConfig.from_env()
+    if config is None:
+        return fetch(url)
+    path = config.http_path(url)
+    if config.mode == "record":
+        text = fetch(url)
+        _write(path, text)
+        return text
+    time.sleep(config.latency)
+    if not path.exists():
+        err_msg = f"No recorded response for {url} in {config.root}"
+        raise requests.ConnectionError(err_msg)
+    return path.read_text(encoding="utf-8")
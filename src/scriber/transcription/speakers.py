@@ -0,0 +1,228 @@
+# Boundary to partially-typed numpy APIs.
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+"""Local index of enrolled speaker voices for cross-recording identification.
+
+Diarization labels are per-recording (``SPEAKER_00``, ``SPEAKER_01``, ...).
+The diarization pipeline also yields one embedding per label; comparing
+those against a small index of enrolled voices turns recurring labels into
+names with one cosine-similarity matrix product per recording.
+
+The index is a single ``.npz`` file: a name per row and an L2-normalized
+embedding matrix. A name may have several rows (one per enrollment), and a
+label resolves to the name of its most similar row.
+
+:class:`SpeakerClusters` applies the same matching within one recording, to
+keep labels consistent across independently diarized windows.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from scriber.logger import my_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Mapping, Sequence
+    from pathlib import Path
+
+    import numpy.typing as npt
+
+MATCH_THRESHOLD = 0.5  # min cosine similarity for a label to take an enrolled name
+# pyannote 3.1 merges clusters up to a cosine distance of ~0.70; windows follow suit
+CLUSTER_THRESHOLD = 0.3
+
+
+def _normalized(vectors: npt.NDArray[np.floating]) -> npt.NDArray[np.float32]:
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+
+def usable_voice(vector: npt.NDArray[np.floating], dim: int | None = None) -> bool:
+    """Return True when ``vector`` says something about a voice.
+
+    pyannote yields NaN embeddings for speakers with too little speech and
+    zero-pads its centroid matrix when it keeps fewer clusters than labels; a
+    zero row has no direction, and a row of another length (``dim``) belongs
+    to another embedding model. None of them can be matched.
+    """
+    vector = np.asarray(vector)
+    return (
+        vector.ndim == 1
+        and (dim is None or vector.shape[0] == dim)
+        and bool(np.all(np.isfinite(vector)))
+        and bool(np.any(vector))
+    )
+
+
+@dataclass
+class SpeakerIndex:
+    """Enrolled voices: ``names[i]`` owns the unit-norm row ``embeddings[i]``."""
+
+    names: list[str] = field(default_factory=list[str])
+    embeddings: npt.NDArray[np.float32] = field(
+        default_factory=lambda: np.empty((0, 0), dtype=np.float32),
+    )
+
+    def __len__(self) -> int:
+        """Return the number of enrolled embeddings (not distinct names)."""
+        return len(self.names)
+
+    @classmethod
+    def load(cls, path: Path) -> SpeakerIndex:
+        """Load the index at ``path``; a missing or unreadable file yields an empty index."""
+        if not path.exists():
+            return cls()
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return cls(
+                    names=[str(name) for name in data["names"]],
+                    embeddings=data["embeddings"].astype(np.float32),
+                )
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            my_logger.warning(f"Ignoring unreadable speaker index at {path}")
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Write the index to ``path`` atomically (temp file + rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.tmp.npz")
+        np.savez(tmp, names=np.array(self.names, dtype=str), embeddings=self.embeddings)
+        tmp.replace(path)
+
+    def enroll(self, name: str, embedding: npt.NDArray[np.floating]) -> None:
+        """Add one voice sample for ``name``."""
+        if not usable_voice(embedding):
+            err_msg = f"Cannot enroll {name!r}: the embedding is empty, zero, or not finite"
+            raise ValueError(err_msg)
+        row = _normalized(embedding)
+        if len(self) and row.shape[1] != self.embeddings.shape[1]:
+            err_msg = (
+                f"Embedding dimension {row.shape[1]} does not match the index "
+                f"({self.embeddings.shape[1]}); was it built with another pipeline?"
+            )
+            raise ValueError(err_msg)
+        self.embeddings = row if not len(self) else np.vstack([self.embeddings, row])
+        self.names.append(name)
+
+    def identify(
+        self,
+        embeddings: Mapping[str, npt.NDArray[np.floating]],
+        threshold: float = MATCH_THRESHOLD,
+    ) -> dict[str, str]:
+        """Return ``{label: name}`` for the labels whose voice matches an enrolled one.
+
+        One ``labels x enrolled`` similarity product; assignments are then
+        made greedily from the best score down so that two labels of the same
+        recording never resolve to the same person. Labels without a usable
+        embedding (see :func:`usable_voice`) or with no match above
+        ``threshold`` are left out.
+        """
+        if not len(self):
+            return {}
+        dim = self.embeddings.shape[1]
+        labels = [label for label, vec in embeddings.items() if usable_voice(vec, dim)]
+        if not labels:
+            if any(usable_voice(vec) for vec in embeddings.values()):
+                my_logger.warning("Speaker index dimension mismatch; skipping identification.")
+            return {}
+        queries = _normalized(np.stack([embeddings[label] for label in labels]))
+        scores = queries @ self.embeddings.T
+
+        matched = _greedy_match(scores, threshold, owners=self.names)
+        return {labels[row]: self.names[col] for row, col in matched.items()}
+
+
+class SpeakerClusters:
+    """Online clustering of per-window speaker embeddings into global speakers.
+
+    Each window's speakers are matched one-to-one against the running
+    centroids (duration-weighted means of unit embeddings); the unmatched
+    ones start new clusters. Only one centroid per speaker is kept, so
+    memory does not grow with the number of windows.
+    """
+
+    def __init__(self, threshold: float = CLUSTER_THRESHOLD) -> None:
+        """Start with no speakers; ``threshold`` is the min cosine similarity to merge."""
+        self.threshold = threshold
+        self._sums: list[npt.NDArray[np.float32]] = []
+
+    def __len__(self) -> int:
+        """Return the number of global speakers so far."""
+        return len(self._sums)
+
+    @staticmethod
+    def label(index: int) -> str:
+        """Return the label of global speaker ``index`` (pyannote-style ``SPEAKER_00``)."""
+        return f"SPEAKER_{index:02d}"
+
+    def assign(
+        self,
+        embeddings: Mapping[str, npt.NDArray[np.floating]],
+        durations: Mapping[str, float],
+    ) -> dict[str, str]:
+        """Map one window's local labels to global labels, updating the centroids.
+
+        Labels without a usable embedding (see :func:`usable_voice`) are left
+        out; the caller drops their turns. Embeddings are expected to be as
+        long as the centroids, or in the first window as the longest one.
+        """
+        dim = (
+            len(self._sums[0])
+            if self._sums
+            else max((np.size(vec) for vec in embeddings.values()), default=0)
+        )
+        labels = [label for label, vec in embeddings.items() if usable_voice(vec, dim)]
+        if not labels:
+            return {}
+        queries = _normalized(np.stack([embeddings[label] for label in labels]))
+        rows: dict[int, int] = {}
+        if self._sums:
+            scores = queries @ _normalized(np.stack(self._sums)).T
+            rows = _greedy_match(scores, self.threshold)
+        mapping: dict[str, str] = {}
+        for row, label in enumerate(labels):
+            weight = max(durations.get(label, 1.0), 1e-3)
+            if row in rows:
+                self._sums[rows[row]] += weight * queries[row]
+            else:
+                rows[row] = len(self._sums)
+                self._sums.append(weight * queries[row])
+            mapping[label] = self.label(rows[row])
+        return mapping
+
+    def voices(self) -> dict[str, npt.NDArray[np.float32]]:
+        """Return ``{global label: unit centroid}``."""
+        if not self._sums:
+            return {}
+        centroids = _normalized(np.stack(self._sums))
+        return {self.label(index): centroids[index] for index in range(len(centroids))}
+
+
+def _greedy_match(
+    scores: npt.NDArray[np.float32],
+    threshold: float,
+    owners: Sequence[Hashable] | None = None,
+) -> dict[int, int]:
+    """Return ``{row: col}`` assigned greedily from the best score down to ``threshold``.
+
+    Each row is used once, and so is each column owner (``owners[col]``,
+    default the column itself) — two labels of one recording never resolve
+    to the same person.
+    """
+    matched: dict[int, int] = {}
+    taken: set[Hashable] = set()
+    for flat in np.argsort(scores, axis=None)[::-1].tolist():
+        row, col = divmod(flat, scores.shape[1])
+        if scores[row, col] < threshold:
+            break
+        owner = col if owners is None else owners[col]
+        if row in matched or owner in taken:
+            continue
+        matched[row] = col
+        taken.add(owner)
+    return matched
@@ -0,0 +1,314 @@
+# Boundary to partially-typed numpy / pyannote APIs.
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+"""Columnar speaker-turn bookkeeping for the diarized transcription path.
+
+Diarization of a long recording yields tens of thousands of turns. Filtering
+them against the speech timeline, merging same-speaker runs, and attributing
+whisper words to them used to be per-turn Python loops over pyannote objects
+(``Timeline.crop`` alone is a linear scan per call, so O(n·m) overall).
+:class:`SpeakerTurns` keeps the turns as parallel NumPy arrays instead, so
+each step is one sorted sweep; pyannote ``Segment`` objects are only built
+at the API boundary.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+from pyannote.core import Segment
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    import numpy.typing as npt
+    from pyannote.core import Timeline
+
+
+@dataclass(frozen=True)
+class SpeakerTurns:
+    """Speaker turns as parallel arrays; turn ``i`` is ``names[codes[i]]`` over ``[starts[i], ends[i]]``."""
+
+    names: tuple[str, ...]
+    codes: npt.NDArray[np.intp]
+    starts: npt.NDArray[np.float64]
+    ends: npt.NDArray[np.float64]
+    voices: npt.NDArray[np.float32] | None = None
+    """Optional per-name voice embeddings (row ``i`` for ``names[i]``; NaN when unknown)."""
+
+    @classmethod
+    def from_pairs(
+        cls,
+        pairs: Sequence[tuple[str, Segment]],
+        voices: Mapping[str, npt.NDArray[np.float32]] | None = None,
+    ) -> SpeakerTurns:
+        """Build from ``(speaker, Segment)`` pairs, e.g. :func:`~scriber.transcription.local.diarize_with_speech_timeline` turns."""
+        index: dict[str, int] = {}
+        codes = np.fromiter(
+            (index.setdefault(label, len(index)) for label, _ in pairs),
+            dtype=np.intp,
+            count=len(pairs),
+        )
+        bounds = np.array([(seg.start, seg.end) for _, seg in pairs], dtype=np.float64)
+        bounds = bounds.reshape(-1, 2)
+        matrix = None
+        if voices:
+            dim = len(next(iter(voices.values())))
+            matrix = np.full((len(index), dim), np.nan, dtype=np.float32)
+            for name, row in index.items():
+                if name in voices:
+                    matrix[row] = voices[name]
+        return cls(tuple(index), codes, bounds[:, 0].copy(), bounds[:, 1].copy(), matrix)
+
+    def __len__(self) -> int:
+        """Return the number of turns."""
+        return len(self.codes)
+
+    def voice_map(self) -> dict[str, npt.NDArray[np.float32]]:
+        """Return ``{speaker: embedding}`` for the speakers with a known voice."""
+        if self.voices is None:
+            return {}
+        return {
+            name: self.voices[row]
+            for row, name in enumerate(self.names)
+            if np.all(np.isfinite(self.voices[row]))
+        }
+
+    def label(self, index: int) -> str:
+        """Return the speaker of turn ``index``."""
+        return self.names[int(self.codes[index])]
+
+    def to_pairs(self) -> list[tuple[str, Segment]]:
+        """Return the turns as ``(speaker, Segment)`` pairs."""
+        return [
+            (self.names[code], Segment(start, end))
+            for code, start, end in zip(
+                self.codes.tolist(),
+                self.starts.tolist(),
+                self.ends.tolist(),
+                strict=True,
+            )
+        ]
+
+    def _take(self, index: npt.NDArray[Any]) -> SpeakerTurns:
+        return dataclasses.replace(
+            self,
+            codes=self.codes[index],
+            starts=self.starts[index],
+            ends=self.ends[index],
+        )
+
+    def at_least(self, min_duration: float) -> SpeakerTurns:
+        """Keep the turns lasting at least ``min_duration`` seconds."""
+        if min_duration <= 0:
+            return self
+        return self._take(self.ends - self.starts >= min_duration)
+
+    def overlaps(
+        self,
+        index: npt.NDArray[np.intp],
+        starts: npt.NDArray[np.float64],
+        ends: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.bool_]:
+        """Return, per ``[starts, ends]`` interval, whether turn ``index`` overlaps it (``-1``: no)."""
+        if not len(self):
+            return np.zeros(len(starts), dtype=bool)
+        safe = index.clip(min=0)
+        overlap = np.minimum(ends, self.ends[safe]) - np.maximum(starts, self.starts[safe])
+        return (index >= 0) & (overlap > 0)
+
+    def sorted(self) -> SpeakerTurns:
+        """Return the turns ordered by start time (stable)."""
+        return self._take(np.argsort(self.starts, kind="stable"))
+
+    def within(self, speech: Timeline) -> SpeakerTurns:
+        """Keep the turns that intersect at least one region of ``speech``.
+
+        Same result as filtering on ``speech.crop(segment)``.
+        """
+        return self.within_regions(*speech_regions(speech))
+
+    def within_regions(
+        self,
+        speech_starts: npt.NDArray[np.float64],
+        speech_ends: npt.NDArray[np.float64],
+    ) -> SpeakerTurns:
+        """Keep the turns that intersect the disjoint, sorted regions ``[starts, ends]``.
+
+        A turn intersects speech iff the last region starting before the
+        turn's end has not ended before its start — one ``searchsorted``.
+        """
+        if not len(speech_starts):
+            return self._take(np.zeros(len(self), dtype=bool))
+        last = np.searchsorted(speech_starts, self.ends, side="left") - 1
+        return self._take((last >= 0) & (speech_ends[last.clip(min=0)] > self.starts))
+
+    def grouped(self, max_gap: float = 1.0) -> SpeakerTurns:
+        """Merge consecutive turns of the same speaker separated by at most ``max_gap`` s.
+
+        A group spans its first turn's start to its last turn's end, like
+        :func:`~scriber.transcription.local.group_speaker_segments`.
+        """
+        if not len(self):
+            return self
+        breaks = np.ones(len(self), dtype=bool)
+        breaks[1:] = (self.codes[1:] != self.codes[:-1]) | (
+            self.starts[1:] - self.ends[:-1] > max_gap
+        )
+        firsts = np.flatnonzero(breaks)
+        lasts = np.append(firsts[1:], len(self)) - 1
+        return dataclasses.replace(
+            self,
+            codes=self.codes[firsts],
+            starts=self.starts[firsts],
+            ends=self.ends[lasts],
+        )
+
+    def match(
+        self,
+        starts: npt.NDArray[np.float64],
+        ends: npt.NDArray[np.float64],
+        max_gap: float,
+    ) -> npt.NDArray[np.intp]:
+        """Return, per ``[starts, ends]`` interval, the index of its best-matching turn.
+
+        Turns must be sorted by start. The best turn is the one with the
+        largest overlap; with no overlap, the nearest one within ``max_gap``
+        seconds; otherwise ``-1``.
+
+        Rather than every turn, each interval is compared with: the turns
+        starting inside it, the first one starting after it, and — among the
+        turns starting before it — the one reaching furthest. Any other turn
+        starting before the interval ends no later than that one, so it
+        overlaps less and is farther away; long turns with shorter ones
+        nested inside them (backchannels, crosstalk) are found however many
+        turns start in between. The join is O(n log m + n·k), k the most
+        turn starts inside one interval.
+        """
+        if not len(self) or not len(starts):
+            return np.full(len(starts), -1, dtype=np.intp)
+        before = np.searchsorted(self.starts, starts, side="right") - 1
+        upper = np.searchsorted(self.starts, ends, side="left")
+        inside = int((upper - before - 1).max())
+        offsets = np.arange(-inside, 1)
+        window = np.clip(upper[:, None] + offsets[None, :], 0, len(self) - 1)
+        candidates = np.column_stack((window, self._furthest()[before.clip(min=0)]))
+        cand_starts = self.starts[candidates]
+        cand_ends = self.ends[candidates]
+        overlap = np.minimum(ends[:, None], cand_ends) - np.maximum(starts[:, None], cand_starts)
+        gap = np.maximum(cand_starts - ends[:, None], starts[:, None] - cand_ends).clip(min=0.0)
+
+        rows = np.arange(len(starts))
+        by_overlap = overlap.argmax(axis=1)
+        by_gap = gap.argmin(axis=1)
+        has_overlap = overlap[rows, by_overlap] > 0
+        matched = candidates[rows, np.where(has_overlap, by_overlap, by_gap)]
+        return np.where(has_overlap | (gap[rows, by_gap] <= max_gap), matched, -1)
+
+    def _furthest(self) -> npt.NDArray[np.intp]:
+        """Return, per turn ``i``, the index of the latest-ending turn among turns ``0..i``."""
+        reach = np.maximum.accumulate(self.ends)
+        leads = np.where(self.ends == reach, np.arange(len(self)), 0)
+        return np.maximum.accumulate(leads)
+
+
+def speech_regions(
+    speech: Timeline,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Return the disjoint, sorted ``(starts, ends)`` covering ``speech``.
+
+    Equivalent to ``speech.support()`` for intersection tests, without
+    building pyannote objects (``support()`` alone costs ~0.4 s on 40k regions).
+    """
+    bounds = np.array([(seg.start, seg.end) for seg in speech], dtype=np.float64).reshape(-1, 2)
+    bounds = bounds[np.argsort(bounds[:, 0], kind="stable")]
+    starts, ends = bounds[:, 0], bounds[:, 1]
+    if not len(starts):
+        return starts, ends
+    reach = np.maximum.accumulate(ends)
+    firsts = np.flatnonzero(np.r_[True, starts[1:] > reach[:-1]])
+    return starts[firsts], np.maximum.reduceat(ends, firsts)
+
+
+def assign_speakers(
+    segments: list[dict[str, Any]],
+    turns: SpeakerTurns,
+    *,
+    max_gap: float = 1.0,
+    min_turn_duration: float = 0.0,
+) -> list[dict[str, Any]]:
+    """Split whisper segments into speaker-tagged segments by overlap with ``turns``.
+
+    Each word (or the whole segment, when whisper ran without word
+    timestamps) goes to the turn it overlaps most. A unit overlapping no turn
+    goes to the nearest one within ``max_gap`` seconds and is dropped
+    otherwise. Turns shorter than ``min_turn_duration`` take no units: a unit
+    they share with a longer turn goes to that turn, and one over a short
+    turn alone is dropped rather than pinned on a neighbour — both are
+    whisper output over silence or noise.
+    Consecutive words of one whisper segment that share a speaker become one
+    output segment carrying a ``speaker`` key.
+    """
+    units: list[tuple[int, dict[str, Any]]] = []
+    for index, segment in enumerate(segments):
+        words = cast(list[dict[str, Any]], segment.get("words") or [])
+        if words:
+            units.extend((index, word) for word in words)
+        else:
+            units.append((index, segment))
+    if not units:
+        return []
+
+    starts = np.array([float(u["start"]) for _, u in units], dtype=np.float64)
+    ends = np.array([float(u["end"]) for _, u in units], dtype=np.float64)
+    turns = turns.sorted()
+    kept = turns.at_least(min_turn_duration)
+    owners = kept.match(starts, ends, max_gap)
+    if len(kept) < len(turns):
+        over_short_only = turns.overlaps(turns.match(starts, ends, 0.0), starts, ends) & ~(
+            kept.overlaps(owners, starts, ends)
+        )
+        owners[over_short_only] = -1
+    turns = kept
+
+    out: list[dict[str, Any]] = []
+    current_key: tuple[int, int] | None = None
+    for (index, unit), owner in zip(units, owners.tolist(), strict=True):
+        if owner < 0:
+            current_key = None
+            continue
+        text = str(unit.get("word", unit.get("text", "")))
+        if (index, owner) == current_key:
+            last = out[-1]
+            last["end"] = float(unit["end"])
+            last["text"] += text
+            if "words" in last:
+                last["words"].append(unit)
+            continue
+        current_key = (index, owner)
+        tagged: dict[str, Any] = {
+            "start": float(unit["start"]),
+            "end": float(unit["end"]),
+            "text": text,
+            "speaker": turns.label(owner),
+        }
+        if "word" in unit:
+            tagged["words"] = [unit]
+        out.append(tagged)
+    return out
+
+
+def speaker_text(segments: list[dict[str, Any]]) -> str:
+    """Render speaker-tagged segments as ``SPEAKER: text`` lines, one per speaker run."""
+    lines: list[tuple[str, list[str]]] = []
+    for segment in segments:
+        text = str(segment["text"]).strip()
+        if not text:
+            continue
+        if lines and lines[-1][0] == segment["speaker"]:
+            lines[-1][1].append(text)
+        else:
+            lines.append((str(segment["speaker"]), [text]))
+    return "\n".join(f"{speaker}: {' '.join(parts)}" for speaker, parts in lines)
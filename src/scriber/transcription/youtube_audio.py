@@ -6,9 +6,14 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, cast
 
-import yt_dlp
-
 from scriber.logger import my_logger
+from scriber.transcription import replay
+from scriber.transcription.rate_limit import YOUTUBE_LIMITER
+from scriber.transcription.youtube_metadata import (
+    NotCachedError,
+    VideoMetadata,
+    fetch_video_metadata,
+)
 
 
 def extract_video_id(url: str) -> str:
@@ -32,17 +37,12 @@ def extract_video_id(url: str) -> str:
     raise ValueError(err_msg)
 
 
-def fetch_video_title(url: str) -> str:
-    """Return the video title via yt-dlp metadata (no audio download)."""
-    opts: Any = {
-        "quiet": True,
-        "no_warnings": True,
-        "skip_download": True,
-        "noprogress": True,
-    }
-    with yt_dlp.YoutubeDL(opts) as ydl:
-        info = cast(dict[str, Any], ydl.extract_info(url, download=False))
-    return cast(str, info.get("title") or info.get("id") or "unknown")
+def fetch_video_title(url: str, metadata: VideoMetadata | None = None) -> str:
+    """Return the video title via yt-dlp metadata (no audio download).
+
+    With ``metadata`` already fetched, no request is made.
+    """
+    return (metadata or fetch_video_metadata(url)).title
 
 
 def download_youtube_audio(
@@ -50,6 +50,8 @@ def download_youtube_audio(
     output_dir: Path,
     *,
     force: bool = False,
+    metadata: VideoMetadata | None = None,
+    offline: bool = False,
 ) -> tuple[Path, str]:
     """Download the audio track of a YouTube video as a wav file.
 
@@ -57,22 +59,34 @@ def download_youtube_audio(
         url: Full YouTube URL.
         output_dir: Directory to save the downloaded wav file in.
         force: If True, re-download even if the .wav already exists.
+        metadata: The video's metadata when the caller already fetched it;
+            the cache hit then makes no request, and the download reuses
+            its formats instead of extracting again (when it has them; a
+            cached, trimmed copy does not).
+        offline: Only use an already downloaded .wav, whatever ``force``
+            says; ``metadata`` supplies the title.
 
     Returns:
         ``(audio_path, video_title)`` — path to the downloaded wav and the
         video's human-readable title (unsanitized).
 
+    Raises:
+        NotCachedError: ``offline`` and the audio was never downloaded.
+
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Cache hit: the .wav for this video id already exists.
-    if not force:
+    if offline or not force:
         video_id = extract_video_id(url)
         cached_wav = output_dir / f"{video_id}.wav"
         if cached_wav.exists():
             my_logger.info(f"Using cached audio at {cached_wav}")
-            title = fetch_video_title(url)
+            title = fetch_video_title(url, metadata)
             return cached_wav, title
+        if offline:
+            err_msg = f"Offline mode: no downloaded audio for video {video_id}"
+            raise NotCachedError(err_msg)
 
     my_logger.info(f"Downloading audio from {url}")
 
@@ -90,8 +104,16 @@ def download_youtube_audio(
         "no_warnings": True,
         "noprogress": True,
     }
-    with yt_dlp.YoutubeDL(opts) as ydl:
-        info = cast(dict[str, Any], ydl.extract_info(url, download=True))
+
+    def download() -> dict[str, Any]:
+        with replay.youtube_dl(opts) as ydl:
+            if metadata is None or not metadata.has_formats:
+                return cast(dict[str, Any], ydl.extract_info(url, download=True))
+            return cast(
+                dict[str, Any], ydl.process_ie_result(cast(Any, dict(metadata.info)), download=True)
+            )
+
+    info = YOUTUBE_LIMITER.call(download)
     video_id = cast(str, info["id"])
     title = cast(str, info.get("title") or video_id)
     audio_path = output_dir / f"{video_id}.wav"
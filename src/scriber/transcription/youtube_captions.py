@@ -1,12 +1,16 @@
 # pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
 """Get YouTube transcripts via yt-dlp.
 
-We use yt-dlp's caption-download path (rather than a separate API) so we can:
+We use yt-dlp's caption listing (rather than a separate API) so we can:
   * benefit from the same yt-dlp we already use for audio,
   * cleanly distinguish *manual* (author-provided) and *automatic* captions,
   * handle the same edge cases yt-dlp handles (member-only videos, region
     blocks, subtitle-disabled videos, etc.).
 
+The chosen track itself is fetched straight from the URL yt-dlp lists for it
+(json3 when offered, else SRT/VTT), through the shared keep-alive session of
+:mod:`scriber.transcription.http`, and parsed in memory into timed segments.
+
 ``get_youtube_transcript`` returns a :class:`CaptionTrack` carrying the
 caption text, its actual language code, and whether it came from a manual or
 auto-generated track. The pick follows the ladder spelled out in the README's
@@ -15,28 +19,46 @@ auto-generated track. The pick follows the ladder spelled out in the README's
 
 from __future__ import annotations
 
+import itertools
+import json
 import re
-import tempfile
 import textwrap
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Any, Literal, cast
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal, cast
 
-import yt_dlp
+import requests
 from yt_dlp.utils import DownloadError
 
 from scriber.logger import my_logger
+from scriber.transcription import http
+from scriber.transcription.youtube_metadata import (
+    NotCachedError,
+    VideoMetadata,
+    fetch_video_metadata,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from scriber.transcription.caption_cache import CaptionCache
 
 CaptionKind = Literal["manual", "auto"]
 
 
 @dataclass(frozen=True)
 class CaptionTrack:
-    """A retrieved caption track ready for downstream use."""
+    """A retrieved caption track ready for downstream use.
+
+    ``segments`` are whisper-style cues (``start``/``end``/``text``, plus
+    per-word ``words`` when the format carries them), so subtitles and
+    anything else that needs timing work from captions as from whisper.
+    """
 
     text: str
     lang: str
     kind: CaptionKind
+    segments: list[dict[str, Any]] = field(default_factory=list[dict[str, Any]])
 
 
 class TranscriptUnavailableError(Exception):
@@ -111,37 +133,161 @@ def _pick_caption(
     return None
 
 
-_TIMESTAMP_LINE = re.compile(
-    r"^\d{1,2}:\d{2}:\d{2}[,.]\d{3}\s*-->\s*\d{1,2}:\d{2}:\d{2}[,.]\d{3}.*$",
+_TIMING_LINE = re.compile(
+    r"^((?:\d+:)?\d{2}:\d{2}[,.]\d{3})\s*-->\s*((?:\d+:)?\d{2}:\d{2}[,.]\d{3})",
 )
-_INDEX_LINE = re.compile(r"^\d+$")
-_VTT_HEADER_LINE = re.compile(r"^(WEBVTT|Kind:|Language:)")
+_MAX_OVERLAP_TOKENS = 64  # longest rolling-caption echo looked for (tokens)
 _TAG = re.compile(r"<[^>]+>")
+# Caption formats we parse, best first: json3 carries per-word timing on
+# auto captions; SRT and VTT only per-cue timing. YouTube lists json3 for
+# nearly every track, so the SRT/VTT path (and its rolling-caption overlap
+# removal) is the fallback for the rare track offered without it.
+_TIMED_FORMATS = ("json3", "srt", "vtt")
+
+
+def _caption_source(formats: list[dict[str, Any]]) -> tuple[str, str] | None:
+    """Return ``(ext, url)`` of the best parseable format of a caption track."""
+    by_ext = {str(fmt.get("ext")): fmt.get("url") for fmt in formats if fmt.get("url")}
+    return next(((ext, cast(str, by_ext[ext])) for ext in _TIMED_FORMATS if ext in by_ext), None)
+
 
+def _seconds(timestamp: str) -> float:
+    """Parse ``[HH:]MM:SS.mmm`` (``,`` or ``.`` before the milliseconds) to seconds."""
+    total = 0.0
+    for part in timestamp.replace(",", ".").split(":"):
+        total = total * 60 + float(part)
+    return total
 
-def _extract_text_from_subtitle_file(path: Path) -> str:
-    """Strip timestamps + cue indices from an SRT/VTT subtitle file.
 
-    Returns a single string with cue text joined by spaces, deduplicated
-    against consecutive identical lines (auto captions are noisy this way).
+class _OverlapFilter:
+    """Drop the leading tokens of each cue that repeat the end of the text so far.
+
+    YouTube's rolling auto captions re-show the previous line (or part of it)
+    at the top of every cue, so an 8-hour stream would otherwise carry most
+    of its words twice. Only the last ``window`` emitted tokens are kept,
+    which bounds the work per cue and keeps the whole pass linear.
     """
-    raw = path.read_text(encoding="utf-8", errors="replace")
-    lines: list[str] = []
-    last: str = ""
-    for raw_line in raw.splitlines():
-        line = _TAG.sub("", raw_line).strip()
-        if not line:
-            continue
-        if _TIMESTAMP_LINE.match(line) or _INDEX_LINE.match(line) or _VTT_HEADER_LINE.match(line):
-            continue
-        if line == last:
-            continue
-        lines.append(line)
-        last = line
-    return " ".join(lines)
 
+    def __init__(self, window: int = _MAX_OVERLAP_TOKENS) -> None:
+        self._tail: deque[str] = deque(maxlen=window)
 
-def get_youtube_transcript(video_id: str, requested_lang: str | None = None) -> CaptionTrack:
+    def fresh(self, tokens: list[str]) -> list[str]:
+        """Return ``tokens`` minus the prefix that repeats the emitted tail."""
+        tail = list(self._tail)
+        overlap = next(
+            (k for k in range(min(len(tail), len(tokens)), 0, -1) if tail[-k:] == tokens[:k]),
+            0,
+        )
+        # A single shared word is as likely a real repetition ("that that")
+        # as a rolling-window echo; only drop it when it is the whole cue.
+        if overlap == 1 < len(tokens):
+            overlap = 0
+        new = tokens[overlap:]
+        self._tail.extend(new)
+        return new
+
+
+def _iter_subtitle_segments(
+    lines: Iterable[str],
+    *,
+    rolling: bool = True,
+) -> Iterator[dict[str, Any]]:
+    """Parse SRT/VTT lines into whisper-style ``{"start", "end", "text"}`` segments, lazily.
+
+    One pass over the lines: text outside a cue (VTT header, ``NOTE`` and
+    ``STYLE`` blocks, SRT indices) is skipped and inline tags are stripped.
+    With ``rolling`` (auto captions), overlaps are removed token by token
+    (see :class:`_OverlapFilter`); manual tracks do not roll, so their
+    repetitions are the speaker's and are kept. Cues left with no new text
+    are dropped.
+    """
+    overlap = _OverlapFilter() if rolling else None
+    timing: re.Match[str] | None = None
+    text: list[str] = []
+    for raw_line in itertools.chain(lines, [""]):  # the sentinel flushes the last cue
+        line = raw_line.strip()
+        if line and "-->" in line and (match := _TIMING_LINE.match(line)):
+            timing, text = match, []
+        elif line:
+            if timing is not None:
+                text.append(line)
+        elif timing is not None:
+            joined = " ".join(text)
+            tokens = (_TAG.sub("", joined) if "<" in joined else joined).split()
+            fresh = tokens if overlap is None else overlap.fresh(tokens)
+            if fresh:
+                yield {
+                    "start": _seconds(timing.group(1)),
+                    "end": _seconds(timing.group(2)),
+                    "text": " ".join(fresh),
+                }
+            timing, text = None, []
+
+
+def _parse_subtitles(raw: str, *, rolling: bool = True) -> list[dict[str, Any]]:
+    """Parse SRT/VTT text into segments (see :func:`_iter_subtitle_segments`)."""
+    return list(_iter_subtitle_segments(raw.splitlines(), rolling=rolling))
+
+
+def _parse_json3(raw: str) -> list[dict[str, Any]]:
+    """Parse YouTube's json3 caption format into whisper-style segments.
+
+    Each event with text becomes a segment. When an event is split into
+    several timed pieces (auto captions: one per word), they are kept as
+    whisper-style ``words``, each ending where the next one starts. A
+    segment ends no later than the next one starts: auto-caption events
+    stay on screen while the next line rolls in.
+    """
+    events = cast(list[dict[str, Any]], json.loads(raw).get("events") or [])
+    segments: list[dict[str, Any]] = []
+    for event in events:
+        pieces = cast(list[dict[str, Any]], event.get("segs") or [])
+        text = " ".join("".join(str(p.get("utf8", "")) for p in pieces).split())
+        if not text:
+            continue
+        start_ms = int(event.get("tStartMs", 0))
+        start, end = start_ms / 1000.0, (start_ms + int(event.get("dDurationMs", 0))) / 1000.0
+        if segments and segments[-1]["end"] > start:
+            segments[-1]["end"] = max(segments[-1]["start"], start)
+            _clip_words(segments[-1])
+        if segments and segments[-1]["text"] == text:
+            segments[-1]["end"] = end
+            continue
+        segment: dict[str, Any] = {"start": start, "end": end, "text": text}
+        timed = [p for p in pieces if str(p.get("utf8", "")).strip()]
+        if len(timed) > 1:
+            starts = [(start_ms + int(p.get("tOffsetMs", 0))) / 1000.0 for p in timed]
+            segment["words"] = [
+                {"word": str(p["utf8"]), "start": word_start, "end": word_end}
+                for p, word_start, word_end in zip(timed, starts, [*starts[1:], end], strict=True)
+            ]
+        segments.append(segment)
+    return segments
+
+
+def _clip_words(segment: dict[str, Any]) -> None:
+    """Keep ``segment``'s words inside its (just shortened) end."""
+    for word in cast(list[dict[str, Any]], segment.get("words", [])):
+        word["end"] = min(word["end"], segment["end"])
+        word["start"] = min(word["start"], word["end"])
+
+
+def _parse_captions(raw: str, ext: str, kind: CaptionKind) -> list[dict[str, Any]]:
+    """Parse a downloaded caption file of format ``ext`` into segments."""
+    if ext == "json3":
+        return _parse_json3(raw)
+    return _parse_subtitles(raw, rolling=kind == "auto")
+
+
+def get_youtube_transcript(
+    video_id: str,
+    requested_lang: str | None = None,
+    metadata: VideoMetadata | None = None,
+    cache: CaptionCache | None = None,
+    *,
+    refresh: bool = False,
+    offline: bool = False,
+) -> CaptionTrack:
     """Fetch a YouTube transcript honoring the language-selection ladder.
 
     Args:
@@ -150,102 +296,93 @@ def get_youtube_transcript(video_id: str, requested_lang: str | None = None) ->
         requested_lang: Optional preferred language code (typically
             ``"fr"`` or ``"en"``). When set, manual @ this lang outranks
             manual @ English.
+        metadata: The video's metadata when the caller already fetched it
+            (see :func:`fetch_video_metadata`); saves an extraction.
+        cache: Where parsed tracks are kept between runs; a hit on the
+            picked track makes no request.
+        refresh: Skip the cache lookup (the fetched track is still stored).
+        offline: Serve the track only from ``cache``, whatever ``refresh``
+            says; ``metadata`` must be given.
 
     Raises:
         TranscriptUnavailableError: No usable caption track is retrievable.
             Caller should route to the whisper-based fallback path.
+        YouTubeThrottledError: YouTube kept throttling the requests. Says
+            nothing about the captions; the audio download would be
+            throttled too, so do not fall back to whisper.
+        NotCachedError: ``offline`` and the picked track (or the metadata
+            to pick it from) is not cached.
 
     """
-    url = _build_url(video_id)
-
-    # Languages to enumerate in phase 1: requested lang + English + everything
-    # else ("all").  Without hinting yt-dlp with writesubtitles opts it skips
-    # the subtitle-metadata fetch entirely, so info["subtitles"] stays empty
-    # even when manual captions exist.
-    sub_langs: list[str] = []
-    if requested_lang:
-        sub_langs.append(requested_lang)
-    if "en" not in sub_langs:
-        sub_langs.append("en")
-    sub_langs.append("all")
-
-    with tempfile.TemporaryDirectory() as tmp:
-        tmpdir = Path(tmp)
-
-        # Phase 1: metadata only — populates info["subtitles"] /
-        # info["automatic_captions"] without downloading any subtitle file.
-        # writesubtitles/writeautomaticsub must be True so yt-dlp runs its
-        # subtitle-metadata fetch; download=False ensures no files are written.
-        info_opts: Any = {
-            "writesubtitles": True,
-            "writeautomaticsub": True,
-            "subtitleslangs": sub_langs,
-            "quiet": True,
-            "no_warnings": True,
-            "noprogress": True,
-        }
+    # Phase 1: metadata only — populates info["subtitles"] /
+    # info["automatic_captions"] without downloading any subtitle file.
+    if metadata is None and offline:
+        err_msg = f"Offline mode: no metadata to pick captions for video {video_id} from"
+        raise NotCachedError(err_msg)
+    if metadata is None:
         try:
-            with yt_dlp.YoutubeDL(info_opts) as ydl:
-                info = cast(dict[str, Any], ydl.extract_info(url, download=False))
+            metadata = fetch_video_metadata(_build_url(video_id))
         except DownloadError as exc:
             my_logger.warning("yt-dlp could not retrieve video metadata")
             raise TranscriptUnavailableError(
                 "list_failed",
                 "yt-dlp could not retrieve caption metadata.",
             ) from exc
-
-        manual_langs = sorted(cast(dict[str, Any], info.get("subtitles") or {}))
-        auto_langs = sorted(cast(dict[str, Any], info.get("automatic_captions") or {}))
-        track_list = (
-            "; ".join(
-                [f'"{k}" (manual)' for k in manual_langs] + [f'"{k}" (auto)' for k in auto_langs]
-            )
-            or "none"
+    info = metadata.info
+
+    manual_langs = sorted(metadata.subtitles)
+    auto_langs = sorted(metadata.automatic_captions)
+    track_list = (
+        "; ".join([f'"{k}" (manual)' for k in manual_langs] + [f'"{k}" (auto)' for k in auto_langs])
+        or "none"
+    )
+    my_logger.info(f"Caption tracks found: {track_list}")
+
+    pick = _pick_caption(info, requested_lang=requested_lang)
+    if pick is None:
+        raise TranscriptUnavailableError(
+            "lang_not_found",
+            "No caption track found in any language.",
         )
-        my_logger.info(f"Caption tracks found: {track_list}")
-
-        pick = _pick_caption(info, requested_lang=requested_lang)
-        if pick is None:
-            raise TranscriptUnavailableError(
-                "lang_not_found",
-                "No caption track found in any language.",
-            )
-
-        # lang_key is the raw yt-dlp dict key (e.g. "en-US"); lang is the
-        # normalised 2-letter code used downstream (e.g. "en").
-        lang_key, kind = pick
-        lang = lang_key.split("-")[0]
-        my_logger.info(f'Picking: "{lang_key}" ({kind}) as per language selection rules')
-
-        # Phase 2: download only the chosen track.
-        dl_opts: Any = {
-            "skip_download": True,
-            "writesubtitles": True,
-            "writeautomaticsub": True,
-            "subtitleslangs": [lang_key],
-            "subtitlesformat": "srt",
-            "outtmpl": str(tmpdir / "%(id)s.%(ext)s"),
-            "quiet": True,
-            "no_warnings": True,
-            "noprogress": True,
-        }
-        try:
-            with yt_dlp.YoutubeDL(dl_opts) as ydl:
-                ydl.extract_info(url, download=True)
-        except DownloadError as exc:
-            raise TranscriptUnavailableError(
-                "download_failed",
-                f"{kind} captions (key='{lang_key}') exist but download failed: {exc}",
-            ) from exc
 
-        srt_path = tmpdir / f"{video_id}.{lang_key}.srt"
-        if not srt_path.exists():
-            raise TranscriptUnavailableError(
-                "empty_payload",
-                f"yt-dlp listed {kind} captions in '{lang}' but produced no file.",
-            )
+    # lang_key is the raw yt-dlp dict key (e.g. "en-US"); lang is the
+    # normalised 2-letter code used downstream (e.g. "en").
+    lang_key, kind = pick
+    lang = lang_key.split("-")[0]
+    my_logger.info(f'Picking: "{lang_key}" ({kind}) as per language selection rules')
+
+    if cache is not None and (offline or not refresh):
+        cached = cache.load(video_id, lang_key, kind)
+        if cached is not None:
+            return cached
+    if offline:
+        err_msg = f'Offline mode: no cached {kind} captions "{lang_key}" for video {video_id}'
+        raise NotCachedError(err_msg)
+
+    # Phase 2: fetch only the chosen track, straight from the URL listed in
+    # the phase-1 info dict, and parse it in memory.
+    tracks = metadata.subtitles if kind == "manual" else metadata.automatic_captions
+    source = _caption_source(cast(list[dict[str, Any]], tracks[lang_key]))
+    if source is None:
+        raise TranscriptUnavailableError(
+            "empty_payload",
+            f"yt-dlp listed {kind} captions in '{lang}' but no {'/'.join(_TIMED_FORMATS)} URL.",
+        )
+    ext, url = source
+    try:
+        segments = _parse_captions(http.get_text(url), ext, kind)
+    except requests.RequestException as exc:
+        raise TranscriptUnavailableError(
+            "download_failed",
+            f"{kind} captions (key='{lang_key}') exist but download failed: {exc}",
+        ) from exc
+    except ValueError as exc:  # malformed json3 (JSONDecodeError is a ValueError)
+        raise TranscriptUnavailableError(
+            "empty_payload",
+            f"{kind} captions (key='{lang_key}') could not be parsed: {exc}",
+        ) from exc
 
-        text = _extract_text_from_subtitle_file(srt_path)
+    text = " ".join(str(segment["text"]) for segment in segments)
 
     if not text.strip():
         raise TranscriptUnavailableError(
@@ -254,4 +391,7 @@ def get_youtube_transcript(video_id: str, requested_lang: str | None = None) ->
         )
 
     wrapped = textwrap.fill(text, width=80, break_long_words=False, break_on_hyphens=False)
-    return CaptionTrack(text=wrapped, lang=lang, kind=kind)
+    track = CaptionTrack(text=wrapped, lang=lang, kind=kind, segments=segments)
+    if cache is not None:
+        cache.save(video_id, lang_key, track, source_format=ext)
+    return track
@@ -0,0 +1,103 @@
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+"""One yt-dlp metadata extraction per video, shared by captions, title and audio.
+
+A captioned video used to cost three ``extract_info`` round-trips (caption
+listing, caption download, title) and the whisper fallback a fourth.
+:func:`fetch_video_metadata` extracts once; :class:`VideoMetadata` then
+travels through :mod:`~scriber.transcription.youtube_captions` and
+:mod:`~scriber.transcription.youtube_audio`, which only re-extract when
+called without it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, cast
+
+from scriber.logger import my_logger
+from scriber.model import Chapter
+from scriber.transcription import replay
+from scriber.transcription.rate_limit import YOUTUBE_LIMITER
+
+
+class NotCachedError(LookupError):
+    """Offline mode and something the run needs (metadata, captions, audio) is not cached."""
+
+
+@dataclass(frozen=True)
+class VideoMetadata:
+    """The yt-dlp info dict of one video, with typed accessors for what we use.
+
+    ``from_cache`` marks a trimmed copy served by
+    :class:`~scriber.transcription.metadata_cache.MetadataCache`.
+    """
+
+    info: dict[str, Any]
+    from_cache: bool = False
+
+    @property
+    def video_id(self) -> str:
+        """Return the YouTube video ID."""
+        return cast(str, self.info["id"])
+
+    @property
+    def title(self) -> str:
+        """Return the human-readable title (unsanitized), or the ID when missing."""
+        return cast(str, self.info.get("title") or self.info.get("id") or "unknown")
+
+    @property
+    def subtitles(self) -> dict[str, Any]:
+        """Return the manual caption tracks, keyed by language."""
+        return cast(dict[str, Any], self.info.get("subtitles") or {})
+
+    @property
+    def automatic_captions(self) -> dict[str, Any]:
+        """Return the auto-generated caption tracks, keyed by language."""
+        return cast(dict[str, Any], self.info.get("automatic_captions") or {})
+
+    @property
+    def chapters(self) -> list[Chapter]:
+        """Return the uploader's chapters, in order; empty when the video has none."""
+        raw = cast(list[dict[str, Any]], self.info.get("chapters") or [])
+        return [
+            Chapter(
+                title=str(chapter.get("title") or ""),
+                start=float(chapter["start_time"]),
+                end=float(chapter["end_time"]),
+            )
+            for chapter in raw
+        ]
+
+    @property
+    def has_formats(self) -> bool:
+        """Return whether the media formats are present, so yt-dlp can download without re-extracting."""
+        return bool(self.info.get("formats"))
+
+
+def fetch_video_metadata(url: str) -> VideoMetadata:
+    """Extract ``url``'s metadata once, caption listing included (nothing downloaded).
+
+    Raises:
+        yt_dlp.utils.DownloadError: yt-dlp could not retrieve the metadata.
+        YouTubeThrottledError: YouTube kept throttling the extraction.
+
+    """
+    # Without writesubtitles/writeautomaticsub yt-dlp skips the subtitle
+    # metadata fetch, so info["subtitles"] stays empty even when manual
+    # captions exist. download=False ensures no files are written.
+    opts: Any = {
+        "writesubtitles": True,
+        "writeautomaticsub": True,
+        "subtitleslangs": ["all"],
+        "skip_download": True,
+        "quiet": True,
+        "no_warnings": True,
+        "noprogress": True,
+    }
+    my_logger.debug(f"Fetching video metadata for {url}")
+
+    def extract() -> dict[str, Any]:
+        with replay.youtube_dl(opts) as ydl:
+            return cast(dict[str, Any], ydl.extract_info(url, download=False))
+
+    return VideoMetadata(YOUTUBE_LIMITER.call(extract))
@@ -0,0 +1,112 @@
+"""Benchmark of the SRT/VTT caption parser on livestream-sized auto captions.
+
+Skipped by default (see ``addopts`` in ``pyproject.toml``). Run with:
+
+    uv run pytest -m benchmark -s
+
+The captions are generated, not downloaded: a seeded word stream laid out
+the way YouTube's rolling auto captions are, where every cue repeats the
+previous line above the new one. An 8-hour stream comes out at several
+megabytes. The parser must return each spoken word once, and its cost must
+grow linearly with the input.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+
+from scriber.transcription.youtube_captions import _TAG, _parse_subtitles
+
+pytestmark = pytest.mark.benchmark
+
+_HOURS = 8
+_WORDS_PER_SECOND = 2.5
+_WORDS_PER_LINE = 7
+_VOCABULARY = (
+    "the", "a", "we", "so", "and", "of", "to", "is", "it", "that", "this", "cache",
+    "stream", "chat", "today", "look", "build", "memory", "latency", "request",
+    "token", "model", "parser", "window", "queue", "replay",
+)  # fmt: skip
+
+
+def _timestamp(seconds: float) -> str:
+    ms = round(seconds * 1000)
+    return f"{ms // 3_600_000:02d}:{ms // 60_000 % 60:02d}:{ms // 1000 % 60:02d}.{ms % 1000:03d}"
+
+
+def _karaoke(words: list[str], start: float) -> str:
+    """A new caption line with YouTube's per-word ``<timestamp><c> word</c>`` tags."""
+    step = 1 / _WORDS_PER_SECOND
+    tagged = (f"<{_timestamp(start + i * step)}><c> {w}</c>" for i, w in enumerate(words[1:], 1))
+    return words[0] + "".join(tagged)
+
+
+def _rolling_vtt(hours: float, seed: int = 0) -> tuple[str, list[str]]:
+    """Return ``(vtt, spoken words)`` laid out like YouTube's auto captions.
+
+    Each new line gets a cue showing the end of the previous line above it
+    (the window scrolls by words, so only part of it is repeated) and the new
+    line word-tagged, then a 10 ms cue freezing the new line untagged.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(hours * 3600 * _WORDS_PER_SECOND)
+    picks: list[int] = rng.integers(0, len(_VOCABULARY), total).tolist()
+    words = [_VOCABULARY[i] for i in picks]
+    seconds_per_line = _WORDS_PER_LINE / _WORDS_PER_SECOND
+    settings = "align:start position:0%"
+    cues = ["WEBVTT\nKind: captions\nLanguage: en\n"]
+    previous: list[str] = []
+    for index, first in enumerate(range(0, total, _WORDS_PER_LINE)):
+        line_words = words[first : first + _WORDS_PER_LINE]
+        start, end = index * seconds_per_line, (index + 1) * seconds_per_line
+        cues.append(
+            f"{_timestamp(start)} --> {_timestamp(end - 0.01)} {settings}\n"
+            f"{' '.join(previous)}\n{_karaoke(line_words, start)}\n",
+        )
+        previous = line_words[-int(rng.integers(2, _WORDS_PER_LINE + 1)) :]
+        line = " ".join(line_words)
+        cues.append(f"{_timestamp(end - 0.01)} --> {_timestamp(end)} {settings}\n{line}\n")
+    return "\n".join(cues), words
+
+
+def _exact_line_dedup(vtt: str) -> int:
+    """Token count when only consecutive identical lines are dropped (the old parser)."""
+    kept, last = 0, ""
+    for raw in vtt.splitlines()[4:]:
+        line = _TAG.sub("", raw).strip()
+        if line and "-->" not in line and line != last:
+            kept += len(line.split())
+            last = line
+    return kept
+
+
+def _timed_parse(vtt: str) -> tuple[float, list[str]]:
+    started = time.perf_counter()
+    segments = _parse_subtitles(vtt)
+    elapsed = time.perf_counter() - started
+    return elapsed, " ".join(str(seg["text"]) for seg in segments).split()
+
+
+def test_livestream_captions_have_no_rolling_duplicates() -> None:
+    vtt, words = _rolling_vtt(_HOURS)
+    elapsed, parsed = _timed_parse(vtt)
+    megabytes = len(vtt.encode()) / 1e6
+    print(
+        f"{_HOURS} h rolling VTT: {megabytes:.1f} MB, {len(words)} words, "
+        f"parsed in {elapsed * 1000:.0f} ms ({megabytes / elapsed:.1f} MB/s)",
+    )
+    print(f"tokens: {len(parsed)} kept vs {_exact_line_dedup(vtt)} with exact-line dedup")
+    assert parsed == words
+
+
+def test_parse_time_grows_linearly() -> None:
+    short, _ = _rolling_vtt(_HOURS / 4, seed=1)
+    long, _ = _rolling_vtt(_HOURS, seed=1)
+    short_time = min(_timed_parse(short)[0] for _ in range(3))
+    long_time = min(_timed_parse(long)[0] for _ in range(3))
+    ratio = long_time / short_time
+    print(f"4x the input: {ratio:.1f}x the parse time")
+    assert ratio < 8.0  # linear is ~4x; quadratic would be ~16x
@@ -0,0 +1,109 @@
+# pyright: reportUnknownMemberType=false
+"""Benchmarks for the diarization bookkeeping on synthetic long-meeting timelines.
+
+Skipped by default (see ``addopts`` in ``pyproject.toml``). Run with:
+
+    uv run pytest -m benchmark -s
+
+Each benchmark checks the columnar implementation (:class:`SpeakerTurns`)
+against the original per-segment pyannote loop on the same synthetic input,
+then prints both timings. Grouping runs on ~10 hours of audio (~40k diarized
+turns); the ``Timeline.crop`` reference is quadratic, so the filter
+comparison uses a ~45-minute slice (3k turns) to finish in seconds.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+import numpy as np
+import pytest
+from pyannote.core import Segment, Timeline
+
+from scriber.transcription.turns import SpeakerTurns
+
+pytestmark = pytest.mark.benchmark
+
+T = TypeVar("T")
+
+_N_TURNS = 40_000
+_N_FILTER_TURNS = 3_000
+_N_SPEAKERS = 6
+
+
+def _synthetic_turns(n_turns: int = _N_TURNS, seed: int = 0) -> list[tuple[str, Segment]]:
+    rng = np.random.default_rng(seed)
+    durations = rng.uniform(0.2, 1.5, n_turns)
+    gaps = rng.exponential(0.3, n_turns)
+    starts = np.cumsum(durations + gaps) - durations
+    # Speakers keep the floor for a few turns in a row, like real meetings.
+    speakers = np.repeat(rng.integers(0, _N_SPEAKERS, n_turns // 4 + 1), 4)[:n_turns]
+    return [
+        (f"SPEAKER_{spk:02d}", Segment(float(start), float(start + dur)))
+        for spk, start, dur in zip(speakers.tolist(), starts, durations, strict=True)
+    ]
+
+
+def _synthetic_speech(turns: list[tuple[str, Segment]], seed: int = 1) -> Timeline:
+    rng = np.random.default_rng(seed)
+    kept = [segment for _, segment in turns if rng.random() < 0.9]  # VAD misses some turns
+    return Timeline(kept).support()
+
+
+def _reference_filter(
+    turns: list[tuple[str, Segment]],
+    speech: Timeline,
+) -> list[tuple[str, Segment]]:
+    return [(speaker, segment) for speaker, segment in turns if speech.crop(segment)]
+
+
+def _reference_group(turns: list[tuple[str, Segment]], max_gap: float) -> list[tuple[str, Segment]]:
+    grouped: list[tuple[str, Segment]] = []
+    last: str | None = None
+    start = end = 0.0
+    for speaker, segment in turns:
+        if speaker == last and segment.start - end <= max_gap:
+            end = segment.end
+            continue
+        if last is not None:
+            grouped.append((last, Segment(start, end)))
+        last, start, end = speaker, segment.start, segment.end
+    if last is not None:
+        grouped.append((last, Segment(start, end)))
+    return grouped
+
+
+def _timed(label: str, fn: Callable[[], T]) -> T:
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label}: {(time.perf_counter() - started) * 1000:.1f} ms")
+    return result
+
+
+def test_within_matches_crop() -> None:
+    turns = _synthetic_turns(_N_FILTER_TURNS)
+    speech = _synthetic_speech(turns)
+    expected = _timed("crop loop", lambda: _reference_filter(turns, speech))
+    columns = _timed("to columns", lambda: SpeakerTurns.from_pairs(turns))
+    actual = _timed("sorted sweep", lambda: columns.within(speech))
+    assert actual.to_pairs() == expected
+
+
+def test_grouped_matches_loop() -> None:
+    turns = _synthetic_turns()
+    expected = _timed("python loop", lambda: _reference_group(turns, 1.0))
+    columns = _timed("to columns", lambda: SpeakerTurns.from_pairs(turns))
+    actual = _timed("numpy runs", lambda: columns.grouped(1.0))
+    assert actual.to_pairs() == expected
+
+
+def test_full_bookkeeping_on_ten_hours() -> None:
+    turns = _synthetic_turns()
+    speech = _synthetic_speech(turns)
+    grouped = _timed(
+        "columns + within + grouped",
+        lambda: SpeakerTurns.from_pairs(turns).within(speech).grouped(1.0),
+    )
+    assert 0 < len(grouped) < len(turns)
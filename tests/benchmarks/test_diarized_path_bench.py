@@ -0,0 +1,266 @@
+# pyright: reportUnknownMemberType=false
+"""Stage-by-stage benchmark of the diarized path on synthetic multi-speaker audio.
+
+Skipped by default (see ``addopts`` in ``pyproject.toml``). Run with:
+
+    uv run pytest -m benchmark -s
+
+The audio is generated, not recorded: each speaker is a harmonic tone at its
+own pitch, amplitude-modulated at a syllable-like rate, over a faint noise
+floor, following a seeded script of turns. Because the script is known,
+the bookkeeping stages (speech filtering, grouping) are checked against it
+exactly, using an energy VAD and a fragmented "oracle" diarization that
+mimics pyannote's output (turns split into pieces, plus short spurious
+turns in the pauses).
+
+Each stage is timed on its own: decoding, VAD, diarization, filtering,
+grouping, the single whole-file whisper pass, and word-to-speaker
+assignment. The neural stages (pyannote VAD and diarization) run only when
+``HUGGINGFACE_TOKEN`` is set and the gated models are reachable; decoding
+needs ``ffmpeg`` and the whisper pass needs the ``tiny`` model (downloaded
+or cached). Missing pieces are skipped, not failed.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import shutil
+import time
+import wave
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import numpy as np
+import pytest
+import whisper
+from pyannote.core import Segment
+
+import scriber.transcription.local as plt
+from scriber.transcription.checkpoint import Checkpoint
+from scriber.transcription.turns import SpeakerTurns, assign_speakers
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import numpy.typing as npt
+
+pytestmark = pytest.mark.benchmark
+
+T = TypeVar("T")
+
+_SAMPLE_RATE = 16_000
+_MINUTES = 10
+_PITCHES = (110.0, 190.0, 270.0)  # one fundamental per synthetic speaker (Hz)
+_FRAME = 320  # 20 ms energy-VAD frames
+_BOUNDARY_TOLERANCE = 2 * _FRAME / _SAMPLE_RATE  # seconds; energy VAD resolution
+
+
+@dataclass(frozen=True)
+class _Scripted:
+    script: list[tuple[str, Segment]]
+    audio: npt.NDArray[np.float32]
+    wav: Path
+
+
+def _timed(label: str, fn: Callable[[], T]) -> T:
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label}: {(time.perf_counter() - started) * 1000:.1f} ms")
+    return result
+
+
+def _script(minutes: int = _MINUTES, seed: int = 0) -> list[tuple[str, Segment]]:
+    """Alternating turns (never the same speaker twice in a row) with pauses."""
+    rng = np.random.default_rng(seed)
+    turns: list[tuple[str, Segment]] = []
+    clock, speaker = 0.5, 0
+    while clock < minutes * 60:
+        duration = float(rng.uniform(2.0, 8.0))
+        turns.append((f"SPEAKER_{speaker:02d}", Segment(clock, clock + duration)))
+        clock += duration + float(rng.uniform(1.2, 2.5))
+        speaker = (speaker + int(rng.integers(1, len(_PITCHES)))) % len(_PITCHES)
+    return turns
+
+
+def _synthesize(script: list[tuple[str, Segment]], seed: int = 0) -> npt.NDArray[np.float32]:
+    rng = np.random.default_rng(seed)
+    total = int((script[-1][1].end + 1.0) * _SAMPLE_RATE)
+    audio = rng.normal(0.0, 0.002, total).astype(np.float32)  # noise floor
+    for label, turn in script:
+        first, last = int(turn.start * _SAMPLE_RATE), int(turn.end * _SAMPLE_RATE)
+        t = np.arange(last - first) / _SAMPLE_RATE
+        pitch = _PITCHES[int(label.rsplit("_", 1)[1])]
+        voice = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in (1, 2, 3))
+        syllables = 0.6 + 0.4 * np.sin(2 * np.pi * 4.0 * t) ** 2  # never fully silent
+        audio[first:last] += (0.2 * voice * syllables).astype(np.float32)
+    return audio
+
+
+def _write_wav(path: Path, audio: npt.NDArray[np.float32]) -> None:
+    with wave.open(str(path), "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(_SAMPLE_RATE)
+        out.writeframes((np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+
+
+def _energy_vad(audio: npt.NDArray[np.float32]) -> tuple[npt.NDArray[np.float64], ...]:
+    """Speech regions from frame RMS against a threshold well above the noise floor."""
+    frames = audio[: len(audio) // _FRAME * _FRAME].reshape(-1, _FRAME)
+    active = np.sqrt((frames**2).mean(axis=1)) > 0.02
+    edges = np.flatnonzero(np.diff(np.r_[0, active.astype(np.int8), 0]))
+    bounds = edges.reshape(-1, 2) * _FRAME / _SAMPLE_RATE
+    return bounds[:, 0].astype(np.float64), bounds[:, 1].astype(np.float64)
+
+
+def _oracle_diarization(script: list[tuple[str, Segment]], seed: int = 0) -> SpeakerTurns:
+    """pyannote-like output: each turn in pieces, plus blips of other speakers in pauses."""
+    rng = np.random.default_rng(seed)
+    pairs: list[tuple[str, Segment]] = []
+    for index, (label, turn) in enumerate(script):
+        cuts = np.sort(rng.uniform(turn.start, turn.end, int(turn.duration // 1.5)))
+        bounds = [turn.start, *cuts.tolist(), turn.end]
+        for start, end in itertools.pairwise(bounds):
+            pairs.append((label, Segment(start, max(start, end - 0.15))))
+        pairs[-1] = (label, Segment(pairs[-1][1].start, turn.end))
+        if index + 1 < len(script):
+            middle = (turn.end + script[index + 1][1].start) / 2
+            pairs.append(("SPEAKER_09", Segment(middle - 0.1, middle + 0.1)))
+    return SpeakerTurns.from_pairs(pairs)
+
+
+@pytest.fixture(scope="module")
+def scripted(tmp_path_factory: pytest.TempPathFactory) -> _Scripted:
+    script = _script()
+    audio = _timed(f"synthesize {_MINUTES} min", lambda: _synthesize(script))
+    wav = tmp_path_factory.mktemp("synthetic") / "meeting.wav"
+    _write_wav(wav, audio)
+    return _Scripted(script, audio, wav)
+
+
+def test_bookkeeping_recovers_the_script(scripted: _Scripted) -> None:
+    script = scripted.script
+    speech = _timed("VAD (energy)", lambda: _energy_vad(scripted.audio))
+    diarized = _oracle_diarization(script)
+    kept = _timed("filtering", lambda: diarized.within_regions(*speech))
+    grouped = _timed("grouping", lambda: kept.grouped(plt._MAX_SPEAKER_GAP))
+
+    assert [label for label, _ in grouped.to_pairs()] == [label for label, _ in script]
+    np.testing.assert_allclose(
+        grouped.starts,
+        [turn.start for _, turn in script],
+        atol=_BOUNDARY_TOLERANCE,
+    )
+    np.testing.assert_allclose(grouped.ends, [turn.end for _, turn in script], atol=1e-9)
+
+
+def _whisper_words(script: list[tuple[str, Segment]]) -> list[dict[str, Any]]:
+    """Whisper-like segments: fixed 6 s windows of 0.4 s words, blind to speaker changes."""
+    words: list[dict[str, Any]] = [
+        {"start": start, "end": start + 0.35, "word": " la"}
+        for _, turn in script
+        for start in np.arange(turn.start, turn.end - 0.35, 0.4).tolist()
+    ]
+    segments: list[dict[str, Any]] = []
+    for _, group in itertools.groupby(words, key=lambda word: int(word["start"] // 6)):
+        chunk = list(group)
+        segments.append(
+            {
+                "start": chunk[0]["start"],
+                "end": chunk[-1]["end"],
+                "text": "".join(word["word"] for word in chunk),
+                "words": chunk,
+            },
+        )
+    return segments
+
+
+def _speaker_at(script: list[tuple[str, Segment]], seconds: float) -> str:
+    return next(label for label, turn in script if turn.start <= seconds <= turn.end)
+
+
+def test_speaker_assignment(scripted: _Scripted) -> None:
+    script = scripted.script
+    turns = SpeakerTurns.from_pairs(script)
+    segments = _whisper_words(script)
+    assigned = _timed(
+        f"assign_speakers ({sum(len(s['words']) for s in segments)} words)",
+        lambda: assign_speakers(
+            segments,
+            turns,
+            max_gap=plt._MAX_SPEAKER_GAP,
+            min_turn_duration=plt.MIN_SEGMENT_DURATION,
+        ),
+    )
+    for segment in assigned:
+        middle = (segment["start"] + segment["end"]) / 2
+        assert segment["speaker"] == _speaker_at(script, middle)
+
+
+def test_whisper_pass(scripted: _Scripted) -> None:
+    device = plt.get_device()
+    try:
+        model = _timed("load whisper tiny", lambda: plt._load_model("tiny", device))
+    except (OSError, RuntimeError) as exc:
+        pytest.skip(f"whisper tiny model unavailable: {exc}")
+    state = Checkpoint(
+        audio_fingerprint="",
+        model_size="tiny",
+        requested_language="en",
+        language="en",
+        offset=0.0,
+    )
+    segments = _timed(
+        "whisper (whole file, word timestamps)",
+        lambda: list(
+            plt._decode(
+                model,
+                scripted.audio,
+                device,
+                state,
+                chunk_seconds=plt.STREAM_CHUNK_SECONDS,
+                checkpoint_path=None,
+                word_timestamps=True,
+            ),
+        ),
+    )
+    turns = SpeakerTurns.from_pairs(scripted.script).grouped(plt._MAX_SPEAKER_GAP)
+    assigned = _timed(
+        "assign_speakers (whisper output)",
+        lambda: assign_speakers(
+            segments,
+            turns,
+            max_gap=plt._MAX_SPEAKER_GAP,
+            min_turn_duration=plt.MIN_SEGMENT_DURATION,
+        ),
+    )
+    print(f"whisper: {len(segments)} segments, {len(assigned)} after speaker assignment")
+    assert {segment["speaker"] for segment in assigned} <= {label for label, _ in scripted.script}
+
+
+def test_decoding(scripted: _Scripted) -> None:
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg not installed")
+    decoded = _timed("decoding (whisper.load_audio)", lambda: whisper.load_audio(str(scripted.wav)))
+    assert abs(len(decoded) - len(scripted.audio)) <= _FRAME
+
+
+def test_neural_stages(scripted: _Scripted) -> None:
+    if not os.environ.get("HUGGINGFACE_TOKEN"):
+        pytest.skip("HUGGINGFACE_TOKEN not set; pyannote stages need the gated models")
+    try:
+        _timed("load pipelines", lambda: plt.preload_pipeline(plt.VAD_PIPELINE))
+        plt.preload_pipeline(plt.DIARIZATION_PIPELINE)
+    except OSError as exc:
+        pytest.skip(f"pyannote pipelines unavailable: {exc}")
+    waveform = plt.waveform_input(scripted.audio)
+    speech = _timed("VAD (pyannote)", lambda: plt.detect_speech_segments(waveform))
+    annotation, _ = _timed("diarization (pyannote)", lambda: plt._diarize(waveform))
+    scripted_speech = sum(turn.duration for _, turn in scripted.script)
+    print(
+        f"pyannote: {len(annotation.labels())} speakers (script: {len(_PITCHES)}), "
+        f"{speech.duration():.0f}s speech (script: {scripted_speech:.0f}s)",
+    )
+    assert speech.duration() >= 0.0
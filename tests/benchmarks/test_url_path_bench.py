@@ -0,0 +1,118 @@
+"""Benchmark of the URL path (``scriber prefetch``, ``handle_url``) against recorded responses.
+
+Skipped by default (see ``addopts`` in ``pyproject.toml``). Run with:
+
+    uv run pytest -m benchmark -s
+
+No network: every YouTube request is served by
+:mod:`scriber.transcription.replay` from a generated fixture directory,
+with ``_LATENCY_MS`` of injected latency per request standing in for the
+round-trip. Prefetching the corpus with several workers must be faster than
+one at a time by close to the worker count; re-running ``handle_url`` over
+the warmed caches must make no request at all.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+
+from scriber.handlers import handle_url
+from scriber.prefetch import prefetch
+from scriber.settings import Settings
+from scriber.transcription.replay import ReplayConfig
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytestmark = pytest.mark.benchmark
+
+_VIDEOS = 32
+_LATENCY_MS = 50
+_WORKERS = 8
+
+
+def _record_corpus(config: ReplayConfig) -> list[str]:
+    """Write an info dict and a one-minute SRT track for each of ``_VIDEOS`` videos."""
+    video_ids = [f"vid{i:05d}" for i in range(_VIDEOS)]
+    srt = "".join(
+        f"{n + 1}\n00:00:{n:02d},000 --> 00:00:{n:02d},900\nline {n} of the talk\n\n"
+        for n in range(60)
+    )
+    for video_id in video_ids:
+        caption_url = f"https://captions.test/{video_id}.srt"
+        info = {
+            "id": video_id,
+            "title": f"Talk {video_id}",
+            "subtitles": {"en": [{"ext": "srt", "url": caption_url}]},
+        }
+        for path, data in (
+            (config.info_path(video_id), json.dumps(info)),
+            (config.http_path(caption_url), srt),
+        ):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(data, encoding="utf-8")
+    return video_ids
+
+
+def _settings(root: Path) -> Settings:
+    return Settings(output_dir=root / "out", cache_dir=root / "cache")
+
+
+def test_prefetch_throughput_scales_with_workers(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = ReplayConfig(tmp_path / "replay")
+    video_ids = _record_corpus(config)
+    monkeypatch.setenv("YT_REPLAY_DIR", str(config.root))
+    monkeypatch.setenv("YT_REPLAY_LATENCY_MS", str(_LATENCY_MS))
+
+    timings: dict[int, float] = {}
+    for workers in (1, _WORKERS):
+        settings = _settings(tmp_path / f"run{workers}")
+        t0 = time.perf_counter()
+        results = list(prefetch(iter(video_ids), settings, concurrency=workers))
+        timings[workers] = time.perf_counter() - t0
+        assert all(r.status == "captions" for r in results)
+
+    floor = _VIDEOS * 2 * _LATENCY_MS / 1000  # two requests per video, one at a time
+    speedup = timings[1] / timings[_WORKERS]
+    print(
+        f"\nprefetch {_VIDEOS} videos at {_LATENCY_MS} ms/request: "
+        f"1 worker {timings[1]:.2f}s (floor {floor:.2f}s), "
+        f"{_WORKERS} workers {timings[_WORKERS]:.2f}s, speedup x{speedup:.1f}",
+    )
+    assert speedup > _WORKERS / 2
+
+
+def test_warm_rerun_makes_no_request(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    config = ReplayConfig(tmp_path / "replay")
+    video_ids = _record_corpus(config)
+    monkeypatch.setenv("YT_REPLAY_DIR", str(config.root))
+    monkeypatch.setenv("YT_REPLAY_LATENCY_MS", str(_LATENCY_MS))
+    settings = _settings(tmp_path)
+
+    def run_all() -> float:
+        t0 = time.perf_counter()
+        for video_id in video_ids:
+            args = MagicMock(
+                input_path=f"https://www.youtube.com/watch?v={video_id}",
+                language=None,
+                force=False,
+                offline=False,
+            )
+            assert handle_url(args, settings).source == "yt_manual"
+        return time.perf_counter() - t0
+
+    cold = run_all()
+    warm = run_all()
+    print(
+        f"\nhandle_url x{_VIDEOS}: cold {cold:.2f}s, warm (cached) {warm:.2f}s",
+    )
+    # A single replayed request per video would already cost _LATENCY_MS.
+    assert warm < _VIDEOS * _LATENCY_MS / 1000
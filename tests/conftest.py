@@ -1,4 +1,4 @@
-"""Shared fixtures for logger tests."""
+"""Shared fixtures: logger isolation, and a fresh YouTube rate limiter per test."""
 
 import logging
 from collections.abc import Generator
@@ -6,6 +6,15 @@ from pathlib import Path
 
 import pytest
 
+from scriber.transcription.rate_limit import YOUTUBE_LIMITER
+
+
+@pytest.fixture(autouse=True)
+def unlimited_youtube() -> Generator[None]:
+    """``main`` and ``prefetch.run`` configure the process-wide limiter; undo it after each test."""
+    yield
+    YOUTUBE_LIMITER.configure(None)
+
 
 @pytest.fixture
 def reset_root_logger() -> Generator[logging.Logger]:
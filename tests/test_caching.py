@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 from scriber.handlers import handle_url
 from scriber.settings import Settings
 from scriber.transcription.youtube_audio import download_youtube_audio
 from scriber.transcription.youtube_captions import TranscriptUnavailableError
+from scriber.transcription.youtube_metadata import VideoMetadata
+
+_METADATA = VideoMetadata({"id": "abc", "title": "Vid"})
 
 
 def _settings(tmp_path: Path) -> Settings:
@@ -24,11 +29,17 @@ def _settings(tmp_path: Path) -> Settings:
         whisper_model_size="small",
         output_dir=tmp_path / "out",
         downloads_dir=tmp_path / "dl",
+        cache_dir=tmp_path / "cache",
         wrap_width=80,
         summary_mode="auto",
     )
 
 
+def _stream(text: str, lang: str) -> tuple[str, Iterator[dict[str, Any]]]:
+    """Fake ``stream_transcription`` result: one segment carrying ``text``."""
+    return lang, iter([{"start": 0.0, "end": 1.0, "text": text}])
+
+
 def _args(**overrides: object) -> MagicMock:
     defaults: dict[str, object] = {
         "input_path": "https://youtu.be/abc",
@@ -36,6 +47,11 @@ def _args(**overrides: object) -> MagicMock:
         "diarize": False,
         "with_openai": False,
         "force": False,
+        "enroll": None,
+        "diarization_window": None,
+        "channel_speakers": False,
+        "offline": False,
+        "subtitles": False,
         "model_size": None,
         "llm_provider": None,
         "llm_model": None,
@@ -54,7 +70,7 @@ class TestDownloadCache:
                 "scriber.transcription.youtube_audio.fetch_video_title",
                 return_value="Cached Title",
             ) as fetch,
-            patch("scriber.transcription.youtube_audio.yt_dlp.YoutubeDL") as ydl,
+            patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as ydl,
         ):
             audio_path, title = download_youtube_audio("https://youtu.be/abc", out)
         assert audio_path == out / "abc.wav"
@@ -77,7 +93,7 @@ class TestDownloadCache:
             return {"id": "abc", "title": "Re-downloaded"}
 
         ctx.extract_info.side_effect = _extract_info
-        with patch("scriber.transcription.youtube_audio.yt_dlp.YoutubeDL", return_value=ctx) as ydl:
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL", return_value=ctx) as ydl:
             audio_path, title = download_youtube_audio(
                 "https://youtu.be/abc",
                 out,
@@ -96,6 +112,7 @@ class TestHandleUrlCachedTranscript:
         (s.output_dir / "Vid transcript.txt").write_text("cached body", encoding="utf8")
         with (
             patch("scriber.handlers.pya.extract_video_id", return_value="abc"),
+            patch("scriber.handlers.pymeta.fetch_video_metadata", return_value=_METADATA),
             patch(
                 "scriber.handlers.pytt.get_youtube_transcript",
                 side_effect=TranscriptUnavailableError("lang_not_found", "x"),
@@ -104,7 +121,7 @@ class TestHandleUrlCachedTranscript:
                 "scriber.handlers.pya.download_youtube_audio",
                 return_value=(s.downloads_dir / "abc.wav", "Vid"),
             ),
-            patch("scriber.handlers.plt.transcribe_audio_full") as transcribe,
+            patch("scriber.handlers.plt.stream_transcription") as transcribe,
         ):
             t = handle_url(_args(), s)
         transcribe.assert_not_called()
@@ -116,6 +133,7 @@ class TestHandleUrlCachedTranscript:
         (s.output_dir / "Vid transcript.txt").write_text("STALE", encoding="utf8")
         with (
             patch("scriber.handlers.pya.extract_video_id", return_value="abc"),
+            patch("scriber.handlers.pymeta.fetch_video_metadata", return_value=_METADATA),
             patch(
                 "scriber.handlers.pytt.get_youtube_transcript",
                 side_effect=TranscriptUnavailableError("lang_not_found", "x"),
@@ -125,8 +143,8 @@ class TestHandleUrlCachedTranscript:
                 return_value=(s.downloads_dir / "abc.wav", "Vid"),
             ),
             patch(
-                "scriber.handlers.plt.transcribe_audio_full",
-                return_value=("fresh body", "en", []),
+                "scriber.handlers.plt.stream_transcription",
+                return_value=_stream("fresh body", "en"),
             ) as transcribe,
         ):
             t = handle_url(_args(force=True), s)
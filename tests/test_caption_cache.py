@@ -0,0 +1,67 @@
+"""Tests for transcription.caption_cache — parsed caption tracks kept between runs."""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from scriber.transcription.caption_cache import PARSER_VERSION, CaptionCache
+from scriber.transcription.youtube_captions import CaptionTrack
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_TRACK = CaptionTrack(
+    text="so today we look at",
+    lang="en",
+    kind="auto",
+    segments=[
+        {
+            "start": 0.4,
+            "end": 3.0,
+            "text": "so today we",
+            "words": [{"word": "so", "start": 0.4, "end": 3.0}],
+        },
+        {"start": 3.0, "end": 5.5, "text": "look at"},
+    ],
+)
+
+
+class TestCaptionCache:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        cache = CaptionCache(tmp_path)
+        cache.save("abc", "en-US", _TRACK, source_format="json3")
+        assert CaptionCache(tmp_path).load("abc", "en-US", "auto") == _TRACK
+
+    def test_keyed_by_video_lang_and_kind(self, tmp_path: Path) -> None:
+        cache = CaptionCache(tmp_path)
+        cache.save("abc", "en-US", _TRACK, source_format="json3")
+        assert cache.load("abc", "en-US", "manual") is None
+        assert cache.load("abc", "en", "auto") is None
+        assert cache.load("xyz", "en-US", "auto") is None
+
+    def test_missing_database_is_a_miss(self, tmp_path: Path) -> None:
+        assert CaptionCache(tmp_path).load("abc", "en", "auto") is None
+        assert not (tmp_path / "captions.sqlite").exists()
+
+    def test_entries_from_another_parser_version_are_ignored(self, tmp_path: Path) -> None:
+        cache = CaptionCache(tmp_path)
+        cache.save("abc", "en", _TRACK, source_format="vtt")
+        with patch("scriber.transcription.caption_cache.PARSER_VERSION", PARSER_VERSION + 1):
+            assert cache.load("abc", "en", "auto") is None
+
+    def test_stores_source_format_and_fetch_time(self, tmp_path: Path) -> None:
+        CaptionCache(tmp_path).save("abc", "en", _TRACK, source_format="vtt")
+        with sqlite3.connect(tmp_path / "captions.sqlite") as conn:
+            source_format, fetched_at = conn.execute(
+                "SELECT source_format, fetched_at FROM captions",
+            ).fetchone()
+        assert source_format == "vtt"
+        assert fetched_at > 0
+
+    def test_unreadable_database_is_a_miss(self, tmp_path: Path) -> None:
+        (tmp_path / "captions.sqlite").write_bytes(b"not a database")
+        cache = CaptionCache(tmp_path)
+        assert cache.load("abc", "en", "auto") is None
+        cache.save("abc", "en", _TRACK, source_format="vtt")  # logged, not raised
@@ -0,0 +1,98 @@
+# pyright: reportUnknownMemberType=false
+"""Tests for transcription.channels — speaker turns from per-channel energy."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+import scriber.transcription.local as plt
+from scriber.transcription.channels import SAMPLE_RATE, channel_turns
+
+
+def _tone(seconds: float, level: float = 0.3) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (level * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+
+
+def _call() -> np.ndarray:
+    """Left talks 0-2 s, right 3-5 s (with faint bleed of left), left again 6-7 s."""
+    left = np.zeros(8 * SAMPLE_RATE, dtype=np.float32)
+    right = np.zeros_like(left)
+    left[0 : 2 * SAMPLE_RATE] = _tone(2.0)
+    right[0 : 2 * SAMPLE_RATE] = _tone(2.0, level=0.01)  # crosstalk, 30 dB down
+    right[3 * SAMPLE_RATE : 5 * SAMPLE_RATE] = _tone(2.0)
+    left[6 * SAMPLE_RATE : 7 * SAMPLE_RATE] = _tone(1.0)
+    return np.stack([left, right])
+
+
+class TestChannelTurns:
+    def test_one_speaker_per_channel(self) -> None:
+        result = channel_turns(_call())
+        assert result is not None
+        turns, (speech_starts, speech_ends) = result
+        pairs = [(label, round(seg.start, 2), round(seg.end, 2)) for label, seg in turns.to_pairs()]
+        assert pairs == [
+            ("SPEAKER_00", 0.0, 2.0),
+            ("SPEAKER_01", 3.0, 5.0),
+            ("SPEAKER_00", 6.0, 7.0),
+        ]
+        np.testing.assert_allclose(speech_starts, [0.0, 3.0, 6.0])
+        np.testing.assert_allclose(speech_ends, [2.0, 5.0, 7.0])
+
+    def test_same_signal_on_both_channels_is_not_separated(self) -> None:
+        mono = _call().sum(axis=0)
+        assert channel_turns(np.stack([mono, mono])) is None
+
+    def test_single_channel_or_silence_is_not_separated(self) -> None:
+        assert channel_turns(_call()[:1]) is None
+        assert channel_turns(np.zeros((2, SAMPLE_RATE), dtype=np.float32)) is None
+
+    def test_only_one_channel_speaking_is_not_separated(self) -> None:
+        audio = _call()
+        audio[1] = 0.0
+        assert channel_turns(audio) is None
+
+    def test_short_pauses_stay_inside_a_turn(self) -> None:
+        audio = _call()
+        breath = slice(int(0.9 * SAMPLE_RATE), int(1.1 * SAMPLE_RATE))
+        audio[:, breath] = 0.0  # 0.2 s pause, bleed included
+        result = channel_turns(audio)
+        assert result is not None
+        assert len(result[0]) == 3
+
+
+class TestDiarizedPathUsesChannels:
+    def test_separated_channels_skip_pyannote(self) -> None:
+        model = MagicMock()
+        segments: list[dict[str, Any]] = [
+            {
+                "start": 0.0,
+                "end": 2.0,
+                "text": " hello",
+                "words": [{"word": " hello", "start": 0.2, "end": 1.8}],
+            },
+            {
+                "start": 3.0,
+                "end": 5.0,
+                "text": " hi",
+                "words": [{"word": " hi", "start": 3.2, "end": 4.8}],
+            },
+        ]
+        with (
+            patch.object(plt, "get_device", return_value="cpu"),
+            patch.object(plt, "_load_model", return_value=model),
+            patch.object(plt, "load_audio_channels", return_value=_call()),
+            patch.object(plt, "_iter_segments", return_value=iter(segments)),
+            patch.object(plt, "_diarize_columns") as pyannote,
+        ):
+            text, lang, _ = plt.transcribe_audio_with_diarization(
+                "call.wav",
+                language="en",
+                channel_speakers=True,
+            )
+        pyannote.assert_not_called()
+        assert lang == "en"
+        assert text == "SPEAKER_00: hello\nSPEAKER_01: hi"
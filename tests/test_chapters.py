@@ -0,0 +1,64 @@
+"""Tests for chapters — splitting timed transcripts by video chapter + deep-links."""
+
+from __future__ import annotations
+
+from scriber.chapters import format_offset, split_by_chapters, timestamp_url
+from scriber.model import Chapter
+
+_CHAPTERS = [
+    Chapter("Intro", 0.0, 60.0),
+    Chapter("Silence", 60.0, 120.0),
+    Chapter("Main", 120.0, 600.0),
+]
+
+
+def _seg(start: float, text: str) -> dict[str, object]:
+    return {"start": start, "end": start + 1.0, "text": text}
+
+
+class TestSplitByChapters:
+    def test_segments_grouped_by_start(self) -> None:
+        segments = [_seg(0.0, "hi"), _seg(59.5, "welcome"), _seg(120.0, "so"), _seg(300.0, "end")]
+        assert split_by_chapters(segments, _CHAPTERS) == [
+            (_CHAPTERS[0], "hi welcome"),
+            (_CHAPTERS[2], "so end"),
+        ]
+
+    def test_unordered_segments(self) -> None:
+        segments = [_seg(300.0, "b"), _seg(10.0, "a")]
+        assert split_by_chapters(segments, _CHAPTERS) == [
+            (_CHAPTERS[0], "a"),
+            (_CHAPTERS[2], "b"),
+        ]
+
+    def test_speech_before_first_chapter_goes_to_it(self) -> None:
+        chapters = [Chapter("Late start", 5.0, 60.0)]
+        assert split_by_chapters([_seg(1.0, "early")], chapters) == [(chapters[0], "early")]
+
+    def test_blank_segments_ignored(self) -> None:
+        assert split_by_chapters([_seg(70.0, "  ")], _CHAPTERS) == []
+
+    def test_no_chapters(self) -> None:
+        assert split_by_chapters([_seg(0.0, "hi")], []) == []
+
+
+class TestFormatOffset:
+    def test_minutes(self) -> None:
+        assert format_offset(0) == "0:00"
+        assert format_offset(125.9) == "2:05"
+
+    def test_hours(self) -> None:
+        assert format_offset(3725) == "1:02:05"
+
+
+class TestTimestampUrl:
+    def test_short_link(self) -> None:
+        assert timestamp_url("https://youtu.be/abc", 90.4) == "https://youtu.be/abc?t=90"
+
+    def test_watch_url_keeps_video_id(self) -> None:
+        url = timestamp_url("https://www.youtube.com/watch?v=abc", 30)
+        assert url == "https://www.youtube.com/watch?v=abc&t=30"
+
+    def test_replaces_existing_timestamp(self) -> None:
+        url = timestamp_url("https://www.youtube.com/watch?v=abc&t=5s", 30)
+        assert url == "https://www.youtube.com/watch?v=abc&t=30"
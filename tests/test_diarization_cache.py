@@ -0,0 +1,108 @@
+"""Tests for the content-keyed diarization cache."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import numpy as np
+from pyannote.core import Segment, Timeline
+
+import scriber.transcription.local as plt
+from scriber.transcription.diarization_cache import DiarizationCache
+from scriber.transcription.turns import SpeakerTurns
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_PAIRS = [("A", Segment(0.0, 2.0)), ("B", Segment(2.5, 4.0))]
+_SPEECH = (np.array([0.0, 2.5]), np.array([2.0, 4.0]))
+_PIPELINES = ("pyannote/speaker-diarization-3.1",)
+_VOICES = {"A": np.array([1.0, 0.0], dtype=np.float32), "B": np.array([0.0, 1.0], dtype=np.float32)}
+
+
+class TestDiarizationCache:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        cache = DiarizationCache(tmp_path)
+        cache.save("fp", _PIPELINES, SpeakerTurns.from_pairs(_PAIRS), _SPEECH)
+        loaded = cache.load("fp", _PIPELINES)
+        assert loaded is not None
+        turns, speech = loaded
+        assert turns.to_pairs() == _PAIRS
+        np.testing.assert_array_equal(speech[0], _SPEECH[0])
+        np.testing.assert_array_equal(speech[1], _SPEECH[1])
+
+    def test_empty_turns_round_trip(self, tmp_path: Path) -> None:
+        cache = DiarizationCache(tmp_path)
+        empty = (np.array([]), np.array([]))
+        cache.save("fp", _PIPELINES, SpeakerTurns.from_pairs([]), empty)
+        loaded = cache.load("fp", _PIPELINES)
+        assert loaded is not None
+        assert len(loaded[0]) == 0
+
+    def test_key_covers_audio_and_pipelines(self, tmp_path: Path) -> None:
+        cache = DiarizationCache(tmp_path)
+        cache.save("fp", _PIPELINES, SpeakerTurns.from_pairs(_PAIRS), _SPEECH)
+        assert cache.load("other", _PIPELINES) is None
+        assert cache.load("fp", (*_PIPELINES, "pyannote/voice-activity-detection")) is None
+
+    def test_key_covers_pyannote_version(self, tmp_path: Path) -> None:
+        cache = DiarizationCache(tmp_path)
+        cache.save("fp", _PIPELINES, SpeakerTurns.from_pairs(_PAIRS), _SPEECH)
+        with patch(
+            "scriber.transcription.diarization_cache._pyannote_version",
+            return_value="99.0",
+        ):
+            assert cache.load("fp", _PIPELINES) is None
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path) -> None:
+        cache = DiarizationCache(tmp_path)
+        path = cache.path_for("fp", _PIPELINES)
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"not an npz")
+        assert cache.load("fp", _PIPELINES) is None
+
+
+class TestDiarizeColumns:
+    def _run(self, cache: DiarizationCache, **kwargs: Any) -> tuple[SpeakerTurns, Any]:
+        audio = np.ones(1600, dtype=np.float32)
+        return plt._diarize_columns(audio, "diarization", cache, **kwargs)
+
+    def test_second_run_skips_pyannote(self, tmp_path: Path) -> None:
+        cache = DiarizationCache(tmp_path)
+        speech = Timeline([Segment(0.0, 4.0)])
+        with patch.object(
+            plt,
+            "diarize_with_speech_timeline",
+            return_value=(_PAIRS, speech, _VOICES),
+        ) as diarize:
+            first, _ = self._run(cache)
+            second, _ = self._run(cache)
+        diarize.assert_called_once()
+        assert first.to_pairs() == second.to_pairs() == _PAIRS
+        assert second.voice_map().keys() == _VOICES.keys()
+        np.testing.assert_array_equal(second.voice_map()["A"], _VOICES["A"])
+
+    def test_hands_pyannote_the_decoded_waveform(self, tmp_path: Path) -> None:
+        speech = Timeline([Segment(0.0, 4.0)])
+        with patch.object(
+            plt,
+            "diarize_with_speech_timeline",
+            return_value=(_PAIRS, speech, _VOICES),
+        ) as diarize:
+            self._run(DiarizationCache(tmp_path))
+        waveform = diarize.call_args.args[0]
+        assert waveform["sample_rate"] == 16000
+        assert tuple(waveform["waveform"].shape) == (1, 1600)
+
+    def test_refresh_recomputes(self, tmp_path: Path) -> None:
+        cache = DiarizationCache(tmp_path)
+        speech = Timeline([Segment(0.0, 4.0)])
+        with patch.object(
+            plt,
+            "diarize_with_speech_timeline",
+            return_value=(_PAIRS, speech, _VOICES),
+        ) as diarize:
+            self._run(cache)
+            self._run(cache, refresh=True)
+        assert diarize.call_count == 2
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from scriber.formatting import sanitize_filename, wrap_transcript
+import textwrap
+
+from scriber.formatting import LineWrapper, sanitize_filename, wrap_transcript
 
 
 class TestSanitizeFilename:
@@ -44,3 +46,29 @@ class TestWrapTranscript:
         out = wrap_transcript(text, diarize=False, width=40)
         for line in out.splitlines():
             assert len(line) <= 40
+
+
+class TestLineWrapper:
+    def test_matches_textwrap_when_fed_piecemeal(self) -> None:
+        pieces = [" Lorem ipsum dolor", " sit amet, consectetur", " adipiscing elit sed do"] * 5
+        wrapper = LineWrapper(24)
+        lines = [line for piece in pieces for line in wrapper.feed(piece)]
+        lines.append(wrapper.flush())
+        expected = textwrap.fill(
+            "".join(pieces),
+            width=24,
+            break_long_words=False,
+            break_on_hyphens=False,
+        )
+        assert "\n".join(lines) == expected
+
+    def test_long_word_gets_own_line(self) -> None:
+        wrapper = LineWrapper(5)
+        assert wrapper.feed("a supercalifragilistic b") == ["a", "supercalifragilistic"]
+        assert wrapper.flush() == "b"
+
+    def test_flush_resets(self) -> None:
+        wrapper = LineWrapper(80)
+        wrapper.feed("hello")
+        assert wrapper.flush() == "hello"
+        assert wrapper.flush() == ""
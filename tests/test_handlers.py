@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+import pytest
+import requests
+from yt_dlp.utils import DownloadError
+
 from scriber.handlers import (
     Transcript,
     handle_media,
@@ -13,8 +18,13 @@ from scriber.handlers import (
     summarize,
     write_transcript_file,
 )
+from scriber.model import Chapter
 from scriber.settings import Settings
+from scriber.transcription.metadata_cache import MetadataCache, MetadataNotCachedError
+from scriber.transcription.rate_limit import YouTubeThrottledError
+from scriber.transcription.speakers import SpeakerIndex
 from scriber.transcription.youtube_captions import CaptionTrack, TranscriptUnavailableError
+from scriber.transcription.youtube_metadata import NotCachedError, VideoMetadata
 
 
 def _track(text: str = "caption text", lang: str = "en", kind: str = "manual") -> CaptionTrack:
@@ -22,9 +32,15 @@ def _track(text: str = "caption text", lang: str = "en", kind: str = "manual") -
 
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
 
+def _stream(text: str, lang: str) -> tuple[str, Iterator[dict[str, Any]]]:
+    """Fake ``stream_transcription`` result: one segment carrying ``text``."""
+    return lang, iter([{"start": 0.0, "end": 1.0, "text": text}])
+
+
 def _args(**overrides: object) -> MagicMock:
     defaults: dict[str, object] = {
         "input_path": "",
@@ -32,6 +48,11 @@ def _args(**overrides: object) -> MagicMock:
         "diarize": False,
         "with_openai": False,
         "force": False,
+        "enroll": None,
+        "diarization_window": None,
+        "channel_speakers": False,
+        "offline": False,
+        "subtitles": False,
         "model_size": None,
         "llm_provider": None,
         "llm_model": None,
@@ -58,7 +79,187 @@ def _settings(**overrides: object) -> Settings:
     return Settings(**base)  # type: ignore[arg-type]  # frozen dataclass kwargs
 
 
+_METADATA = VideoMetadata({"id": "vid", "title": "Meta title"})
+_CAPTIONED = VideoMetadata(
+    {
+        "id": "vid",
+        "title": "Meta title",
+        "subtitles": {"en": [{"ext": "srt", "url": "https://captions.test/vid.srt"}]},
+    },
+)
+
+
+@pytest.fixture(autouse=True)
+def fetch_metadata(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[MagicMock]:
+    """``handle_url`` extracts metadata up front; never let it reach YouTube.
+
+    Also runs each test in ``tmp_path``, where the default ``CACHE_DIR``
+    (and its metadata cache) then lands.
+    """
+    monkeypatch.chdir(tmp_path)
+    with patch("scriber.handlers.pymeta.fetch_video_metadata", return_value=_METADATA) as fetch:
+        yield fetch
+
+
 class TestHandleUrl:
+    def test_metadata_fetched_once_and_shared(
+        self,
+        tmp_path: Path,
+        fetch_metadata: MagicMock,
+    ) -> None:
+        s = _settings(output_dir=tmp_path / "out", downloads_dir=tmp_path / "dl")
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch(
+                "scriber.handlers.pytt.get_youtube_transcript",
+                return_value=_track(text="hello"),
+            ) as captions,
+            patch("scriber.handlers.pya.fetch_video_title", return_value="T") as title,
+        ):
+            handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+        fetch_metadata.assert_called_once_with("https://y.com/watch?v=vid")
+        assert captions.call_args.kwargs["metadata"] is _METADATA
+        title.assert_called_once_with("https://y.com/watch?v=vid", _METADATA)
+
+    def test_metadata_failure_lets_each_step_fetch_its_own(
+        self,
+        tmp_path: Path,
+        fetch_metadata: MagicMock,
+    ) -> None:
+        fetch_metadata.side_effect = DownloadError("429")
+        s = _settings(output_dir=tmp_path / "out", downloads_dir=tmp_path / "dl")
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch(
+                "scriber.handlers.pytt.get_youtube_transcript",
+                return_value=_track(text="hello"),
+            ) as captions,
+            patch("scriber.handlers.pya.fetch_video_title", return_value="T"),
+        ):
+            t = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+        assert t.text == "hello"
+        assert captions.call_args.kwargs["metadata"] is None
+
+    def test_rerun_serves_metadata_from_cache(
+        self,
+        tmp_path: Path,
+        fetch_metadata: MagicMock,
+    ) -> None:
+        s = _settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch(
+                "scriber.handlers.pytt.get_youtube_transcript",
+                return_value=_track(text="hello"),
+            ) as captions,
+        ):
+            first = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+            second = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+        fetch_metadata.assert_called_once()
+        cached = captions.call_args.kwargs["metadata"]
+        assert cached.from_cache is True
+        assert first.title == second.title == "Meta title"
+
+    def test_rerun_makes_no_request_at_all(
+        self,
+        tmp_path: Path,
+        fetch_metadata: MagicMock,
+    ) -> None:
+        fetch_metadata.return_value = VideoMetadata(
+            {
+                "id": "vid",
+                "title": "Meta title",
+                "subtitles": {"en": [{"ext": "srt", "url": "https://captions.test/vid.srt"}]},
+            },
+        )
+        srt = "1\n00:00:00,000 --> 00:00:01,000\nhello\n"
+        s = _settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch("scriber.handlers.pytt.http.get_text", return_value=srt) as get_text,
+        ):
+            first = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+            second = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+        fetch_metadata.assert_called_once()
+        get_text.assert_called_once()
+        assert second.text == first.text == "hello"
+        assert second.segments == first.segments
+
+    def test_force_refetches_metadata(self, tmp_path: Path, fetch_metadata: MagicMock) -> None:
+        s = _settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch("scriber.handlers.pytt.get_youtube_transcript", return_value=_track()),
+        ):
+            handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+            handle_url(_args(input_path="https://y.com/watch?v=vid", force=True), s)
+        assert fetch_metadata.call_count == 2
+
+    def test_offline_miss_raises_without_fetching(
+        self,
+        tmp_path: Path,
+        fetch_metadata: MagicMock,
+    ) -> None:
+        s = _settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch("scriber.handlers.pytt.get_youtube_transcript") as captions,
+            pytest.raises(MetadataNotCachedError),
+        ):
+            handle_url(_args(input_path="https://y.com/watch?v=vid", offline=True), s)
+        fetch_metadata.assert_not_called()
+        captions.assert_not_called()
+
+    def test_offline_caption_miss_raises_without_fetching(self, tmp_path: Path) -> None:
+        s = _settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+        MetadataCache(s.cache_dir, ttl_seconds=3600.0).save(_CAPTIONED)
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch("scriber.handlers.pytt.http.get_text") as get_text,
+            patch("scriber.handlers.pya.download_youtube_audio") as download,
+            pytest.raises(NotCachedError, match="captions"),
+        ):
+            handle_url(_args(input_path="https://y.com/watch?v=vid", offline=True), s)
+        get_text.assert_not_called()
+        download.assert_not_called()
+
+    def test_offline_whisper_fallback_needs_downloaded_audio(self, tmp_path: Path) -> None:
+        s = _settings(
+            output_dir=tmp_path / "out",
+            cache_dir=tmp_path / "cache",
+            downloads_dir=tmp_path / "dl",
+        )
+        MetadataCache(s.cache_dir, ttl_seconds=3600.0).save(_METADATA)  # no captions listed
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls,
+            patch("scriber.handlers.plt.stream_transcription") as whisper,
+            pytest.raises(NotCachedError, match="audio"),
+        ):
+            handle_url(_args(input_path="https://y.com/watch?v=vid", offline=True), s)
+        dl_cls.assert_not_called()
+        whisper.assert_not_called()
+
+    def test_stale_cached_caption_urls_refetch_metadata(
+        self,
+        tmp_path: Path,
+        fetch_metadata: MagicMock,
+    ) -> None:
+        s = _settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+        expired = TranscriptUnavailableError("download_failed", "HTTP 403")
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch(
+                "scriber.handlers.pytt.get_youtube_transcript",
+                side_effect=[_track(), expired, _track(text="fresh")],
+            ) as captions,
+        ):
+            handle_url(_args(input_path="https://y.com/watch?v=vid"), s)  # primes the cache
+            t = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+        assert t.text == "fresh"
+        assert fetch_metadata.call_count == 2
+        assert captions.call_args.kwargs["metadata"] is _METADATA
+
     def test_caption_happy_path_manual_fr(
         self,
         tmp_path: Path,
@@ -93,6 +294,42 @@ class TestHandleUrl:
         # Caption is German → summary forced to English.
         assert t.language == "en"
 
+    def test_caption_segments_reach_the_transcript(self, tmp_path: Path) -> None:
+        s = _settings(output_dir=tmp_path / "out", downloads_dir=tmp_path / "dl")
+        cues = [{"start": 0.0, "end": 1.5, "text": "hello"}]
+        track = CaptionTrack(text="hello", lang="en", kind="manual", segments=cues)
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch("scriber.handlers.pytt.get_youtube_transcript", return_value=track),
+        ):
+            t = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+        write_transcript_file(t, s, subtitles=True)
+        assert t.segments == cues
+        assert "00:00:01,500" in (tmp_path / "out" / "Meta title.srt").read_text()
+
+    def test_video_chapters_reach_the_transcript(
+        self,
+        tmp_path: Path,
+        fetch_metadata: MagicMock,
+    ) -> None:
+        fetch_metadata.return_value = VideoMetadata(
+            {
+                "id": "vid",
+                "title": "Meta title",
+                "chapters": [
+                    {"start_time": 0.0, "end_time": 90.0, "title": "Intro"},
+                    {"start_time": 90.0, "end_time": 600.0, "title": "Talk"},
+                ],
+            },
+        )
+        s = _settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            patch("scriber.handlers.pytt.get_youtube_transcript", return_value=_track()),
+        ):
+            t = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+        assert t.chapters == [Chapter("Intro", 0.0, 90.0), Chapter("Talk", 90.0, 600.0)]
+
     def test_caption_auto_marked_as_yt_auto(self, tmp_path: Path) -> None:
         s = _settings(output_dir=tmp_path / "out", downloads_dir=tmp_path / "dl")
         with (
@@ -106,6 +343,55 @@ class TestHandleUrl:
             t = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
         assert t.source == "yt_auto"
 
+    def _throttling(self, *responses: object) -> Any:
+        """Serve the caption URL with ``responses`` (an int is an HTTP error status)."""
+
+        def fetch(url: str) -> str:
+            response = next(served)
+            if isinstance(response, int):
+                error = requests.Response()
+                error.status_code = response
+                raise requests.HTTPError(f"{response} for {url}", response=error)
+            return str(response)
+
+        served = iter(responses)
+        return patch("scriber.transcription.http._fetch", side_effect=fetch)
+
+    def test_throttled_caption_download_retried(
+        self,
+        tmp_path: Path,
+        fetch_metadata: MagicMock,
+    ) -> None:
+        fetch_metadata.return_value = _CAPTIONED
+        s = _settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            self._throttling(429, "1\n00:00:00,000 --> 00:00:01,000\nhello\n"),
+            patch("scriber.transcription.rate_limit.time.sleep") as sleep,
+            patch("scriber.handlers.pya.download_youtube_audio") as download,
+        ):
+            t = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+        assert t.text == "hello"
+        sleep.assert_called_once()
+        download.assert_not_called()
+
+    def test_persistent_throttling_does_not_fall_back_to_whisper(
+        self,
+        tmp_path: Path,
+        fetch_metadata: MagicMock,
+    ) -> None:
+        fetch_metadata.return_value = _CAPTIONED
+        s = _settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+        with (
+            patch("scriber.handlers.pya.extract_video_id", return_value="vid"),
+            self._throttling(429, 429, 429, 429),
+            patch("scriber.transcription.rate_limit.time.sleep"),
+            patch("scriber.handlers.pya.download_youtube_audio") as download,
+            pytest.raises(YouTubeThrottledError),
+        ):
+            handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
+        download.assert_not_called()
+
     def test_falls_back_to_whisper_when_unavailable(
         self,
         tmp_path: Path,
@@ -122,8 +408,8 @@ class TestHandleUrl:
                 return_value=(tmp_path / "audio.wav", "Remote Video"),
             ),
             patch(
-                "scriber.handlers.plt.transcribe_audio_full",
-                return_value=("transcribed body", "fr", []),
+                "scriber.handlers.plt.stream_transcription",
+                return_value=_stream("transcribed body", "fr"),
             ) as transcribe,
         ):
             t = handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
@@ -136,6 +422,7 @@ class TestHandleUrl:
             str(tmp_path / "audio.wav"),
             model_size="small",
             language=None,
+            checkpoint_path=tmp_path / "out" / "Remote Video transcript.checkpoint.jsonl",
         )
 
     def test_fallback_with_diarization(
@@ -155,7 +442,7 @@ class TestHandleUrl:
             ),
             patch(
                 "scriber.handlers.plt.transcribe_audio_with_diarization",
-                return_value=("Alice: hi", "en"),
+                return_value=("Alice: hi", "en", []),
             ) as transcribe,
         ):
             t = handle_url(
@@ -186,8 +473,8 @@ class TestHandleUrl:
                 return_value=(tmp_path / "audio.wav", "X"),
             ),
             patch(
-                "scriber.handlers.plt.transcribe_audio_full",
-                return_value=("body", "en", []),
+                "scriber.handlers.plt.stream_transcription",
+                return_value=_stream("body", "en"),
             ) as transcribe,
         ):
             handle_url(_args(input_path="https://y.com/watch?v=vid"), s)
@@ -195,6 +482,7 @@ class TestHandleUrl:
             str(tmp_path / "audio.wav"),
             model_size="medium",
             language=None,
+            checkpoint_path=tmp_path / "out" / "X transcript.checkpoint.jsonl",
         )
 
     def test_fallback_forces_requested_language_to_whisper(
@@ -213,8 +501,8 @@ class TestHandleUrl:
                 return_value=(tmp_path / "audio.wav", "V"),
             ),
             patch(
-                "scriber.handlers.plt.transcribe_audio_full",
-                return_value=("corps", "fr", []),
+                "scriber.handlers.plt.stream_transcription",
+                return_value=_stream("corps", "fr"),
             ) as transcribe,
         ):
             t = handle_url(_args(input_path="https://y.com/watch?v=vid", language="fr"), s)
@@ -223,6 +511,7 @@ class TestHandleUrl:
             str(tmp_path / "audio.wav"),
             model_size="small",
             language="fr",
+            checkpoint_path=tmp_path / "out" / "V transcript.checkpoint.jsonl",
         )
         assert t.language == "fr"
 
@@ -246,8 +535,8 @@ class TestHandleMedia:
         with (
             patch("scriber.handlers.plt.extract_audio", return_value=audio_tmp),
             patch(
-                "scriber.handlers.plt.transcribe_audio_full",
-                return_value=("Hello world", "en", []),
+                "scriber.handlers.plt.stream_transcription",
+                return_value=_stream("Hello world", "en"),
             ) as transcribe,
             patch("scriber.handlers.Path.unlink"),
         ):
@@ -256,7 +545,12 @@ class TestHandleMedia:
         assert t.language == "en"  # detected en → summary en
         assert t.title == "video"
         assert t.source == "whisper"
-        transcribe.assert_called_once_with(audio_tmp, model_size="small", language=None)
+        transcribe.assert_called_once_with(
+            audio_tmp,
+            model_size="small",
+            language=None,
+            checkpoint_path=tmp_path / "out" / "video transcript.checkpoint.jsonl",
+        )
 
     def test_explicit_language_forces_whisper(self, tmp_path: Path) -> None:
         s = _settings(output_dir=tmp_path / "out")
@@ -266,13 +560,18 @@ class TestHandleMedia:
         with (
             patch("scriber.handlers.plt.extract_audio", return_value=audio_tmp),
             patch(
-                "scriber.handlers.plt.transcribe_audio_full",
-                return_value=("bonjour", "fr", []),
+                "scriber.handlers.plt.stream_transcription",
+                return_value=_stream("bonjour", "fr"),
             ) as transcribe,
             patch("scriber.handlers.Path.unlink"),
         ):
             t = handle_media(_args(input_path=str(media), language="fr"), s)
-        transcribe.assert_called_once_with(audio_tmp, model_size="small", language="fr")
+        transcribe.assert_called_once_with(
+            audio_tmp,
+            model_size="small",
+            language="fr",
+            checkpoint_path=tmp_path / "out" / "video transcript.checkpoint.jsonl",
+        )
         assert t.language == "fr"
 
     def test_detected_other_language_summary_in_english(self, tmp_path: Path) -> None:
@@ -282,19 +581,55 @@ class TestHandleMedia:
         audio_tmp = str(tmp_path / "audio.wav")
         with (
             patch("scriber.handlers.plt.extract_audio", return_value=audio_tmp),
-            patch("scriber.handlers.plt.transcribe_audio_full", return_value=("hallo", "de", [])),
+            patch("scriber.handlers.plt.stream_transcription", return_value=_stream("hallo", "de")),
             patch("scriber.handlers.Path.unlink"),
         ):
             t = handle_media(_args(input_path=str(media), language=None), s)
         assert t.language == "en"
 
+    def test_streams_transcript_and_subtitles_to_disk(self, tmp_path: Path) -> None:
+        s = _settings(output_dir=tmp_path / "out")
+        media = tmp_path / "video.mp4"
+        media.write_text("")
+        with (
+            patch("scriber.handlers.plt.extract_audio", return_value=str(tmp_path / "a.wav")),
+            patch(
+                "scriber.handlers.plt.stream_transcription",
+                return_value=_stream("Hello world", "en"),
+            ),
+            patch("scriber.handlers.Path.unlink"),
+        ):
+            t = handle_media(_args(input_path=str(media), subtitles=True), s)
+        assert (tmp_path / "out" / "video transcript.txt").read_text() == "Hello world"
+        assert (tmp_path / "out" / "video.srt").exists()
+        assert (tmp_path / "out" / "video.vtt").exists()
+        assert t.written is True
+
+    def test_force_discards_checkpoint(self, tmp_path: Path) -> None:
+        s = _settings(output_dir=tmp_path / "out")
+        checkpoint = tmp_path / "out" / "video transcript.checkpoint.jsonl"
+        checkpoint.parent.mkdir()
+        checkpoint.write_text("{}")
+        audio = tmp_path / "a.wav"
+        audio.write_text("")
+        with (
+            patch("scriber.handlers.plt.extract_audio", return_value=str(audio)),
+            patch(
+                "scriber.handlers.plt.stream_transcription",
+                return_value=_stream("Hello", "en"),
+            ),
+        ):
+            handle_media(_args(input_path=str(tmp_path / "video.mp4"), force=True), s)
+        assert not checkpoint.exists()
+
     def test_diarize(self, tmp_path: Path) -> None:
         s = _settings(output_dir=tmp_path / "out")
         media = tmp_path / "video.mp4"
         media.write_text("")
+        segments = [{"start": 0.0, "end": 1.0, "text": " hi", "speaker": "Alice"}]
         with patch(
             "scriber.handlers.plt.transcribe_video_file_with_diarization",
-            return_value=("Alice: hi", "en"),
+            return_value=("Alice: hi", "en", segments),
         ):
             t = handle_media(
                 _args(input_path=str(media), language=None, diarize=True),
@@ -302,6 +637,30 @@ class TestHandleMedia:
             )
         assert t.diarized is True
         assert t.text == "Alice: hi"
+        assert t.segments == segments  # speaker-tagged cues, usable for --subtitles
+
+    def test_enroll_saves_speaker_index(self, tmp_path: Path) -> None:
+        s = _settings(output_dir=tmp_path / "out", speaker_index_path=tmp_path / "voices.npz")
+        media = tmp_path / "talk.mp4"
+        media.write_text("")
+
+        def fake(
+            *_: object, speaker_index: SpeakerIndex, **__: object
+        ) -> tuple[str, str, list[Any]]:
+            speaker_index.enroll("Alice", np.ones(3, dtype=np.float32))
+            return "Alice: hi", "en", []
+
+        with patch("scriber.handlers.plt.transcribe_video_file_with_diarization", side_effect=fake):
+            handle_media(
+                _args(
+                    input_path=str(media),
+                    language=None,
+                    diarize=True,
+                    enroll=[("SPEAKER_00", "Alice")],
+                ),
+                s,
+            )
+        assert SpeakerIndex.load(tmp_path / "voices.npz").names == ["Alice"]
 
 
 class TestHandleText:
@@ -370,13 +729,31 @@ class TestWriteTranscriptFile:
         assert (tmp_path / "out" / "vid.srt").exists()
         assert (tmp_path / "out" / "vid.vtt").exists()
 
+    def test_streamed_transcript_not_rewritten(self, tmp_path: Path) -> None:
+        s = _settings(output_dir=tmp_path / "out")
+        streamed = tmp_path / "out" / "vid transcript.txt"
+        streamed.parent.mkdir()
+        streamed.write_text("streamed")
+        t = Transcript(
+            text="hello",
+            language="en",
+            title="vid",
+            source="whisper",
+            diarized=False,
+            segments=[{"start": 0.0, "end": 1.0, "text": "hello"}],
+            written=True,
+        )
+        assert write_transcript_file(t, s, subtitles=True) == streamed
+        assert streamed.read_text() == "streamed"
+        assert not (tmp_path / "out" / "vid.srt").exists()
+
     def test_subtitles_skipped_when_no_segments(self, tmp_path: Path) -> None:
         s = _settings(output_dir=tmp_path / "out")
         t = Transcript(
             text="hello",
             language="en",
             title="vid",
-            source="yt_manual",  # no segments for caption tracks
+            source="file",  # plain-text inputs carry no timing
             diarized=False,
         )
         write_transcript_file(t, s, subtitles=True)
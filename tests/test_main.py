@@ -8,16 +8,23 @@ right handler and honors `summarize` vs `transcribe` subcommands and
 
 from __future__ import annotations
 
+import argparse
 from typing import TYPE_CHECKING
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
+
+import pytest
 
 from scriber.main import main
+from scriber.transcription.metadata_cache import MetadataNotCachedError
+from scriber.transcription.rate_limit import (
+    RATE_STATE_FILE,
+    YOUTUBE_LIMITER,
+    YouTubeThrottledError,
+)
 
 if TYPE_CHECKING:
     from pathlib import Path
 
-    import pytest
-
 _URL = "https://y.com/watch?v=x"
 _URL_CLASSIFICATION = {
     "is_url": True,
@@ -54,8 +61,14 @@ def _make_args(**overrides: object) -> MagicMock:
         "downloads_dir": None,
         "summary_mode": None,
         "force": False,
+        "enroll": None,
+        "diarization_window": None,
+        "channel_speakers": False,
+        "offline": False,
         "subtitles": False,
         "dry_run": False,
+        "workers": 1,
+        "speech_detection": None,
     }
     defaults.update(overrides)
     return MagicMock(**defaults)
@@ -183,6 +196,26 @@ class TestDispatcher:
         preflight.assert_not_called()
         summ.assert_not_called()
 
+    def test_prefetch_subcommand_runs_prefetch_only(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        args = argparse.Namespace(command="prefetch", debug=False, output_dir=None)
+        with (
+            patch("scriber.main.parser.parse_args", return_value=args),
+            patch("scriber.main.initialize_logger"),
+            patch("scriber.main.prefetch.run") as run,
+            patch("scriber.main.handlers.handle_url") as h_url,
+            patch("scriber.main.make_summarizer") as preflight,
+        ):
+            main()
+        run.assert_called_once()
+        assert run.call_args.args[0] is args
+        h_url.assert_not_called()
+        preflight.assert_not_called()
+
     def test_dry_run_skips_all_work(
         self,
         tmp_path: Path,
@@ -218,3 +251,159 @@ class TestDispatcher:
             parse.return_value = _make_args(input_path=[_URL, url2])
             main()
         assert h_url.call_count == 2
+
+    def test_offline_cache_miss_skips_only_that_input(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        url2 = "https://y.com/watch?v=y"
+        with (
+            patch("scriber.main.parser.parse_args") as parse,
+            patch("scriber.main.initialize_logger"),
+            patch("scriber.main.parser.classify_input", return_value=_URL_CLASSIFICATION),
+            patch(
+                "scriber.main.handlers.handle_url",
+                side_effect=[MetadataNotCachedError("not cached"), _make_transcript()],
+            ) as h_url,
+            patch("scriber.main.handlers.write_transcript_file") as write,
+        ):
+            parse.return_value = _make_args(input_path=[_URL, url2], offline=True)
+            main()
+        assert h_url.call_count == 2
+        write.assert_called_once()
+
+    def test_throttled_input_skipped(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        with (
+            patch("scriber.main.parser.parse_args") as parse,
+            patch("scriber.main.initialize_logger"),
+            patch("scriber.main.parser.classify_input", return_value=_URL_CLASSIFICATION),
+            patch(
+                "scriber.main.handlers.handle_url",
+                side_effect=[YouTubeThrottledError("429"), _make_transcript()],
+            ) as h_url,
+            patch("scriber.main.handlers.write_transcript_file") as write,
+        ):
+            parse.return_value = _make_args(input_path=[_URL, "https://y.com/watch?v=y"])
+            main()
+        assert h_url.call_count == 2
+        write.assert_called_once()
+
+    def test_youtube_limiter_shared_through_cache_dir(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("YOUTUBE_RATE_LIMIT", "0.5")
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path / "c"))
+        with (
+            patch("scriber.main.parser.parse_args", return_value=_make_args(dry_run=True)),
+            patch("scriber.main.initialize_logger"),
+            patch("scriber.main.parser.classify_input", return_value=_URL_CLASSIFICATION),
+        ):
+            main()
+        assert YOUTUBE_LIMITER.rate == 0.5
+        assert YOUTUBE_LIMITER.state_path == tmp_path / "c" / RATE_STATE_FILE
+
+    def test_workers_route_batch_through_worker_pool(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        url2 = "https://y.com/watch?v=y"
+        with (
+            patch("scriber.main.parser.parse_args") as parse,
+            patch("scriber.main.initialize_logger"),
+            patch("scriber.main.parser.classify_input", return_value=_URL_CLASSIFICATION),
+            patch("scriber.main.plt.get_device", return_value="cpu"),
+            patch("scriber.main._run_in_workers") as pool,
+            patch("scriber.main.handlers.handle_url") as h_url,
+        ):
+            parse.return_value = _make_args(input_path=[_URL, url2], workers=4)
+            main()
+        pool.assert_called_once()
+        assert pool.call_args.kwargs["workers"] == 2  # capped at the number of inputs
+        h_url.assert_not_called()
+
+    def test_workers_fall_back_to_sequential_on_gpu(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        url2 = "https://y.com/watch?v=y"
+        with (
+            patch("scriber.main.parser.parse_args") as parse,
+            patch("scriber.main.initialize_logger"),
+            patch("scriber.main.parser.classify_input", return_value=_URL_CLASSIFICATION),
+            patch("scriber.main.plt.get_device", return_value="cuda"),
+            patch("scriber.main._run_in_workers") as pool,
+            patch("scriber.main.handlers.handle_url", return_value=_make_transcript()) as h_url,
+            patch("scriber.main.handlers.write_transcript_file"),
+        ):
+            parse.return_value = _make_args(input_path=[_URL, url2], workers=2)
+            main()
+        pool.assert_not_called()
+        assert h_url.call_count == 2
+
+    def test_diarize_preloads_pipelines_once_up_front(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        with (
+            patch("scriber.main.parser.parse_args") as parse,
+            patch("scriber.main.initialize_logger"),
+            patch("scriber.main.parser.classify_input", return_value=_MEDIA_CLASSIFICATION),
+            patch("scriber.main.plt.preload_pipeline") as preload,
+            patch("scriber.main.handlers.handle_media", return_value=_make_transcript()),
+            patch("scriber.main.handlers.write_transcript_file"),
+        ):
+            parse.return_value = _make_args(input_path=["a.mp4", "b.mp4"], diarize=True)
+            main()
+        # Speech regions come from diarization by default: no VAD pipeline needed.
+        assert preload.call_args_list == [call("pyannote/speaker-diarization-3.1")]
+
+    def test_diarize_without_token_fails_before_any_input(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        with (
+            patch("scriber.main.parser.parse_args") as parse,
+            patch("scriber.main.initialize_logger"),
+            patch("scriber.main.plt.preload_pipeline", side_effect=OSError("no token")),
+            patch("scriber.main.handlers.handle_media") as h_media,
+        ):
+            parse.return_value = _make_args(input_path=["a.mp4"], diarize=True)
+            with pytest.raises(SystemExit) as exc:
+                main()
+        assert exc.value.code == 2
+        h_media.assert_not_called()
+
+    def test_ctrl_c_exits_130(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        with (
+            patch("scriber.main.parser.parse_args") as parse,
+            patch("scriber.main.initialize_logger"),
+            patch("scriber.main.parser.classify_input", return_value=_URL_CLASSIFICATION),
+            patch("scriber.main.handlers.handle_url", side_effect=KeyboardInterrupt),
+        ):
+            parse.return_value = _make_args()
+            with pytest.raises(SystemExit) as exc:
+                main()
+        assert exc.value.code == 130
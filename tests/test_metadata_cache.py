@@ -0,0 +1,123 @@
+"""Tests for transcription.metadata_cache — the SQLite cache of yt-dlp metadata."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+
+from scriber.transcription.metadata_cache import (
+    MetadataCache,
+    MetadataNotCachedError,
+    trim_info,
+)
+from scriber.transcription.youtube_metadata import VideoMetadata
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_URL = "https://www.youtube.com/watch?v=abc"
+_INFO: dict[str, Any] = {
+    "id": "abc",
+    "title": "Talk",
+    "duration": 600,
+    "subtitles": {"en": [{"ext": "srt", "url": "https://captions.test/abc.srt"}]},
+    "automatic_captions": {},
+    "chapters": [{"start_time": 0.0, "end_time": 600.0, "title": "Intro"}],
+    "formats": [{"format_id": "251"}],
+    "thumbnails": [{"url": "https://i.test/abc.jpg"}],
+}
+
+
+def _fetching(info: dict[str, Any] = _INFO) -> Any:
+    return patch(
+        "scriber.transcription.metadata_cache.youtube_metadata.fetch_video_metadata",
+        return_value=VideoMetadata(info),
+    )
+
+
+class TestTrimInfo:
+    def test_keeps_listing_fields_only(self) -> None:
+        trimmed = trim_info(_INFO)
+        assert set(trimmed) == {
+            "id",
+            "title",
+            "duration",
+            "subtitles",
+            "automatic_captions",
+            "chapters",
+        }
+        assert trimmed["subtitles"] == _INFO["subtitles"]
+
+
+class TestMetadataCache:
+    def test_miss_fetches_and_stores(self, tmp_path: Path) -> None:
+        cache = MetadataCache(tmp_path, ttl_seconds=3600)
+        with _fetching() as fetch:
+            metadata = cache.fetch(_URL, "abc")
+        fetch.assert_called_once_with(_URL)
+        assert metadata.has_formats  # the live result, not the trimmed copy
+        assert (tmp_path / "metadata.sqlite").exists()
+
+    def test_fresh_entry_makes_no_request(self, tmp_path: Path) -> None:
+        cache = MetadataCache(tmp_path, ttl_seconds=3600)
+        with _fetching() as fetch:
+            cache.fetch(_URL, "abc")
+            again = MetadataCache(tmp_path, ttl_seconds=3600).fetch(_URL, "abc")
+        fetch.assert_called_once()
+        assert again.from_cache
+        assert again.title == "Talk"
+        assert again.subtitles == _INFO["subtitles"]
+        assert not again.has_formats
+
+    def test_expired_entry_is_refetched(self, tmp_path: Path) -> None:
+        cache = MetadataCache(tmp_path, ttl_seconds=60)
+        with _fetching() as fetch:
+            cache.fetch(_URL, "abc")
+            with patch(
+                "scriber.transcription.metadata_cache.time.time", return_value=time.time() + 120
+            ):
+                cache.fetch(_URL, "abc")
+        assert fetch.call_count == 2
+
+    def test_refresh_skips_lookup(self, tmp_path: Path) -> None:
+        cache = MetadataCache(tmp_path, ttl_seconds=3600)
+        with _fetching() as fetch:
+            cache.fetch(_URL, "abc")
+            cache.fetch(_URL, "abc", refresh=True)
+        assert fetch.call_count == 2
+
+    def test_zero_ttl_disables_cache(self, tmp_path: Path) -> None:
+        cache = MetadataCache(tmp_path, ttl_seconds=0)
+        with _fetching() as fetch:
+            cache.fetch(_URL, "abc")
+            cache.fetch(_URL, "abc")
+        assert fetch.call_count == 2
+        assert not (tmp_path / "metadata.sqlite").exists()
+
+    def test_offline_serves_expired_entries(self, tmp_path: Path) -> None:
+        with _fetching():
+            MetadataCache(tmp_path, ttl_seconds=60).fetch(_URL, "abc")
+        with (
+            _fetching() as fetch,
+            patch("scriber.transcription.metadata_cache.time.time", return_value=time.time() + 1e6),
+        ):
+            metadata = MetadataCache(tmp_path, ttl_seconds=60).fetch(_URL, "abc", offline=True)
+        fetch.assert_not_called()
+        assert metadata.title == "Talk"
+
+    def test_offline_miss_raises(self, tmp_path: Path) -> None:
+        cache = MetadataCache(tmp_path, ttl_seconds=3600)
+        with _fetching() as fetch, pytest.raises(MetadataNotCachedError, match="abc"):
+            cache.fetch(_URL, "abc", offline=True)
+        fetch.assert_not_called()
+
+    def test_unreadable_database_is_a_miss(self, tmp_path: Path) -> None:
+        (tmp_path / "metadata.sqlite").write_bytes(b"not a database")
+        cache = MetadataCache(tmp_path, ttl_seconds=3600)
+        assert cache.load("abc") is None
+        with _fetching() as fetch:
+            cache.fetch(_URL, "abc")
+        fetch.assert_called_once()
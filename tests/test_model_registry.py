@@ -0,0 +1,144 @@
+"""Tests for the memory-budgeted model registry."""
+
+from __future__ import annotations
+
+from typing import cast
+
+import torch
+from whisper.model import ModelDimensions, Whisper
+
+from scriber.transcription.models import ModelRegistry, estimate_model_bytes
+
+
+def _module(n_floats: int) -> torch.nn.Module:
+    """A module holding exactly ``n_floats`` float32 parameters (4 bytes each)."""
+    return torch.nn.Linear(n_floats, 1, bias=False)
+
+
+def _whisper() -> Whisper:
+    """A real (tiny, untrained) whisper model, sparse ``alignment_heads`` buffer included."""
+    dims = ModelDimensions(
+        n_mels=80,
+        n_audio_ctx=10,
+        n_audio_state=8,
+        n_audio_head=2,
+        n_audio_layer=1,
+        n_vocab=100,
+        n_text_ctx=8,
+        n_text_state=8,
+        n_text_head=2,
+        n_text_layer=2,
+    )
+    return Whisper(dims)
+
+
+class TestEstimateModelBytes:
+    def test_counts_parameters(self) -> None:
+        assert estimate_model_bytes(_module(10)) == 40
+
+    def test_finds_modules_inside_wrappers(self) -> None:
+        class Wrapper:
+            def __init__(self) -> None:
+                self.a = _module(10)
+                self.nested = {"b": _module(5)}
+
+        assert estimate_model_bytes(Wrapper()) == 60
+
+    def test_shared_module_counted_once(self) -> None:
+        shared = _module(10)
+
+        class Wrapper:
+            def __init__(self) -> None:
+                self.a = shared
+                self.b = shared
+
+        assert estimate_model_bytes(Wrapper()) == 40
+
+    def test_whisper_with_sparse_buffer(self) -> None:
+        model = _whisper()
+        heads = cast(torch.Tensor, model.alignment_heads)
+        assert heads.is_sparse
+        dense = sum(p.numel() * p.element_size() for p in model.parameters())
+        dense += sum(b.numel() * b.element_size() for b in model.buffers() if not b.is_sparse)
+        sparse = sum(t.numel() * t.element_size() for t in (heads._values(), heads._indices()))
+        assert estimate_model_bytes(model) == dense + sparse
+
+    def test_plain_object_is_zero(self) -> None:
+        assert estimate_model_bytes(object()) == 0
+
+
+class TestModelRegistry:
+    def test_loader_called_once_per_key(self) -> None:
+        reg = ModelRegistry()
+        calls: list[str] = []
+
+        def loader() -> object:
+            calls.append("x")
+            return object()
+
+        first = reg.get(("m", "cpu"), loader)
+        second = reg.get(("m", "cpu"), loader)
+        assert first is second
+        assert calls == ["x"]
+
+    def test_unbounded_by_default(self) -> None:
+        reg = ModelRegistry()
+        for i in range(5):
+            reg.get((f"m{i}", "cpu"), lambda: _module(100))
+        assert len(reg) == 5
+
+    def test_evicts_least_recently_used_over_budget(self) -> None:
+        reg = ModelRegistry(budget_bytes=1000)  # fits two 400-byte models
+        reg.get(("a", "cpu"), lambda: _module(100))
+        reg.get(("b", "cpu"), lambda: _module(100))
+        reg.get(("a", "cpu"), lambda: _module(100))  # touch a → b is now LRU
+        reg.get(("c", "cpu"), lambda: _module(100))
+        assert ("a", "cpu") in reg
+        assert ("b", "cpu") not in reg
+        assert ("c", "cpu") in reg
+
+    def test_oversized_model_is_kept_alone(self) -> None:
+        reg = ModelRegistry(budget_bytes=100)
+        reg.get(("small", "cpu"), lambda: _module(10))
+        reg.get(("huge", "cpu"), lambda: _module(1000))
+        assert list(reg.resident_sizes()) == [("huge", "cpu")]
+
+    def test_preload_reports_size(self) -> None:
+        reg = ModelRegistry()
+        assert reg.preload(("m", "cpu"), lambda: _module(25)) == 100
+        assert reg.resident_bytes() == 100
+
+    def test_whisper_model_registered(self) -> None:
+        reg = ModelRegistry()
+        reg.get(("whisper:test", "cpu"), _whisper)
+        assert reg.resident_bytes() > 0
+
+    def test_evict(self) -> None:
+        reg = ModelRegistry()
+        reg.get(("m", "cpu"), object)
+        assert reg.evict(("m", "cpu")) is True
+        assert reg.evict(("m", "cpu")) is False
+        assert len(reg) == 0
+
+    def test_resident_sizes_in_lru_order(self) -> None:
+        reg = ModelRegistry()
+        reg.get(("a", "cpu"), lambda: _module(1))
+        reg.get(("b", "cpu"), lambda: _module(2))
+        reg.get(("a", "cpu"), lambda: _module(1))
+        assert reg.resident_sizes() == {("b", "cpu"): 8, ("a", "cpu"): 4}
+
+    def test_share_memory_skips_sparse_whisper_buffer(self) -> None:
+        reg = ModelRegistry()
+        model = reg.get(("whisper:test", "cpu"), _whisper)
+        assert reg.share_memory() > 0
+        dense: list[torch.Tensor] = [
+            t for t in (*model.parameters(), *model.buffers()) if not t.is_sparse
+        ]
+        assert all(t.is_shared() is True for t in dense)
+
+    def test_share_memory_moves_cpu_weights_to_shm(self) -> None:
+        reg = ModelRegistry()
+        model = reg.get(("m", "cpu"), lambda: _module(25))
+        assert reg.share_memory() == 100
+        params: list[torch.nn.Parameter] = list(model.parameters())
+        assert all(p.is_shared() is True for p in params)
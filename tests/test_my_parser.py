@@ -109,6 +109,46 @@ class TestSubcommands:
         assert ns.command == "summarize"
 
 
+class TestPrefetchSubcommand:
+    def test_defaults(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        ns = _run_parser(["prefetch"], monkeypatch)
+        assert ns.command == "prefetch"
+        assert ns.ids_file == "-"
+        assert ns.concurrency == 4
+        assert ns.rate == 1.0
+        assert ns.report is None
+        assert ns.language is None
+        assert ns.force is False
+
+    def test_all_flags(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        ns = _run_parser(
+            [
+                "prefetch",
+                "ids.txt",
+                "-l",
+                "fr",
+                "--concurrency",
+                "8",
+                "--rate",
+                "0.5",
+                "--report",
+                str(tmp_path / "r.csv"),
+                "--force",
+            ],
+            monkeypatch,
+        )
+        assert ns.ids_file == "ids.txt"
+        assert ns.language == "fr"
+        assert ns.concurrency == 8
+        assert ns.rate == 0.5
+        assert ns.report == tmp_path / "r.csv"
+        assert ns.force is True
+
+    def test_transcription_flags_rejected(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        with pytest.raises(SystemExit):
+            _run_parser(["prefetch", "--diarize"], monkeypatch)
+
+
 class TestTranscribeSubcommand:
     def test_url_input_accepted(self, monkeypatch: pytest.MonkeyPatch) -> None:
         ns = _run_parser(["transcribe", "https://youtube.com/watch?v=abc"], monkeypatch)
@@ -139,6 +179,12 @@ class TestTranscribeSubcommand:
         assert ns.dry_run is False
         assert ns.force is False
         assert ns.subtitles is False
+        assert ns.workers == 1
+        assert ns.speech_detection is None
+        assert ns.enroll is None
+        assert ns.diarization_window is None
+        assert ns.channel_speakers is False
+        assert ns.offline is False
 
     def test_summarize_only_flags_rejected_under_transcribe(
         self,
@@ -153,6 +199,49 @@ class TestTranscribeSubcommand:
                     monkeypatch,
                 )
 
+    def test_speech_detection_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        ns = _run_parser(
+            ["transcribe", "https://y.com/watch?v=x", "--speech-detection", "vad"],
+            monkeypatch,
+        )
+        assert ns.speech_detection == "vad"
+
+    def test_channel_speakers_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        ns = _run_parser(
+            ["transcribe", "https://y.com/watch?v=x", "--channel-speakers"],
+            monkeypatch,
+        )
+        assert ns.channel_speakers is True
+
+    def test_offline_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        ns = _run_parser(["transcribe", "https://y.com/watch?v=x", "--offline"], monkeypatch)
+        assert ns.offline is True
+
+    def test_diarization_window_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        ns = _run_parser(
+            ["transcribe", "https://y.com/watch?v=x", "--diarization-window", "60"],
+            monkeypatch,
+        )
+        assert ns.diarization_window == 60
+
+    def test_enroll_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        ns = _run_parser(
+            [
+                "transcribe",
+                "https://y.com/watch?v=x",
+                "--enroll",
+                "SPEAKER_00=Alice",
+                "--enroll",
+                "SPEAKER_01 = Bob Smith",
+            ],
+            monkeypatch,
+        )
+        assert ns.enroll == [("SPEAKER_00", "Alice"), ("SPEAKER_01", "Bob Smith")]
+
+    def test_enroll_requires_label_and_name(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        with pytest.raises(SystemExit):
+            _run_parser(["transcribe", "https://y.com/watch?v=x", "--enroll", "Alice"], monkeypatch)
+
     def test_language_fr(self, monkeypatch: pytest.MonkeyPatch) -> None:
         ns = _run_parser(
             ["transcribe", "https://y.com/watch?v=x", "--language", "fr"],
@@ -180,6 +269,10 @@ class TestTranscribeSubcommand:
         ns = _run_parser(["transcribe", "https://y.com/watch?v=x", "--dry-run"], monkeypatch)
         assert ns.dry_run is True
 
+    def test_workers_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        ns = _run_parser(["transcribe", "https://y.com/watch?v=x", "--workers", "4"], monkeypatch)
+        assert ns.workers == 4
+
     def test_model_size_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
         ns = _run_parser(
             ["transcribe", "https://y.com/watch?v=x", "--model-size", "medium"],
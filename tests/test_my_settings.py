@@ -91,6 +91,14 @@ _ALL_ENV_KEYS = (
     "DOWNLOADS_DIR",
     "WRAP_WIDTH",
     "SUMMARY_MODE",
+    "MODEL_MEMORY_BUDGET_MB",
+    "SPEECH_DETECTION",
+    "CACHE_DIR",
+    "SPEAKER_INDEX",
+    "DIARIZATION_WINDOW_MINUTES",
+    "METADATA_TTL_HOURS",
+    "SUMMARY_CONCURRENCY",
+    "YOUTUBE_RATE_LIMIT",
 )
 
 
@@ -135,8 +143,16 @@ class TestSettingsFromEnv:
         assert s.whisper_model_size == "small"
         assert s.output_dir == Path("results")
         assert s.downloads_dir == Path("downloads")
+        assert s.cache_dir == Path("cache")
+        assert s.speaker_index_path == Path("speakers.npz")
         assert s.wrap_width == 80
         assert s.summary_mode == "auto"
+        assert s.model_memory_budget_mb == 0
+        assert s.speech_detection == "diarization"
+        assert s.diarization_window_minutes == 0
+        assert s.metadata_ttl_hours == 168
+        assert s.summary_concurrency == 4
+        assert s.youtube_rate_limit == 0.0
 
     def test_full_config_overrides(
         self,
@@ -154,8 +170,16 @@ class TestSettingsFromEnv:
         monkeypatch.setenv("WHISPER_MODEL_SIZE", "medium")
         monkeypatch.setenv("OUTPUT_DIR", "out")
         monkeypatch.setenv("DOWNLOADS_DIR", "dl")
+        monkeypatch.setenv("CACHE_DIR", "c")
+        monkeypatch.setenv("SPEAKER_INDEX", "voices.npz")
         monkeypatch.setenv("WRAP_WIDTH", "100")
         monkeypatch.setenv("SUMMARY_MODE", "meeting")
+        monkeypatch.setenv("MODEL_MEMORY_BUDGET_MB", "4096")
+        monkeypatch.setenv("SPEECH_DETECTION", "vad")
+        monkeypatch.setenv("DIARIZATION_WINDOW_MINUTES", "60")
+        monkeypatch.setenv("METADATA_TTL_HOURS", "0")
+        monkeypatch.setenv("SUMMARY_CONCURRENCY", "8")
+        monkeypatch.setenv("YOUTUBE_RATE_LIMIT", "0.5")
         s = Settings.from_env()
         assert s.openai_api_key == "sk-test"
         assert s.openrouter_api_key == "or-test"
@@ -167,8 +191,16 @@ class TestSettingsFromEnv:
         assert s.whisper_model_size == "medium"
         assert s.output_dir == Path("out")
         assert s.downloads_dir == Path("dl")
+        assert s.cache_dir == Path("c")
+        assert s.speaker_index_path == Path("voices.npz")
         assert s.wrap_width == 100
         assert s.summary_mode == "meeting"
+        assert s.model_memory_budget_mb == 4096
+        assert s.speech_detection == "vad"
+        assert s.diarization_window_minutes == 60
+        assert s.metadata_ttl_hours == 0
+        assert s.summary_concurrency == 8
+        assert s.youtube_rate_limit == 0.5
 
     def test_empty_string_env_treated_as_unset(
         self,
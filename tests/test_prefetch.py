@@ -0,0 +1,212 @@
+"""Tests for prefetch — the bulk metadata/caption cache warmer."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import dataclasses
+import io
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+import requests
+from yt_dlp.utils import DownloadError
+
+from scriber import prefetch as pf
+from scriber.settings import Settings
+from scriber.transcription.caption_cache import CaptionCache
+from scriber.transcription.metadata_cache import MetadataCache
+from scriber.transcription.rate_limit import YouTubeThrottledError
+from scriber.transcription.youtube_metadata import VideoMetadata
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+_SRT = "1\n00:00:00,000 --> 00:00:01,000\nhello\n"
+
+
+def _metadata(video_id: str, *, captions: bool = True) -> VideoMetadata:
+    subtitles = {"en": [{"ext": "srt", "url": f"https://captions.test/{video_id}.srt"}]}
+    return VideoMetadata(
+        {"id": video_id, "title": f"Title {video_id}", "subtitles": subtitles if captions else {}},
+    )
+
+
+def _extracting(**kwargs: Any) -> Any:
+    return patch("scriber.handlers.pymeta.fetch_video_metadata", **kwargs)
+
+
+def _serving(**kwargs: Any) -> Any:
+    return patch("scriber.transcription.youtube_captions.http.get_text", **kwargs)
+
+
+@pytest.fixture
+def settings(tmp_path: Path) -> Settings:
+    return Settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+
+
+class TestReadVideoIds:
+    def test_ids_and_urls(self) -> None:
+        lines = ["abc\n", "https://www.youtube.com/watch?v=def\n", "https://youtu.be/ghi\n"]
+        assert list(pf.read_video_ids(lines)) == ["abc", "def", "ghi"]
+
+    def test_skips_blanks_comments_and_repeats(self) -> None:
+        lines = ["# channel dump\n", "\n", "abc\n", "  abc  \n", "https://youtu.be/abc\n"]
+        assert list(pf.read_video_ids(lines)) == ["abc"]
+
+    def test_consumed_lazily(self) -> None:
+        def lines() -> Iterator[str]:
+            yield "abc"
+            pytest.fail("read past the first ID")
+
+        assert next(pf.read_video_ids(lines())) == "abc"
+
+
+class TestPrefetchVideo:
+    def test_captions_cached(self, settings: Settings) -> None:
+        with (
+            _extracting(return_value=_metadata("abc")),
+            _serving(return_value=_SRT),
+        ):
+            result = pf.prefetch_video("abc", settings)
+        assert result == pf.PrefetchResult("abc", "captions", lang="en", kind="manual")
+        assert MetadataCache(settings.cache_dir, ttl_seconds=3600).load("abc") is not None
+        assert CaptionCache(settings.cache_dir).load("abc", "en", "manual") is not None
+
+    def test_no_captions_needs_whisper(self, settings: Settings) -> None:
+        with _extracting(return_value=_metadata("abc", captions=False)):
+            result = pf.prefetch_video("abc", settings)
+        assert result.status == "whisper"
+        assert result.detail == "lang_not_found"
+
+    def test_caption_download_failure_is_error(self, settings: Settings) -> None:
+        with (
+            _extracting(return_value=_metadata("abc")),
+            _serving(side_effect=requests.ConnectionError("reset")),
+        ):
+            result = pf.prefetch_video("abc", settings)
+        assert result == pf.PrefetchResult("abc", "error", detail="download_failed")
+
+    def test_metadata_failure_is_error(self, settings: Settings) -> None:
+        with _extracting(side_effect=DownloadError("blocked")):
+            result = pf.prefetch_video("abc", settings)
+        assert result == pf.PrefetchResult("abc", "error", detail="metadata unavailable")
+
+    def test_throttling_is_error_not_whisper(self, settings: Settings) -> None:
+        with _extracting(side_effect=YouTubeThrottledError("429")):
+            result = pf.prefetch_video("abc", settings)
+        assert result == pf.PrefetchResult("abc", "error", detail="throttled")
+
+    def test_second_pass_makes_no_request(self, settings: Settings) -> None:
+        with (
+            _extracting(return_value=_metadata("abc")) as extract,
+            _serving(return_value=_SRT) as get_text,
+        ):
+            pf.prefetch_video("abc", settings)
+            pf.prefetch_video("abc", settings)
+        extract.assert_called_once()
+        get_text.assert_called_once()
+
+
+def _cached(video_id: str, *_args: object, **_kwargs: object) -> pf.PrefetchResult:
+    return pf.PrefetchResult(video_id, "captions")
+
+
+class TestPrefetch:
+    def test_every_id_reported(self, settings: Settings) -> None:
+        with patch.object(pf, "prefetch_video", side_effect=_cached):
+            results = list(pf.prefetch(iter(["a", "b", "c", "d", "e"]), settings, concurrency=2))
+        assert sorted(r.video_id for r in results) == ["a", "b", "c", "d", "e"]
+
+    def test_concurrency_bounded(self, settings: Settings) -> None:
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def slow(video_id: str, *_a: object, **_kw: object) -> pf.PrefetchResult:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return pf.PrefetchResult(video_id, "captions")
+
+        with patch.object(pf, "prefetch_video", side_effect=slow):
+            results = list(pf.prefetch((str(i) for i in range(12)), settings, concurrency=3))
+        assert len(results) == 12
+        assert 1 < peak <= 3
+
+
+class TestRun:
+    def _args(self, **overrides: object) -> argparse.Namespace:
+        defaults: dict[str, object] = {
+            "ids_file": "-",
+            "concurrency": 2,
+            "rate": None,
+            "report": None,
+            "language": None,
+            "force": False,
+        }
+        defaults.update(overrides)
+        return argparse.Namespace(**defaults)
+
+    def test_report_from_ids_file(self, tmp_path: Path, settings: Settings) -> None:
+        ids = tmp_path / "ids.txt"
+        ids.write_text("abc\nnocap\n", encoding="utf-8")
+
+        def extract(url: str) -> VideoMetadata:
+            video_id = url.rsplit("=", maxsplit=1)[1]
+            return _metadata(video_id, captions=video_id == "abc")
+
+        with _extracting(side_effect=extract), _serving(return_value=_SRT):
+            pf.run(self._args(ids_file=str(ids)), settings)
+        report = settings.output_dir / "prefetch report.csv"
+        with report.open(encoding="utf-8") as f:
+            rows = {row["video_id"]: row for row in csv.DictReader(f)}
+        assert rows["abc"]["status"] == "captions"
+        assert rows["abc"]["lang"] == "en"
+        assert rows["nocap"]["status"] == "whisper"
+
+    def test_reads_stdin(
+        self,
+        tmp_path: Path,
+        settings: Settings,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("sys.stdin", io.StringIO("https://youtu.be/abc\n"))
+        report = tmp_path / "report.csv"
+        with _extracting(return_value=_metadata("abc")), _serving(return_value=_SRT):
+            pf.run(self._args(report=report), settings)
+        assert "abc,captions,en,manual," in report.read_text(encoding="utf-8")
+
+    def test_rate_configures_limiter(self, tmp_path: Path, settings: Settings) -> None:
+        ids = tmp_path / "ids.txt"
+        ids.write_text("", encoding="utf-8")
+        pf.run(self._args(ids_file=str(ids), rate=2.5), settings)
+        assert pf.YOUTUBE_LIMITER.rate == 2.5
+
+    def test_disabled_metadata_cache_rejected(self, settings: Settings) -> None:
+        settings = dataclasses.replace(settings, metadata_ttl_hours=0)
+        with (
+            _extracting() as extract,
+            patch.object(pf.my_logger, "error") as error,
+            pytest.raises(SystemExit) as exc,
+        ):
+            pf.run(self._args(), settings)
+        assert exc.value.code == 2
+        assert "METADATA_TTL_HOURS" in error.call_args.args[0]
+        extract.assert_not_called()
+
+    def test_invalid_concurrency_rejected(self, settings: Settings) -> None:
+        with (
+            patch.object(pf.my_logger, "error") as error,
+            pytest.raises(SystemExit) as exc,
+        ):
+            pf.run(self._args(concurrency=0), settings)
+        assert exc.value.code == 2
+        assert "concurrency" in error.call_args.args[0]
@@ -6,19 +6,31 @@ tests (opt-in, ``pytest -m integration``).
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-from unittest.mock import patch
+import hashlib
+import itertools
+import json
+from typing import TYPE_CHECKING, Any, cast
+from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
-from pyannote.core import Segment
+import torch
+from pyannote.core import Annotation, Segment, Timeline
 
 import scriber.transcription.local as plt
+from scriber.transcription.checkpoint import (
+    Checkpoint,
+    audio_fingerprint,
+    load_checkpoint,
+    save_checkpoint,
+)
 from scriber.transcription.local import (
-    _MODEL_CACHE,
     extract_audio,
     get_device,
     group_speaker_segments,
 )
+from scriber.transcription.models import MODEL_REGISTRY
+from scriber.transcription.turns import SpeakerTurns
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -94,7 +106,7 @@ class TestExtractAudio:
 
 class TestModelCache:
     def test_model_loaded_once_on_repeated_calls(self) -> None:
-        _MODEL_CACHE.clear()
+        MODEL_REGISTRY.clear()
         fake_model = object()
         with patch(
             "scriber.transcription.local.whisper.load_model", return_value=fake_model
@@ -105,7 +117,7 @@ class TestModelCache:
         assert m1 is m2 is fake_model
 
     def test_different_keys_load_separate_models(self) -> None:
-        _MODEL_CACHE.clear()
+        MODEL_REGISTRY.clear()
         model_a = object()
         model_b = object()
         with patch(
@@ -117,3 +129,489 @@ class TestModelCache:
         assert load.call_count == 2
         assert ma is model_a
         assert mb is model_b
+
+    def test_preload_then_load_reuses_model(self) -> None:
+        MODEL_REGISTRY.clear()
+        fake_model = object()
+        with patch(
+            "scriber.transcription.local.whisper.load_model", return_value=fake_model
+        ) as load:
+            plt.preload_whisper_model("tiny", "cpu")
+            m = plt._load_model("tiny", "cpu")
+        load.assert_called_once_with("tiny", device="cpu")
+        assert m is fake_model
+
+    def test_evict_forces_reload(self) -> None:
+        MODEL_REGISTRY.clear()
+        with patch(
+            "scriber.transcription.local.whisper.load_model",
+            side_effect=[object(), object()],
+        ) as load:
+            plt._load_model("tiny", "cpu")
+            assert plt.evict_whisper_model("tiny", "cpu") is True
+            plt._load_model("tiny", "cpu")
+        assert load.call_count == 2
+
+    def test_pipeline_preloaded_once_per_device(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        MODEL_REGISTRY.clear()
+        monkeypatch.setenv("HUGGINGFACE_TOKEN", "hf_x")
+        pipeline = MagicMock()
+        with patch.object(plt.Pipeline, "from_pretrained", return_value=pipeline) as load:
+            plt.preload_pipeline(plt.VAD_PIPELINE, "cpu")
+            first = plt._load_pipeline(plt.VAD_PIPELINE, "cpu")
+            second = plt._load_pipeline(plt.VAD_PIPELINE, "cpu")
+        load.assert_called_once()
+        assert first is second is pipeline
+        pipeline.to.assert_called_once()
+
+    def test_pipeline_without_token_raises(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        MODEL_REGISTRY.clear()
+        monkeypatch.delenv("HUGGINGFACE_TOKEN", raising=False)
+        with pytest.raises(OSError, match="HUGGINGFACE_TOKEN"):
+            plt.preload_pipeline(plt.VAD_PIPELINE, "cpu")
+
+
+def _fake_mel(*_args: object, **_kwargs: object) -> torch.Tensor:
+    return torch.zeros(80, 3000)
+
+
+def _lang_model(*batches: list[dict[str, float]]) -> MagicMock:
+    model = MagicMock()
+    model.detect_language.side_effect = [(None, probs) for probs in batches]
+    return model
+
+
+class TestPickLanguageWindows:
+    def test_short_audio_single_window(self) -> None:
+        audio = np.zeros(16000 * 10, dtype=np.float32)
+        assert plt._pick_language_windows(audio, 6) == [0]
+
+    def test_skips_silent_intro(self) -> None:
+        sr = 16000
+        audio = np.zeros(sr * 600, dtype=np.float32)
+        audio[sr * 300 : sr * 330] = 0.5  # the only speech is 5 minutes in
+        starts = plt._pick_language_windows(audio, 3)
+        assert starts[0] == sr * 300
+        assert len(starts) == 3
+
+    def test_windows_spread_across_regions(self) -> None:
+        sr = 16000
+        rng = np.random.default_rng(0)
+        audio = rng.standard_normal(sr * 900).astype(np.float32)
+        starts = plt._pick_language_windows(audio, 3)
+        regions = sorted(start // (sr * 290) for start in starts)
+        assert regions == [0, 1, 2]
+
+
+class TestDetectLanguage:
+    def _patches(self, seconds: int) -> tuple[Any, Any]:
+        audio = np.random.default_rng(0).standard_normal(16000 * seconds).astype(np.float32)
+        return (
+            patch("scriber.transcription.local.whisper.load_audio", return_value=audio),
+            patch(
+                "scriber.transcription.local.whisper.log_mel_spectrogram",
+                side_effect=_fake_mel,
+            ),
+        )
+
+    def test_stops_after_first_batch_when_confident(self) -> None:
+        model = _lang_model([{"fr": 0.9, "en": 0.1}] * 3, [{"en": 1.0}] * 3)
+        load, mel = self._patches(600)
+        with load, mel:
+            lang = plt.detect_language("a.wav", model, "cpu", max_windows=6, batch_size=3)
+        assert lang == "fr"
+        assert model.detect_language.call_count == 1
+        assert model.detect_language.call_args.args[0].shape == (3, 80, 3000)
+
+    def test_disagreement_reads_more_windows(self) -> None:
+        model = _lang_model(
+            [{"en": 0.9, "fr": 0.1}, {"fr": 0.9, "en": 0.1}, {"fr": 0.8, "en": 0.2}],
+            [{"fr": 0.9, "en": 0.1}] * 3,
+        )
+        load, mel = self._patches(600)
+        with load, mel:
+            lang = plt.detect_language("a.wav", model, "cpu", max_windows=6, batch_size=3)
+        assert lang == "fr"
+        assert model.detect_language.call_count == 2
+
+
+class _ChunkModel:
+    """Fake whisper model: two segments per chunk, recording each call."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, str | None]] = []
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> dict[str, Any]:
+        self.calls.append((len(audio), kwargs.get("initial_prompt")))
+        n = len(self.calls)
+        return {
+            "segments": [
+                {"start": 0.0, "end": 4.0, "text": f" a{n}", "id": 0},
+                {"start": 5.0, "end": 9.0, "text": f" b{n}", "id": 1},
+            ],
+        }
+
+
+class TestIterSegments:
+    def test_chunks_are_offset_and_boundary_segment_redecoded(self) -> None:
+        model = _ChunkModel()
+        audio = np.zeros(16000 * 25, dtype=np.float32)
+        segs = list(
+            plt._iter_segments(cast(Any, model), audio, "en", "cpu", chunk_seconds=10.0),
+        )
+        # Chunk 1 covers 0-10 s; its last segment (starts at 5 s) is dropped and
+        # re-decoded by chunk 2, which starts at 5 s, and so on.
+        assert [s["start"] for s in segs] == [0.0, 5.0, 10.0, 15.0, 20.0]
+        assert [s["text"] for s in segs] == [" a1", " a2", " a3", " a4", " b4"]
+        assert model.calls[0][1] is None
+        assert model.calls[1][1] == " a1"
+        assert set(segs[0]) == {"start", "end", "text"}
+
+    def test_segment_at_chunk_start_kept(self) -> None:
+        model = MagicMock()
+        model.transcribe.return_value = {
+            "segments": [{"start": 0.0, "end": 9.5, "text": " long", "id": 0}],
+        }
+        audio = np.zeros(16000 * 25, dtype=np.float32)
+        segs = list(
+            plt._iter_segments(cast(Any, model), audio, "en", "cpu", chunk_seconds=10.0),
+        )
+        # Dropping the only segment would re-decode from the same offset forever.
+        assert [s["start"] for s in segs] == [0.0, 10.0, 20.0]
+        assert model.transcribe.call_count == 3
+
+    def test_boundary_segment_too_close_to_chunk_start_kept(self) -> None:
+        model = MagicMock()
+        model.transcribe.return_value = {
+            "segments": [
+                {"start": 0.0, "end": 0.2, "text": " uh", "id": 0},
+                {"start": 0.3, "end": 9.5, "text": " long", "id": 1},
+            ],
+        }
+        audio = np.zeros(16000 * 25, dtype=np.float32)
+        segs = list(
+            plt._iter_segments(cast(Any, model), audio, "en", "cpu", chunk_seconds=10.0),
+        )
+        assert len(segs) == 6
+        assert model.transcribe.call_count == 3
+
+    def test_words_are_offset(self) -> None:
+        seg = {
+            "start": 1.0,
+            "end": 2.0,
+            "text": " hi",
+            "words": [{"word": " hi", "start": 1.0, "end": 1.5}],
+        }
+        out = plt._offset_segment(seg, 10.0)
+        assert out["words"] == [{"word": " hi", "start": 11.0, "end": 11.5}]
+
+
+class TestTranscribeAudioFull:
+    def test_joins_streamed_segments(self) -> None:
+        segs = [
+            {"start": 0.0, "end": 1.0, "text": " Hello"},
+            {"start": 1.0, "end": 2.0, "text": " there"},
+        ]
+        with patch.object(plt, "stream_transcription", return_value=("en", iter(segs))):
+            text, lang, segments = plt.transcribe_audio_full("a.wav", model_size="tiny")
+        assert text == " Hello there"
+        assert lang == "en"
+        assert segments == segs
+
+
+class TestStreamCheckpoint:
+    def _run(
+        self,
+        tmp_path: Path,
+        model: _ChunkModel,
+        *,
+        stop_after: int | None = None,
+    ) -> list[dict[str, Any]]:
+        audio = np.ones(16000 * 25, dtype=np.float32)
+        with (
+            patch.object(plt, "get_device", return_value="cpu"),
+            patch.object(plt, "_load_model", return_value=model),
+            patch.object(plt.whisper, "load_audio", return_value=audio),
+        ):
+            _, stream = plt.stream_transcription(
+                "a.wav",
+                model_size="tiny",
+                language="en",
+                chunk_seconds=10.0,
+                checkpoint_path=tmp_path / "ckpt.jsonl",
+            )
+            segs: list[dict[str, Any]] = []
+            for seg in stream:
+                segs.append(seg)
+                if stop_after is not None and len(segs) == stop_after:
+                    break
+        return segs
+
+    def test_checkpoint_saved_per_chunk_and_removed_on_success(self, tmp_path: Path) -> None:
+        self._run(tmp_path, _ChunkModel(), stop_after=2)
+        saved = load_checkpoint(tmp_path / "ckpt.jsonl")
+        assert saved is not None
+        assert saved.offset == 5.0  # chunk 1 decoded up to its dropped boundary segment
+        assert [s["text"] for s in saved.segments] == [" a1"]
+        assert saved.language == "en"
+
+        self._run(tmp_path, _ChunkModel())
+        assert not (tmp_path / "ckpt.jsonl").exists()
+
+    def test_resume_replays_segments_and_skips_decoded_audio(self, tmp_path: Path) -> None:
+        self._run(tmp_path, _ChunkModel(), stop_after=2)
+        model = _ChunkModel()
+        segs = self._run(tmp_path, model)
+        assert [s["start"] for s in segs] == [0.0, 5.0, 10.0, 15.0, 20.0]
+        assert segs[0]["text"] == " a1"  # replayed from the checkpoint
+        assert model.calls[0] == (16000 * 10, " a1")  # resumed at 5 s with the prompt tail
+        assert len(model.calls) == 3
+
+    def test_stale_checkpoint_ignored(self, tmp_path: Path) -> None:
+        save_checkpoint(
+            tmp_path / "ckpt.jsonl",
+            Checkpoint(
+                audio_fingerprint="other",
+                model_size="tiny",
+                requested_language="en",
+                language="en",
+                offset=20.0,
+                segments=[{"start": 0.0, "end": 1.0, "text": " old"}],
+            ),
+        )
+        segs = self._run(tmp_path, _ChunkModel())
+        assert segs[0]["text"] == " a1"
+
+    def _run_diarized(self, tmp_path: Path, model: Any) -> str:
+        audio = np.ones(16000 * 25, dtype=np.float32)
+        turns = SpeakerTurns.from_pairs([("A", Segment(0.0, 25.0))])
+        speech = (np.array([0.0]), np.array([25.0]))
+        with (
+            patch.object(plt, "get_device", return_value="cpu"),
+            patch.object(plt, "_load_model", return_value=model),
+            patch.object(plt.whisper, "load_audio", return_value=audio),
+            patch.object(plt, "_diarize_columns", return_value=(turns, speech)),
+            patch.object(plt, "STREAM_CHUNK_SECONDS", 10.0),
+        ):
+            text, _, _ = plt.transcribe_audio_with_diarization(
+                "a.wav",
+                model_size="tiny",
+                language="en",
+                checkpoint_path=tmp_path / "ckpt.jsonl",
+            )
+        return text
+
+    def test_diarized_whisper_pass_resumes(self, tmp_path: Path) -> None:
+        interrupted = MagicMock()
+        interrupted.transcribe.side_effect = [
+            _ChunkModel().transcribe(np.zeros(1)),
+            KeyboardInterrupt,
+        ]
+        with pytest.raises(KeyboardInterrupt):
+            self._run_diarized(tmp_path, interrupted)
+        saved = load_checkpoint(tmp_path / "ckpt.jsonl")
+        assert saved is not None
+        assert saved.offset == 5.0
+
+        model = _ChunkModel()
+        text = self._run_diarized(tmp_path, model)
+        assert text == "A: a1 a1 a2 a3 b3"  # " a1" replayed, then decoded from 5 s
+        assert model.calls[0] == (16000 * 10, " a1")  # resumed at 5 s with the prompt tail
+        assert not (tmp_path / "ckpt.jsonl").exists()
+
+    def test_each_chunk_appended_once(self, tmp_path: Path) -> None:
+        self._run(tmp_path, _ChunkModel(), stop_after=3)
+        lines = (tmp_path / "ckpt.jsonl").read_text().splitlines()
+        chunks = [json.loads(line) for line in lines[1:]]
+        assert [(c["offset"], [s["text"] for s in c["segments"]]) for c in chunks] == [
+            (0.0, []),
+            (5.0, [" a1"]),
+            (10.0, [" a2"]),
+        ]
+
+    def test_torn_last_line_ignored(self, tmp_path: Path) -> None:
+        self._run(tmp_path, _ChunkModel(), stop_after=3)
+        with (tmp_path / "ckpt.jsonl").open("a") as f:
+            f.write('{"offset": 20.0, "segm')
+        saved = load_checkpoint(tmp_path / "ckpt.jsonl")
+        assert saved is not None
+        assert saved.offset == 10.0
+        segs = self._run(tmp_path, _ChunkModel())
+        assert [s["start"] for s in segs] == [0.0, 5.0, 10.0, 15.0, 20.0]
+
+    def test_fingerprint_hashes_samples_in_place(self) -> None:
+        audio = np.random.default_rng(0).standard_normal(1000).astype(np.float32)
+        expected = hashlib.blake2b(audio.tobytes(), digest_size=16).hexdigest()
+        assert audio_fingerprint(audio) == expected  # same keys as before: caches stay valid
+        assert audio_fingerprint(audio[::2]) != expected
+
+    def test_unreadable_checkpoint_ignored(self, tmp_path: Path) -> None:
+        (tmp_path / "ckpt.jsonl").write_text("{not json")
+        assert load_checkpoint(tmp_path / "ckpt.jsonl") is None
+        segs = self._run(tmp_path, _ChunkModel())
+        assert len(segs) == 5
+
+
+class TestWaveformInput:
+    def test_wraps_mono_16k_waveform_for_pyannote(self) -> None:
+        audio = np.arange(16000, dtype=np.float32)
+        waveform = plt.waveform_input(audio)
+        assert waveform["sample_rate"] == 16000
+        assert tuple(waveform["waveform"].shape) == (1, 16000)
+        assert np.shares_memory(waveform["waveform"].numpy(), audio)  # no copy
+
+
+class TestPlanWindows:
+    def test_short_audio_is_one_window(self) -> None:
+        assert plt.plan_windows(100.0, 600.0) == [plt.DiarizationWindow(0.0, 100.0, 0.0, 100.0)]
+
+    def test_disabled_is_one_window(self) -> None:
+        assert len(plt.plan_windows(10_000.0, 0.0)) == 1
+
+    def test_windows_overlap_and_kept_parts_tile_the_audio(self) -> None:
+        windows = plt.plan_windows(1000.0, 300.0, overlap_seconds=30.0)
+        assert windows[0].start == 0.0
+        assert windows[-1].end == 1000.0
+        for prev, nxt in itertools.pairwise(windows):
+            assert nxt.start == prev.end - 30.0
+            assert prev.keep_end == nxt.keep_start  # every instant kept exactly once
+        assert windows[0].keep_start == 0.0
+        assert windows[-1].keep_end == 1000.0
+        assert all(w.end - w.start <= 300.0 for w in windows)
+
+
+def _window_voices(*labels: str) -> dict[str, np.ndarray]:
+    basis = {"alice": np.array([1.0, 0.0, 0.0]), "bob": np.array([0.0, 1.0, 0.0])}
+    return {f"L{i}": basis[who].astype(np.float32) for i, who in enumerate(labels)}
+
+
+class TestDiarizeWindowed:
+    def test_labels_stay_consistent_across_windows(self) -> None:
+        # Window 1: alice then bob. Window 2: local labels swapped (bob speaks first).
+        first = Annotation()
+        first[Segment(0.0, 100.0)] = "L0"
+        first[Segment(120.0, 280.0)] = "L1"
+        second = Annotation()
+        second[Segment(10.0, 100.0)] = "L0"
+        second[Segment(120.0, 200.0)] = "L1"
+        results = [
+            (first, _window_voices("alice", "bob")),
+            (second, _window_voices("bob", "alice")),
+        ]
+        waveform = plt.waveform_input(np.zeros(16000 * 500, dtype=np.float32))
+        with (
+            patch.object(plt, "WINDOW_OVERLAP_SECONDS", 30.0),
+            patch.object(plt, "_diarize", side_effect=results) as diarize,
+        ):
+            annotation, voices = plt._diarize_windowed(waveform, 300.0)
+        assert diarize.call_count == 2
+        chunk = diarize.call_args_list[1].args[0]["waveform"]
+        assert chunk.shape[-1] == 16000 * (500 - 270)
+        turns = [(label, (seg.start, seg.end)) for label, seg in plt._speaker_turns(annotation)]
+        # Window 2 starts at 270 s and keeps from 285 s on.
+        assert turns == [
+            ("SPEAKER_00", (0.0, 100.0)),
+            ("SPEAKER_01", (120.0, 280.0)),
+            ("SPEAKER_01", (285.0, 370.0)),
+            ("SPEAKER_00", (390.0, 470.0)),
+        ]
+        assert sorted(voices) == ["SPEAKER_00", "SPEAKER_01"]
+
+    def test_window_speakers_without_embedding_are_dropped(self) -> None:
+        local = Annotation()
+        local[Segment(0.0, 5.0)] = "L0"
+        local[Segment(5.0, 6.0)] = "L1"
+        voices = {"L0": np.ones(3, dtype=np.float32), "L1": np.full(3, np.nan, dtype=np.float32)}
+        waveform = plt.waveform_input(np.zeros(16000 * 10, dtype=np.float32))
+        with patch.object(plt, "_diarize", return_value=(local, voices)):
+            annotation, _ = plt._diarize_windowed(waveform, 300.0)
+        assert annotation.labels() == ["SPEAKER_00"]
+
+    def test_zero_padded_centroid_mints_no_speaker(self) -> None:
+        local = Annotation()
+        local[Segment(0.0, 5.0)] = "L0"
+        local[Segment(5.0, 6.0)] = "L1"
+        voices = {"L0": np.ones(3, dtype=np.float32), "L1": np.zeros(3, dtype=np.float32)}
+        waveform = plt.waveform_input(np.zeros(16000 * 10, dtype=np.float32))
+        with patch.object(plt, "_diarize", return_value=(local, voices)):
+            annotation, found = plt._diarize_windowed(waveform, 300.0)
+        assert annotation.labels() == ["SPEAKER_00"]
+        assert list(found) == ["SPEAKER_00"]
+
+
+class TestDiarizeWithSpeechTimeline:
+    def _annotation(self) -> Annotation:
+        annotation = Annotation()
+        annotation[Segment(0.0, 2.0)] = "A"
+        annotation[Segment(1.5, 4.0)] = "B"
+        annotation[Segment(6.0, 7.0)] = "A"
+        return annotation
+
+    def _diarized(self) -> tuple[Annotation, dict[str, np.ndarray]]:
+        return self._annotation(), {"A": np.ones(3, dtype=np.float32)}
+
+    def test_default_takes_speech_from_diarization(self) -> None:
+        with (
+            patch.object(plt, "_diarize", return_value=self._diarized()),
+            patch.object(plt, "detect_speech_segments") as vad,
+        ):
+            turns, speech, voices = plt.diarize_with_speech_timeline("a.wav")
+        vad.assert_not_called()
+        assert list(voices) == ["A"]
+        assert [label for label, _ in turns] == ["A", "B", "A"]
+        assert list(speech) == [Segment(0.0, 4.0), Segment(6.0, 7.0)]
+
+    def test_vad_mode_runs_both_pipelines(self) -> None:
+        vad_timeline = Timeline([Segment(0.5, 3.0)])
+        with (
+            patch.object(plt, "_diarize", return_value=self._diarized()) as diarize,
+            patch.object(plt, "detect_speech_segments", return_value=vad_timeline) as vad,
+        ):
+            turns, speech, _ = plt.diarize_with_speech_timeline("a.wav", "vad")
+        diarize.assert_called_once_with("a.wav")
+        vad.assert_called_once_with("a.wav")
+        assert len(turns) == 3
+        assert speech is vad_timeline
+
+    def test_accepts_in_memory_waveform(self) -> None:
+        waveform = plt.waveform_input(np.zeros(32000, dtype=np.float32))
+        with (
+            patch.object(plt, "_diarize", return_value=self._diarized()) as diarize,
+            patch.object(plt, "detect_speech_segments", return_value=Timeline()) as vad,
+        ):
+            plt.diarize_with_speech_timeline(waveform, "vad")
+        diarize.assert_called_once_with(waveform)
+        vad.assert_called_once_with(waveform)
+
+    def test_unknown_mode_rejected(self) -> None:
+        with pytest.raises(ValueError, match="speech detection"):
+            plt.diarize_with_speech_timeline("a.wav", "bogus")
+
+
+class TestTranscribeAudioWithDiarization:
+    def test_word_goes_to_turn_it_overlaps_most(self) -> None:
+        # A long turn A with several B turns nested in it; the last word
+        # straddles A's end and C's start, overlapping A (1.0 s) more than C.
+        pairs = [("A", Segment(0.0, 20.5))]
+        pairs += [("B", Segment(t, t + 2.0)) for t in (2.0, 5.5, 9.0, 12.5, 16.0)]
+        pairs += [("C", Segment(20.0, 25.0))]
+        words = [_word(" so", 19.0, 19.4), _word(" yes", 19.5, 20.5), _word(" ok", 21.0, 22.0)]
+        segments = [{"start": 19.0, "end": 22.0, "text": " so yes ok", "words": words}]
+        speech = (np.array([0.0]), np.array([25.0]))
+        with (
+            patch.object(plt, "get_device", return_value="cpu"),
+            patch.object(plt, "_load_model", return_value=MagicMock()),
+            patch.object(plt.whisper, "load_audio", return_value=np.zeros(16000, np.float32)),
+            patch.object(
+                plt,
+                "_diarize_columns",
+                return_value=(SpeakerTurns.from_pairs(pairs), speech),
+            ),
+            patch.object(plt, "_iter_segments", return_value=iter(segments)),
+        ):
+            text, _, _ = plt.transcribe_audio_with_diarization("a.wav", language="en")
+        assert text == "A: so yes\nC: ok"
+
+
+def _word(word: str, start: float, end: float) -> dict[str, Any]:
+    return {"word": word, "start": start, "end": end}
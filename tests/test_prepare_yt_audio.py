@@ -12,6 +12,7 @@ from scriber.transcription.youtube_audio import (
     extract_video_id,
     fetch_video_title,
 )
+from scriber.transcription.youtube_metadata import NotCachedError, VideoMetadata
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -46,14 +47,20 @@ class TestExtractVideoId:
 
 class TestFetchVideoTitle:
     def test_returns_title_from_info(self) -> None:
-        with patch("scriber.transcription.youtube_audio.yt_dlp.YoutubeDL") as dl_cls:
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls:
             ctx = MagicMock()
             ctx.extract_info.return_value = {"title": "My Cool Video", "id": "abc"}
             dl_cls.return_value.__enter__.return_value = ctx
             assert fetch_video_title("https://youtu.be/abc") == "My Cool Video"
 
+    def test_uses_metadata_without_request(self) -> None:
+        metadata = VideoMetadata({"id": "abc", "title": "Known"})
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls:
+            assert fetch_video_title("https://youtu.be/abc", metadata) == "Known"
+        dl_cls.assert_not_called()
+
     def test_falls_back_to_id_when_no_title(self) -> None:
-        with patch("scriber.transcription.youtube_audio.yt_dlp.YoutubeDL") as dl_cls:
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls:
             ctx = MagicMock()
             ctx.extract_info.return_value = {"id": "abc"}
             dl_cls.return_value.__enter__.return_value = ctx
@@ -71,7 +78,7 @@ class TestDownloadYoutubeAudio:
             wav.write_bytes(b"")
             return {"id": "abc123", "title": "My Video"}
 
-        with patch("scriber.transcription.youtube_audio.yt_dlp.YoutubeDL") as dl_cls:
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls:
             ctx = MagicMock()
             ctx.extract_info.side_effect = fake_extract
             dl_cls.return_value.__enter__.return_value = ctx
@@ -83,10 +90,87 @@ class TestDownloadYoutubeAudio:
 
     def test_missing_output_file_raises(self, tmp_path: Path) -> None:
         out = tmp_path / "downloads"
-        with patch("scriber.transcription.youtube_audio.yt_dlp.YoutubeDL") as dl_cls:
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls:
             ctx = MagicMock()
             # Simulate yt-dlp reporting success but never creating the file
             ctx.extract_info.return_value = {"id": "missing", "title": "t"}
             dl_cls.return_value.__enter__.return_value = ctx
             with pytest.raises(FileNotFoundError, match="missing"):
                 download_youtube_audio("https://youtu.be/missing", out)
+
+    def test_cache_hit_with_metadata_makes_no_request(self, tmp_path: Path) -> None:
+        out = tmp_path / "downloads"
+        out.mkdir()
+        (out / "abc.wav").write_bytes(b"")
+        metadata = VideoMetadata({"id": "abc", "title": "Known"})
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls:
+            audio_path, title = download_youtube_audio(
+                "https://youtu.be/abc",
+                out,
+                metadata=metadata,
+            )
+        dl_cls.assert_not_called()
+        assert (audio_path.name, title) == ("abc.wav", "Known")
+
+    def test_offline_uses_cached_audio_despite_force(self, tmp_path: Path) -> None:
+        (tmp_path / "abc.wav").write_bytes(b"")
+        metadata = VideoMetadata({"id": "abc", "title": "Known"})
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls:
+            audio_path, _ = download_youtube_audio(
+                "https://youtu.be/abc",
+                tmp_path,
+                force=True,
+                metadata=metadata,
+                offline=True,
+            )
+        dl_cls.assert_not_called()
+        assert audio_path.name == "abc.wav"
+
+    def test_offline_without_cached_audio_raises(self, tmp_path: Path) -> None:
+        metadata = VideoMetadata({"id": "abc", "title": "Known"})
+        with (
+            patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls,
+            pytest.raises(NotCachedError, match="abc"),
+        ):
+            download_youtube_audio(
+                "https://youtu.be/abc", tmp_path, metadata=metadata, offline=True
+            )
+        dl_cls.assert_not_called()
+
+    def test_download_reuses_metadata_instead_of_extracting(self, tmp_path: Path) -> None:
+        out = tmp_path / "downloads"
+        metadata = VideoMetadata({"id": "abc", "title": "Known", "formats": [{"format_id": "251"}]})
+
+        def fake_process(info: dict[str, object], *, download: bool) -> dict[str, object]:
+            _ = download
+            out.mkdir(parents=True, exist_ok=True)
+            (out / "abc.wav").write_bytes(b"")
+            return info
+
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls:
+            ctx = MagicMock()
+            ctx.process_ie_result.side_effect = fake_process
+            dl_cls.return_value.__enter__.return_value = ctx
+            _, title = download_youtube_audio("https://youtu.be/abc", out, metadata=metadata)
+        ctx.extract_info.assert_not_called()
+        ctx.process_ie_result.assert_called_once()
+        assert title == "Known"
+
+    def test_download_from_trimmed_metadata_extracts(self, tmp_path: Path) -> None:
+        # A cached entry has no formats: yt-dlp has to extract them again.
+        out = tmp_path / "downloads"
+        metadata = VideoMetadata({"id": "abc", "title": "Known"}, from_cache=True)
+
+        def fake_extract(url: str, *, download: bool) -> dict[str, object]:
+            _ = url, download
+            out.mkdir(parents=True, exist_ok=True)
+            (out / "abc.wav").write_bytes(b"")
+            return {"id": "abc", "title": "Known"}
+
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as dl_cls:
+            ctx = MagicMock()
+            ctx.extract_info.side_effect = fake_extract
+            dl_cls.return_value.__enter__.return_value = ctx
+            download_youtube_audio("https://youtu.be/abc", out, metadata=metadata)
+        ctx.process_ie_result.assert_not_called()
+        ctx.extract_info.assert_called_once_with("https://youtu.be/abc", download=True)
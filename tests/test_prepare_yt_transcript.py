@@ -3,20 +3,28 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 from yt_dlp.utils import DownloadError
 
+from scriber.transcription.caption_cache import CaptionCache
 from scriber.transcription.youtube_captions import (
     CaptionTrack,
     TranscriptUnavailableError,
-    _extract_text_from_subtitle_file,
+    _caption_source,
+    _iter_subtitle_segments,
+    _parse_json3,
+    _parse_subtitles,
     _pick_caption,
     get_youtube_transcript,
 )
+from scriber.transcription.youtube_metadata import NotCachedError, VideoMetadata
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 # A tiny SRT fixture used by the integration of get_youtube_transcript.
 _SAMPLE_SRT = """\
@@ -34,35 +42,27 @@ This is a transcript
 """
 
 
-def _ydl_returning(
-    info: dict[str, Any],
-    write_files: dict[str, str] | None = None,
-) -> MagicMock:
-    """Build a YoutubeDL mock that mimics extract_info + writes captions to disk.
+def _formats(*exts: str) -> list[dict[str, Any]]:
+    """A caption track as yt-dlp lists it: one downloadable URL per format."""
+    return [{"ext": ext, "url": f"https://captions.test/abc.{ext}"} for ext in exts]
 
-    ``write_files`` maps relative filename (e.g. ``"abc.fr.srt"``) to its
-    contents; on each ``extract_info`` call the mock writes them under the
-    output template's parent directory (parsed from ``opts['outtmpl']``).
-    """
-    files_to_write = write_files or {}
 
-    def _ctor(opts: dict[str, Any]) -> MagicMock:
-        ctx = MagicMock()
-        outtmpl = str(opts.get("outtmpl", ""))
-        outdir = Path(outtmpl).parent if outtmpl else Path()
+def _metadata(
+    subtitles: dict[str, Any] | None = None,
+    automatic_captions: dict[str, Any] | None = None,
+) -> VideoMetadata:
+    return VideoMetadata(
+        {
+            "id": "abc",
+            "subtitles": subtitles or {},
+            "automatic_captions": automatic_captions or {},
+        },
+    )
 
-        def _extract_info(_url: str, *, download: bool = True) -> dict[str, Any]:
-            if download:  # Phase 1 (download=False) must not write files
-                for name, body in files_to_write.items():
-                    (outdir / name).write_text(body, encoding="utf-8")
-            return info
 
-        ctx.extract_info.side_effect = _extract_info
-        ctx.__enter__.return_value = ctx
-        ctx.__exit__.return_value = False
-        return ctx
-
-    return MagicMock(side_effect=_ctor)
+def _serving(body: str) -> Any:
+    """Patch the caption fetch so every URL returns ``body``."""
+    return patch("scriber.transcription.youtube_captions.http.get_text", return_value=body)
 
 
 class TestPickCaption:
@@ -142,95 +142,281 @@ class TestPickCaption:
         assert _pick_caption(info, requested_lang="fr") == ("fr-FR", "manual")
 
 
-class TestExtractTextFromSubtitleFile:
-    def test_strips_timestamps_and_indices(self, tmp_path: Path) -> None:
-        srt = tmp_path / "x.srt"
-        srt.write_text(_SAMPLE_SRT)
-        text = _extract_text_from_subtitle_file(srt)
+def _text(segments: list[dict[str, Any]]) -> str:
+    return " ".join(str(segment["text"]) for segment in segments)
+
+
+class TestParseSubtitles:
+    def test_keeps_cue_timings(self) -> None:
+        segments = _parse_subtitles(_SAMPLE_SRT)
+        assert segments[0] == {"start": 0.0, "end": 2.0, "text": "Hello world"}
+        assert (segments[1]["start"], segments[1]["end"]) == (2.5, 5.0)
+
+    def test_strips_timestamps_and_indices(self) -> None:
+        text = _text(_parse_subtitles(_SAMPLE_SRT))
         assert "Hello world" in text
         assert "transcript" in text
         # No timestamp/index leftovers.
         assert "-->" not in text
         assert "00:00" not in text
 
-    def test_deduplicates_consecutive_identical_lines(self, tmp_path: Path) -> None:
-        srt = tmp_path / "x.srt"
-        srt.write_text(_SAMPLE_SRT)
-        text = _extract_text_from_subtitle_file(srt)
+    def test_deduplicates_consecutive_identical_lines(self) -> None:
+        segments = _parse_subtitles(_SAMPLE_SRT)
         # "This is a transcript" appears twice in source, once after dedup.
-        assert text.count("This is a transcript") == 1
+        assert _text(segments).count("This is a transcript") == 1
+        assert len(segments) == 2
+
+    def test_strips_vtt_header(self) -> None:
+        vtt = "WEBVTT\nKind: captions\nLanguage: en\n\n00:00:00.000 --> 00:00:01.000\nHello\n"
+        assert _parse_subtitles(vtt) == [{"start": 0.0, "end": 1.0, "text": "Hello"}]
+
+    def test_strips_inline_tags(self) -> None:
+        vtt = "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\n<c.color1>Hello</c> world\n"
+        assert _text(_parse_subtitles(vtt)) == "Hello world"
+
+    def test_rolling_auto_captions_keep_new_lines_only(self) -> None:
+        # YouTube's auto VTT repeats the previous line at the top of each cue.
+        vtt = (
+            "WEBVTT\n\n"
+            "00:00:01.000 --> 00:00:03.000 align:start position:0%\n"
+            "so today<00:00:01.500><c> we</c>\n\n"
+            "00:01:03.000 --> 00:01:05.500 align:start position:0%\n"
+            "so today we\nlook at caching\n"
+        )
+        assert _parse_subtitles(vtt) == [
+            {"start": 1.0, "end": 3.0, "text": "so today we"},
+            {"start": 63.0, "end": 65.5, "text": "look at caching"},
+        ]
+
+    def test_partial_line_overlap_removed_at_token_level(self) -> None:
+        # The echo is the tail of the previous cue, not a whole line.
+        srt = (
+            "1\n00:00:00,000 --> 00:00:02,000\nwe will look at the cache\n\n"
+            "2\n00:00:02,000 --> 00:00:04,000\nat the cache layer and\n\n"
+            "3\n00:00:04,000 --> 00:00:06,000\nlayer and its eviction policy\n"
+        )
+        assert _text(_parse_subtitles(srt)) == (
+            "we will look at the cache layer and its eviction policy"
+        )
 
-    def test_strips_vtt_header(self, tmp_path: Path) -> None:
-        vtt = tmp_path / "x.vtt"
-        vtt.write_text(
-            "WEBVTT\nKind: captions\nLanguage: en\n\n00:00:00.000 --> 00:00:01.000\nHello\n",
+    def test_single_repeated_word_is_kept(self) -> None:
+        srt = (
+            "1\n00:00:00,000 --> 00:00:01,000\nI think that\n\n"
+            "2\n00:00:01,000 --> 00:00:02,000\nthat works\n"
         )
-        assert _extract_text_from_subtitle_file(vtt) == "Hello"
+        assert _text(_parse_subtitles(srt)) == "I think that that works"
 
-    def test_strips_inline_tags(self, tmp_path: Path) -> None:
-        vtt = tmp_path / "x.vtt"
-        vtt.write_text(
-            "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\n<c.color1>Hello</c> world\n",
+    def test_manual_track_passes_through_unchanged(self) -> None:
+        srt = (
+            "1\n00:00:00,000 --> 00:00:02,000\nwe will look at the cache\n\n"
+            "2\n00:00:02,000 --> 00:00:04,000\nat the cache layer, yes\n\n"
+            "3\n00:00:04,000 --> 00:00:06,000\nat the cache layer, yes\n"
         )
-        assert _extract_text_from_subtitle_file(vtt) == "Hello world"
+        assert [s["text"] for s in _parse_subtitles(srt, rolling=False)] == [
+            "we will look at the cache",
+            "at the cache layer, yes",
+            "at the cache layer, yes",
+        ]
+
+    def test_streams_from_an_iterable_of_lines(self) -> None:
+        lines = iter(_SAMPLE_SRT.splitlines())
+        segments = _iter_subtitle_segments(lines)
+        assert next(segments)["text"] == "Hello world"
+        assert [s["text"] for s in segments] == ["This is a transcript"]
+
+
+_JSON3 = """{"events": [
+  {"tStartMs": 0, "dDurationMs": 5000, "id": 1, "wpWinPosId": 1},
+  {"tStartMs": 400, "dDurationMs": 3000, "wWinId": 1,
+   "segs": [{"utf8": "so"}, {"utf8": " today", "tOffsetMs": 320}, {"utf8": " we", "tOffsetMs": 800}]},
+  {"tStartMs": 3000, "dDurationMs": 40, "wWinId": 1, "aAppend": 1, "segs": [{"utf8": "\\n"}]},
+  {"tStartMs": 3000, "dDurationMs": 2500, "wWinId": 1,
+   "segs": [{"utf8": "look"}, {"utf8": " at", "tOffsetMs": 600}]}
+]}"""
+
+
+class TestParseJson3:
+    def test_events_become_segments_with_words(self) -> None:
+        first, second = _parse_json3(_JSON3)
+        # The first event is cut where the next line starts.
+        assert (first["start"], first["end"], first["text"]) == (0.4, 3.0, "so today we")
+        assert [(w["word"], w["start"], w["end"]) for w in first["words"]] == [
+            ("so", 0.4, 0.72),
+            (" today", 0.72, 1.2),
+            (" we", 1.2, 3.0),
+        ]
+        assert (second["start"], second["end"], second["text"]) == (3.0, 5.5, "look at")
+
+    def test_single_piece_events_have_no_words(self) -> None:
+        manual = '{"events": [{"tStartMs": 1000, "dDurationMs": 2000, "segs": [{"utf8": "Hi\\nthere"}]}]}'
+        assert _parse_json3(manual) == [{"start": 1.0, "end": 3.0, "text": "Hi there"}]
+
+
+class TestCaptionSource:
+    def test_prefers_json3_then_srt_then_vtt(self) -> None:
+        assert _caption_source(_formats("vtt", "json3", "srt")) == (
+            "json3",
+            "https://captions.test/abc.json3",
+        )
+        assert _caption_source(_formats("vtt", "srt")) == ("srt", "https://captions.test/abc.srt")
+        assert _caption_source(_formats("srv1", "vtt")) == ("vtt", "https://captions.test/abc.vtt")
+
+    def test_no_parseable_format(self) -> None:
+        assert _caption_source(_formats("srv1", "ttml")) is None
+        assert _caption_source([{"ext": "srt"}]) is None
 
 
 class TestGetYoutubeTranscript:
     def test_happy_path_manual_fr(self) -> None:
-        info: dict[str, Any] = {
-            "id": "abc",
-            "subtitles": {"fr": [{}]},
-            "automatic_captions": {},
-        }
-        ydl = _ydl_returning(info, write_files={"abc.fr.srt": _SAMPLE_SRT})
-        with patch("scriber.transcription.youtube_captions.yt_dlp.YoutubeDL", ydl):
-            track = get_youtube_transcript("abc", requested_lang="fr")
+        metadata = _metadata(subtitles={"fr": _formats("vtt", "srt")})
+        with _serving(_SAMPLE_SRT) as get_text:
+            track = get_youtube_transcript("abc", requested_lang="fr", metadata=metadata)
+        get_text.assert_called_once_with("https://captions.test/abc.srt")
         assert isinstance(track, CaptionTrack)
         assert track.lang == "fr"
         assert track.kind == "manual"
         assert "Hello world" in track.text
+        assert track.segments[0] == {"start": 0.0, "end": 2.0, "text": "Hello world"}
         for line in track.text.splitlines():
             assert len(line) <= 80
 
     def test_happy_path_auto_en_when_no_manual(self) -> None:
-        info: dict[str, Any] = {
-            "id": "abc",
-            "subtitles": {},
-            "automatic_captions": {"en": [{}]},
-        }
-        ydl = _ydl_returning(info, write_files={"abc.en.srt": _SAMPLE_SRT})
-        with patch("scriber.transcription.youtube_captions.yt_dlp.YoutubeDL", ydl):
-            track = get_youtube_transcript("abc")
+        metadata = _metadata(automatic_captions={"en": _formats("vtt")})
+        with _serving(_SAMPLE_SRT) as get_text:
+            track = get_youtube_transcript("abc", metadata=metadata)
+        get_text.assert_called_once_with("https://captions.test/abc.vtt")
         assert track.lang == "en"
         assert track.kind == "auto"
         assert "Hello world" in track.text
 
+    def test_json3_preferred_for_word_timing(self) -> None:
+        metadata = _metadata(automatic_captions={"en": _formats("vtt", "json3")})
+        with _serving(_JSON3) as get_text:
+            track = get_youtube_transcript("abc", metadata=metadata)
+        get_text.assert_called_once_with("https://captions.test/abc.json3")
+        assert track.text == "so today we look at"
+        assert len(track.segments) == 2
+        assert "words" in track.segments[0]
+
+    def test_json3_preferred_over_every_subtitle_format(self) -> None:
+        metadata = _metadata(automatic_captions={"en": _formats("srt", "vtt", "json3")})
+        with _serving(_JSON3) as get_text:
+            get_youtube_transcript("abc", metadata=metadata)
+        get_text.assert_called_once_with("https://captions.test/abc.json3")
+
+    def test_manual_srt_keeps_repeated_words(self) -> None:
+        srt = (
+            "1\n00:00:00,000 --> 00:00:02,000\nso today we\n\n"
+            "2\n00:00:02,000 --> 00:00:04,000\nso today we\nlook at\n"
+        )
+        metadata = _metadata(subtitles={"en": _formats("srt")})
+        with _serving(srt):
+            track = get_youtube_transcript("abc", metadata=metadata)
+        assert [s["text"] for s in track.segments] == ["so today we", "so today we look at"]
+
+    def test_rolling_srt_deduplicated_without_json3(self) -> None:
+        rolling = (
+            "1\n00:00:00,000 --> 00:00:02,000\nso today we\n\n"
+            "2\n00:00:02,000 --> 00:00:04,000\nso today we\nlook at\n"
+        )
+        metadata = _metadata(automatic_captions={"en": _formats("vtt", "srt")})
+        with _serving(rolling) as get_text:
+            track = get_youtube_transcript("abc", metadata=metadata)
+        get_text.assert_called_once_with("https://captions.test/abc.srt")
+        assert [s["text"] for s in track.segments] == ["so today we", "look at"]
+
+    def test_cached_track_makes_no_request(self, tmp_path: Path) -> None:
+        metadata = _metadata(automatic_captions={"en": _formats("json3")})
+        cache = CaptionCache(tmp_path)
+        with _serving(_JSON3) as get_text:
+            fetched = get_youtube_transcript("abc", metadata=metadata, cache=cache)
+            cached = get_youtube_transcript("abc", metadata=metadata, cache=cache)
+        get_text.assert_called_once()
+        assert cached == fetched
+
+    def test_refresh_refetches_cached_track(self, tmp_path: Path) -> None:
+        metadata = _metadata(subtitles={"en": _formats("srt")})
+        cache = CaptionCache(tmp_path)
+        with _serving(_SAMPLE_SRT) as get_text:
+            get_youtube_transcript("abc", metadata=metadata, cache=cache)
+            get_youtube_transcript("abc", metadata=metadata, cache=cache, refresh=True)
+        assert get_text.call_count == 2
+
+    def test_offline_serves_cached_track_despite_refresh(self, tmp_path: Path) -> None:
+        metadata = _metadata(subtitles={"en": _formats("srt")})
+        cache = CaptionCache(tmp_path)
+        with _serving(_SAMPLE_SRT) as get_text:
+            fetched = get_youtube_transcript("abc", metadata=metadata, cache=cache)
+            cached = get_youtube_transcript(
+                "abc", metadata=metadata, cache=cache, refresh=True, offline=True
+            )
+        get_text.assert_called_once()
+        assert cached == fetched
+
+    def test_offline_cache_miss_raises_without_request(self, tmp_path: Path) -> None:
+        metadata = _metadata(subtitles={"en": _formats("srt")})
+        with (
+            _serving(_SAMPLE_SRT) as get_text,
+            pytest.raises(NotCachedError, match="manual captions"),
+        ):
+            get_youtube_transcript(
+                "abc", metadata=metadata, cache=CaptionCache(tmp_path), offline=True
+            )
+        get_text.assert_not_called()
+
+    def test_malformed_json3_raises_empty_payload(self) -> None:
+        metadata = _metadata(automatic_captions={"en": _formats("json3")})
+        with (
+            _serving("<html>not json</html>"),
+            pytest.raises(TranscriptUnavailableError) as excinfo,
+        ):
+            get_youtube_transcript("abc", metadata=metadata)
+        assert excinfo.value.reason == "empty_payload"
+
     def test_requested_lang_propagates_to_picker(self) -> None:
         # Both manual fr and auto fr present + manual en present.
         # Requested fr should pick manual fr (rung 1), not manual en (rung 3).
-        info: dict[str, Any] = {
-            "id": "abc",
-            "subtitles": {"fr": [{}], "en": [{}]},
-            "automatic_captions": {},
-        }
-        ydl = _ydl_returning(info, write_files={"abc.fr.srt": _SAMPLE_SRT})
-        with patch("scriber.transcription.youtube_captions.yt_dlp.YoutubeDL", ydl):
-            track = get_youtube_transcript("abc", requested_lang="fr")
+        metadata = _metadata(
+            subtitles={"fr": _formats("srt"), "en": _formats("srt")},
+            automatic_captions={"fr": _formats("srt")},
+        )
+        with _serving(_SAMPLE_SRT):
+            track = get_youtube_transcript("abc", requested_lang="fr", metadata=metadata)
         assert track.lang == "fr"
+        assert track.kind == "manual"
 
-    def test_no_captions_raises_lang_not_found(self) -> None:
+    def test_fetches_metadata_when_not_given(self) -> None:
         info: dict[str, Any] = {
             "id": "abc",
-            "subtitles": {},
+            "subtitles": {"en": _formats("srt")},
             "automatic_captions": {},
         }
-        ydl = _ydl_returning(info)
+        ctx = MagicMock()
+        ctx.extract_info.return_value = info
+        ctx.__enter__.return_value = ctx
+        ctx.__exit__.return_value = False
+        ydl = MagicMock(return_value=ctx)
         with (
-            patch("scriber.transcription.youtube_captions.yt_dlp.YoutubeDL", ydl),
+            patch("scriber.transcription.replay.yt_dlp.YoutubeDL", ydl),
+            _serving(_SAMPLE_SRT),
+        ):
+            track = get_youtube_transcript("abc")
+        # One extraction for the listing; the caption itself bypasses yt-dlp.
+        ydl.assert_called_once()
+        ctx.extract_info.assert_called_once_with(
+            "https://www.youtube.com/watch?v=abc",
+            download=False,
+        )
+        assert track.lang == "en"
+
+    def test_no_captions_raises_lang_not_found(self) -> None:
+        with (
+            _serving(_SAMPLE_SRT) as get_text,
             pytest.raises(TranscriptUnavailableError) as excinfo,
         ):
-            get_youtube_transcript("abc")
+            get_youtube_transcript("abc", metadata=_metadata())
         assert excinfo.value.reason == "lang_not_found"
+        get_text.assert_not_called()
 
     def test_download_error_raises_list_failed(self) -> None:
         ctx = MagicMock()
@@ -239,7 +425,7 @@ class TestGetYoutubeTranscript:
         ctx.__exit__.return_value = False
         with (
             patch(
-                "scriber.transcription.youtube_captions.yt_dlp.YoutubeDL",
+                "scriber.transcription.replay.yt_dlp.YoutubeDL",
                 MagicMock(return_value=ctx),
             ),
             pytest.raises(TranscriptUnavailableError) as excinfo,
@@ -247,58 +433,34 @@ class TestGetYoutubeTranscript:
             get_youtube_transcript("abc")
         assert excinfo.value.reason == "list_failed"
 
-    def test_caption_download_error_raises_download_failed(self) -> None:
-        # Phase 1 (info, download=False) succeeds; Phase 2 (download=True) gets 429.
-        info: dict[str, Any] = {
-            "id": "abc",
-            "subtitles": {"en": [{}]},
-            "automatic_captions": {},
-        }
-        ctx_info = MagicMock()
-        ctx_info.extract_info.return_value = info
-        ctx_info.__enter__.return_value = ctx_info
-        ctx_info.__exit__.return_value = False
-
-        ctx_dl = MagicMock()
-        ctx_dl.extract_info.side_effect = DownloadError("429")
-        ctx_dl.__enter__.return_value = ctx_dl
-        ctx_dl.__exit__.return_value = False
-
+    def test_caption_http_error_raises_download_failed(self) -> None:
+        metadata = _metadata(subtitles={"en": _formats("srt")})
         with (
             patch(
-                "scriber.transcription.youtube_captions.yt_dlp.YoutubeDL",
-                MagicMock(side_effect=[ctx_info, ctx_dl]),
+                "scriber.transcription.youtube_captions.http.get_text",
+                side_effect=requests.HTTPError("429 Too Many Requests"),
             ),
             pytest.raises(TranscriptUnavailableError) as excinfo,
         ):
-            get_youtube_transcript("abc")
+            get_youtube_transcript("abc", metadata=metadata)
         assert excinfo.value.reason == "download_failed"
 
-    def test_listed_but_no_file_raises_empty_payload(self) -> None:
-        # Track is listed but yt-dlp doesn't actually write the file.
-        info: dict[str, Any] = {
-            "id": "abc",
-            "subtitles": {"fr": [{}]},
-            "automatic_captions": {},
-        }
-        ydl = _ydl_returning(info, write_files={})
+    def test_listed_without_text_format_raises_empty_payload(self) -> None:
+        # Track is listed but only in formats we do not parse.
+        metadata = _metadata(subtitles={"fr": _formats("srv1", "ttml")})
         with (
-            patch("scriber.transcription.youtube_captions.yt_dlp.YoutubeDL", ydl),
+            _serving(_SAMPLE_SRT) as get_text,
             pytest.raises(TranscriptUnavailableError) as excinfo,
         ):
-            get_youtube_transcript("abc")
+            get_youtube_transcript("abc", metadata=metadata)
         assert excinfo.value.reason == "empty_payload"
+        get_text.assert_not_called()
 
     def test_empty_caption_file_raises_empty_payload(self) -> None:
-        info: dict[str, Any] = {
-            "id": "abc",
-            "subtitles": {"fr": [{}]},
-            "automatic_captions": {},
-        }
-        ydl = _ydl_returning(info, write_files={"abc.fr.srt": "WEBVTT\n\n"})
+        metadata = _metadata(subtitles={"fr": _formats("vtt")})
         with (
-            patch("scriber.transcription.youtube_captions.yt_dlp.YoutubeDL", ydl),
+            _serving("WEBVTT\n\n"),
             pytest.raises(TranscriptUnavailableError) as excinfo,
         ):
-            get_youtube_transcript("abc")
+            get_youtube_transcript("abc", metadata=metadata)
         assert excinfo.value.reason == "empty_payload"
@@ -0,0 +1,201 @@
+"""Tests for transcription.rate_limit — the shared YouTube request cap and backoff."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from yt_dlp.utils import DownloadError
+
+from scriber.transcription.rate_limit import (
+    RateLimiter,
+    YouTubeThrottledError,
+    is_throttling,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+class _Clock:
+    """Fake ``time`` module: ``sleep`` advances ``time``."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+        self.slept: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> Iterator[_Clock]:
+    fake = _Clock()
+    with patch("scriber.transcription.rate_limit.time", fake):
+        yield fake
+
+
+def _http_error(status: int, retry_after: str | None = None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return requests.HTTPError(f"{status}", response=response)
+
+
+class TestTokenBucket:
+    def test_unlimited_never_waits(self) -> None:
+        limiter = RateLimiter()
+        assert all(limiter.acquire() == 0.0 for _ in range(100))
+
+    def test_spaces_requests_at_rate(self, clock: _Clock) -> None:
+        limiter = RateLimiter(rate=2.0)
+        assert [limiter.acquire() for _ in range(4)] == [0.0, 0.5, 0.5, 0.5]
+        assert clock.slept == [0.5, 0.5, 0.5]
+
+    @pytest.mark.usefixtures("clock")
+    def test_burst_then_rate(self) -> None:
+        limiter = RateLimiter(rate=1.0, burst=3)
+        assert [limiter.acquire() for _ in range(5)] == [0.0, 0.0, 0.0, 1.0, 1.0]
+
+    def test_idle_time_refills_up_to_burst(self, clock: _Clock) -> None:
+        limiter = RateLimiter(rate=1.0, burst=2)
+        limiter.acquire()
+        limiter.acquire()
+        clock.now += 60.0
+        assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+    def test_threads_share_the_budget(self) -> None:
+        lock = threading.Lock()
+        waits: list[float] = []
+        with patch("scriber.transcription.rate_limit.time") as fake_time:
+            fake_time.time.return_value = 1_000_000.0  # all threads arrive at once
+            limiter = RateLimiter(rate=10.0)
+
+            def worker() -> None:
+                waited = limiter.acquire()
+                with lock:
+                    waits.append(waited)
+
+            threads = [threading.Thread(target=worker) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert sorted(waits) == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+
+    @pytest.mark.parametrize(("rate", "burst"), [(0.0, 1), (-1.0, 1), (1.0, 0)])
+    def test_invalid_configuration(self, rate: float, burst: int) -> None:
+        with pytest.raises(ValueError, match="rate must be"):
+            RateLimiter(rate=rate, burst=burst)
+
+
+class TestIsThrottling:
+    def test_http_429(self) -> None:
+        assert is_throttling(_http_error(429))
+
+    def test_other_http_status(self) -> None:
+        assert not is_throttling(_http_error(404))
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "ERROR: [youtube] abc: HTTP Error 429: Too Many Requests",
+            "ERROR: [youtube] abc: This content isn't available, try again later.",
+            "ERROR: [youtube] abc: Sign in to confirm you're not a bot.",
+        ],
+    )
+    def test_yt_dlp_throttling(self, message: str) -> None:
+        assert is_throttling(DownloadError(message))
+
+    def test_yt_dlp_unavailable_video(self) -> None:
+        assert not is_throttling(DownloadError("ERROR: [youtube] abc: Video unavailable"))
+
+
+class TestBackoff:
+    def test_throttle_pauses_every_caller(self, clock: _Clock) -> None:
+        limiter = RateLimiter()
+        assert limiter.throttled() == 5.0
+        assert limiter.acquire() == 5.0
+        assert limiter.acquire() == 0.0
+        assert clock.slept == [5.0]
+
+    @pytest.mark.usefixtures("clock")
+    def test_consecutive_throttles_back_off_exponentially(self) -> None:
+        limiter = RateLimiter()
+        assert [limiter.throttled() for _ in range(4)] == [5.0, 10.0, 20.0, 40.0]
+
+    @pytest.mark.usefixtures("clock")
+    def test_retry_after_honored(self) -> None:
+        assert RateLimiter().throttled(retry_after=42.0) == 42.0
+
+    @pytest.mark.usefixtures("clock")
+    def test_throttling_halves_rate_until_success(self) -> None:
+        limiter = RateLimiter(rate=2.0)
+        limiter.acquire()
+        limiter.throttled(retry_after=0.0)
+        assert limiter.acquire() == 1.0  # 1 req/s
+        limiter.succeeded()
+        assert [limiter.acquire(), limiter.acquire()] == [0.0, 0.5]  # back to 2 req/s
+
+
+class TestCall:
+    def test_success_passes_through(self) -> None:
+        assert RateLimiter().call(lambda: "ok") == "ok"
+
+    def test_throttled_request_retried(self, clock: _Clock) -> None:
+        request = MagicMock(side_effect=[_http_error(429, retry_after="3"), "body"])
+        assert RateLimiter().call(request) == "body"
+        assert request.call_count == 2
+        assert clock.slept == [3.0]
+
+    @pytest.mark.usefixtures("clock")
+    def test_gives_up_with_distinct_error(self) -> None:
+        request = MagicMock(side_effect=DownloadError("HTTP Error 429: Too Many Requests"))
+        with pytest.raises(YouTubeThrottledError, match="gave up after 3 tries"):
+            RateLimiter().call(request, attempts=3)
+        assert request.call_count == 3
+
+    def test_other_errors_not_retried(self) -> None:
+        request = MagicMock(side_effect=_http_error(404))
+        with pytest.raises(requests.HTTPError):
+            RateLimiter().call(request)
+        request.assert_called_once()
+
+
+class TestSharedState:
+    @pytest.mark.usefixtures("clock")
+    def test_processes_share_one_bucket(self, tmp_path: Path) -> None:
+        state = tmp_path / "rate.json"
+        first, second = (
+            RateLimiter(rate=1.0, state_path=state),
+            RateLimiter(rate=1.0, state_path=state),
+        )
+        assert first.acquire() == 0.0
+        assert second.acquire() == 1.0
+        assert first.acquire() == 1.0
+
+    @pytest.mark.usefixtures("clock")
+    def test_throttle_seen_by_other_process(self, tmp_path: Path) -> None:
+        state = tmp_path / "rate.json"
+        RateLimiter(state_path=state).throttled(retry_after=30.0)
+        assert RateLimiter(state_path=state).acquire() == 30.0
+
+    @pytest.mark.usefixtures("clock")
+    def test_corrupt_state_file_reset(self, tmp_path: Path) -> None:
+        state = tmp_path / "rate.json"
+        state.write_text("not json", encoding="utf-8")
+        assert RateLimiter(rate=1.0, state_path=state).acquire() == 0.0
+
+    def test_configure_does_not_touch_the_file(self, tmp_path: Path) -> None:
+        limiter: Any = RateLimiter(rate=1.0, state_path=tmp_path / "rate.json")
+        assert limiter.state_path == tmp_path / "rate.json"
+        assert not (tmp_path / "rate.json").exists()
@@ -0,0 +1,129 @@
+"""Tests for transcription.replay — recorded YouTube responses for offline runs."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from yt_dlp.utils import DownloadError
+
+from scriber.handlers import handle_url
+from scriber.settings import Settings
+from scriber.transcription import http
+from scriber.transcription.replay import ReplayConfig
+from scriber.transcription.youtube_audio import download_youtube_audio
+from scriber.transcription.youtube_metadata import fetch_video_metadata
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_URL = "https://www.youtube.com/watch?v=abc"
+_CAPTION_URL = "https://captions.test/abc.srt"
+_INFO: dict[str, Any] = {
+    "id": "abc",
+    "title": "Recorded talk",
+    "subtitles": {"en": [{"ext": "srt", "url": _CAPTION_URL}]},
+}
+
+
+@pytest.fixture
+def recordings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ReplayConfig:
+    """Replay from ``tmp_path / "replay"``, which holds one video with captions and audio."""
+    config = ReplayConfig(tmp_path / "replay")
+    for path, data in (
+        (config.info_path("abc"), json.dumps(_INFO)),
+        (config.http_path(_CAPTION_URL), "1\n00:00:00,000 --> 00:00:01,000\nhello\n"),
+        (config.audio_path("abc"), "RIFF"),
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(data, encoding="utf-8")
+    monkeypatch.setenv("YT_REPLAY_DIR", str(config.root))
+    monkeypatch.delenv("YT_REPLAY_MODE", raising=False)
+    monkeypatch.delenv("YT_REPLAY_LATENCY_MS", raising=False)
+    return config
+
+
+class TestReplayConfig:
+    def test_unset_is_passthrough(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("YT_REPLAY_DIR", raising=False)
+        assert ReplayConfig.from_env() is None
+
+    def test_from_env(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("YT_REPLAY_DIR", str(tmp_path))
+        monkeypatch.setenv("YT_REPLAY_MODE", "record")
+        monkeypatch.setenv("YT_REPLAY_LATENCY_MS", "250")
+        assert ReplayConfig.from_env() == ReplayConfig(tmp_path, "record", 0.25)
+
+    def test_invalid_mode_rejected(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("YT_REPLAY_DIR", str(tmp_path))
+        monkeypatch.setenv("YT_REPLAY_MODE", "live")
+        with pytest.raises(ValueError, match="YT_REPLAY_MODE"):
+            ReplayConfig.from_env()
+
+
+@pytest.mark.usefixtures("recordings")
+class TestReplay:
+    def test_metadata_served_from_recording(self) -> None:
+        with patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as ydl:
+            metadata = fetch_video_metadata(_URL)
+        ydl.assert_not_called()
+        assert metadata.title == "Recorded talk"
+        assert metadata.subtitles == _INFO["subtitles"]
+
+    def test_unrecorded_video_fails_like_yt_dlp(self) -> None:
+        with pytest.raises(DownloadError, match="No recorded metadata"):
+            fetch_video_metadata("https://www.youtube.com/watch?v=zzz")
+
+    def test_caption_payload_served_from_recording(self) -> None:
+        with patch("scriber.transcription.http._fetch") as fetch:
+            assert http.get_text(_CAPTION_URL).endswith("hello\n")
+        fetch.assert_not_called()
+
+    def test_unrecorded_url_fails_like_the_network(self) -> None:
+        with pytest.raises(requests.ConnectionError, match="No recorded response"):
+            http.get_text("https://captions.test/other.srt")
+
+    def test_audio_copied_where_yt_dlp_writes_it(self, tmp_path: Path) -> None:
+        audio, title = download_youtube_audio(_URL, tmp_path / "downloads")
+        assert audio == tmp_path / "downloads" / "abc.wav"
+        assert audio.read_text(encoding="utf-8") == "RIFF"
+        assert title == "Recorded talk"
+
+    def test_latency_injected(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("YT_REPLAY_LATENCY_MS", "40")
+        with patch("scriber.transcription.replay.time.sleep") as sleep:
+            fetch_video_metadata(_URL)
+            http.get_text(_CAPTION_URL)
+        assert [c.args[0] for c in sleep.call_args_list] == [0.04, 0.04]
+
+    def test_handle_url_end_to_end(self, tmp_path: Path) -> None:
+        settings = Settings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache")
+        args = MagicMock(input_path=_URL, language=None, force=False, offline=False)
+        transcript = handle_url(args, settings)
+        assert transcript.text == "hello"
+        assert transcript.title == "Recorded talk"
+        assert transcript.source == "yt_manual"
+
+
+class TestRecord:
+    def test_records_info_and_http(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        config = ReplayConfig(tmp_path / "replay", "record")
+        monkeypatch.setenv("YT_REPLAY_DIR", str(config.root))
+        monkeypatch.setenv("YT_REPLAY_MODE", "record")
+        with (
+            patch("scriber.transcription.replay.yt_dlp.YoutubeDL") as ydl_cls,
+            patch("scriber.transcription.http._fetch", return_value="payload") as fetch,
+        ):
+            ydl_cls.return_value.extract_info.return_value = _INFO
+            ydl_cls.sanitize_info.side_effect = dict
+            metadata = fetch_video_metadata(_URL)
+            text = http.get_text(_CAPTION_URL)
+        fetch.assert_called_once_with(_CAPTION_URL)
+        assert metadata.title == "Recorded talk"
+        assert text == "payload"
+        recorded = json.loads(config.info_path("abc").read_text(encoding="utf-8"))
+        assert recorded == _INFO
+        assert config.http_path(_CAPTION_URL).read_text(encoding="utf-8") == "payload"
@@ -0,0 +1,140 @@
+# pyright: reportUnknownMemberType=false
+"""Tests for transcription.speakers — the enrolled-voice index."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+from pyannote.core import Segment
+
+import scriber.transcription.local as plt
+from scriber.transcription.speakers import SpeakerClusters, SpeakerIndex
+from scriber.transcription.turns import SpeakerTurns
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_ALICE = np.array([1.0, 0.1, 0.0], dtype=np.float32)
+_BOB = np.array([0.0, 1.0, 0.1], dtype=np.float32)
+
+
+def _index() -> SpeakerIndex:
+    index = SpeakerIndex()
+    index.enroll("Alice", _ALICE)
+    index.enroll("Bob", _BOB)
+    return index
+
+
+class TestSpeakerIndex:
+    def test_identify_matches_nearest_voice(self) -> None:
+        found = _index().identify({"SPEAKER_00": _BOB * 3, "SPEAKER_01": _ALICE + 0.05})
+        assert found == {"SPEAKER_00": "Bob", "SPEAKER_01": "Alice"}
+
+    def test_unknown_voice_left_out(self) -> None:
+        stranger = np.array([0.0, 0.0, 1.0], dtype=np.float32)
+        assert _index().identify({"SPEAKER_00": stranger}) == {}
+
+    def test_one_name_per_recording(self) -> None:
+        found = _index().identify({"SPEAKER_00": _ALICE, "SPEAKER_01": _ALICE * 0.9 + _BOB * 0.1})
+        assert found["SPEAKER_00"] == "Alice"
+        assert found.get("SPEAKER_01") != "Alice"
+
+    def test_non_finite_embedding_skipped(self) -> None:
+        nan = np.full(3, np.nan, dtype=np.float32)
+        assert _index().identify({"SPEAKER_00": nan}) == {}
+
+    def test_zero_padded_embedding_skipped(self) -> None:
+        found = _index().identify({"SPEAKER_00": _BOB, "SPEAKER_01": np.zeros(3, np.float32)})
+        assert found == {"SPEAKER_00": "Bob"}
+
+    def test_short_embedding_skipped(self) -> None:
+        found = _index().identify({"SPEAKER_00": _ALICE, "SPEAKER_01": _BOB[:2]})
+        assert found == {"SPEAKER_00": "Alice"}
+
+    def test_enroll_rejects_zero_embedding(self) -> None:
+        with pytest.raises(ValueError, match="Cannot enroll"):
+            SpeakerIndex().enroll("Nobody", np.zeros(3, dtype=np.float32))
+
+    def test_empty_index_identifies_nothing(self) -> None:
+        assert SpeakerIndex().identify({"SPEAKER_00": _ALICE}) == {}
+
+    def test_enroll_rejects_other_dimension(self) -> None:
+        with pytest.raises(ValueError, match="dimension"):
+            _index().enroll("Carol", np.ones(5, dtype=np.float32))
+
+    def test_save_load_round_trip(self, tmp_path: Path) -> None:
+        path = tmp_path / "speakers.npz"
+        _index().save(path)
+        loaded = SpeakerIndex.load(path)
+        assert loaded.names == ["Alice", "Bob"]
+        assert loaded.identify({"X": _ALICE}) == {"X": "Alice"}
+
+    def test_missing_or_corrupt_file_is_empty(self, tmp_path: Path) -> None:
+        assert len(SpeakerIndex.load(tmp_path / "missing.npz")) == 0
+        corrupt = tmp_path / "bad.npz"
+        corrupt.write_bytes(b"not an npz")
+        assert len(SpeakerIndex.load(corrupt)) == 0
+
+
+class TestSpeakerClusters:
+    def test_same_voice_keeps_its_global_label(self) -> None:
+        clusters = SpeakerClusters()
+        first = clusters.assign({"A": _ALICE, "B": _BOB}, {"A": 10.0, "B": 5.0})
+        second = clusters.assign({"X": _BOB * 2, "Y": _ALICE}, {"X": 3.0, "Y": 4.0})
+        assert first == {"A": "SPEAKER_00", "B": "SPEAKER_01"}
+        assert second == {"X": "SPEAKER_01", "Y": "SPEAKER_00"}
+        assert len(clusters) == 2
+
+    def test_new_voice_starts_a_cluster(self) -> None:
+        clusters = SpeakerClusters()
+        clusters.assign({"A": _ALICE}, {"A": 1.0})
+        carol = np.array([0.0, 0.0, 1.0], dtype=np.float32)
+        assert clusters.assign({"C": carol}, {"C": 1.0}) == {"C": "SPEAKER_01"}
+
+    def test_two_window_speakers_never_share_a_cluster(self) -> None:
+        clusters = SpeakerClusters()
+        clusters.assign({"A": _ALICE}, {"A": 1.0})
+        found = clusters.assign({"X": _ALICE, "Y": _ALICE * 0.99}, {"X": 1.0, "Y": 1.0})
+        assert len(set(found.values())) == 2
+
+    def test_zero_padded_centroid_starts_no_cluster(self) -> None:
+        clusters = SpeakerClusters()
+        clusters.assign({"A": _ALICE}, {"A": 10.0})
+        padded = np.zeros(3, dtype=np.float32)  # pyannote pads centroids it did not keep
+        found = clusters.assign({"X": _ALICE, "Y": padded}, {"X": 5.0, "Y": 0.5})
+        assert found == {"X": "SPEAKER_00"}
+        assert len(clusters) == 1
+
+    def test_voices_are_unit_centroids(self) -> None:
+        clusters = SpeakerClusters()
+        clusters.assign({"A": _ALICE * 5}, {"A": 1.0})
+        np.testing.assert_allclose(np.linalg.norm(clusters.voices()["SPEAKER_00"]), 1.0, rtol=1e-6)
+
+
+class TestResolveSpeakerNames:
+    def _turns(self) -> SpeakerTurns:
+        pairs = [("SPEAKER_00", Segment(0.0, 1.0)), ("SPEAKER_01", Segment(1.0, 2.0))]
+        return SpeakerTurns.from_pairs(pairs, {"SPEAKER_00": _ALICE, "SPEAKER_01": _BOB})
+
+    def test_without_index_keeps_labels(self) -> None:
+        assert plt._resolve_speaker_names(self._turns(), None, {}) == {}
+
+    def test_enroll_then_identify(self) -> None:
+        index = SpeakerIndex()
+        names = plt._resolve_speaker_names(self._turns(), index, {"SPEAKER_01": "Bob"})
+        assert names == {"SPEAKER_01": "Bob"}
+        assert index.names == ["Bob"]
+
+    def test_enroll_zero_padded_voice_ignored(self) -> None:
+        pairs = [("SPEAKER_00", Segment(0.0, 1.0))]
+        turns = SpeakerTurns.from_pairs(pairs, {"SPEAKER_00": np.zeros(3, dtype=np.float32)})
+        index = SpeakerIndex()
+        assert plt._resolve_speaker_names(turns, index, {"SPEAKER_00": "Zed"}) == {}
+        assert len(index) == 0
+
+    def test_enroll_unknown_label_ignored(self) -> None:
+        index = SpeakerIndex()
+        assert plt._resolve_speaker_names(self._turns(), index, {"SPEAKER_09": "Zed"}) == {}
+        assert len(index) == 0
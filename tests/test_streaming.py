@@ -0,0 +1,63 @@
+"""Tests for the incremental transcript / subtitle writer."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from scriber.formatting import wrap_transcript
+from scriber.streaming import TranscriptStreamWriter
+from scriber.subtitles import write_srt, write_vtt
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_SEGMENTS = [
+    {"start": 0.0, "end": 2.4, "text": " Hello world, this is the first cue"},
+    {"start": 2.5, "end": 5.123, "text": " and here comes a second, somewhat longer cue"},
+    {"start": 5.2, "end": 9.0, "text": " before a short third."},
+]
+
+
+class TestTranscriptStreamWriter:
+    def test_outputs_match_batch_writers(self, tmp_path: Path) -> None:
+        txt, srt, vtt = tmp_path / "t.txt", tmp_path / "t.srt", tmp_path / "t.vtt"
+        with TranscriptStreamWriter(txt, wrap_width=30, srt_path=srt, vtt_path=vtt) as writer:
+            for seg in _SEGMENTS:
+                writer.write(seg)
+
+        full_text = "".join(str(seg["text"]) for seg in _SEGMENTS)
+        assert txt.read_text() == wrap_transcript(full_text, diarize=False, width=30)
+        write_srt(_SEGMENTS, tmp_path / "ref.srt")
+        write_vtt(_SEGMENTS, tmp_path / "ref.vtt")
+        assert srt.read_text() == (tmp_path / "ref.srt").read_text()
+        assert vtt.read_text() == (tmp_path / "ref.vtt").read_text()
+
+    def test_writes_to_part_files_while_streaming(self, tmp_path: Path) -> None:
+        txt = tmp_path / "t.txt"
+        with TranscriptStreamWriter(txt, wrap_width=10) as writer:
+            writer.write({"start": 0.0, "end": 1.0, "text": " one two three four"})
+            assert not txt.exists()
+            assert (tmp_path / "t.txt.part").read_text() == " one two\n"
+        assert txt.read_text() == " one two\nthree four"
+        assert not (tmp_path / "t.txt.part").exists()
+
+    def test_failure_leaves_final_outputs_untouched(self, tmp_path: Path) -> None:
+        txt = tmp_path / "t.txt"
+        writer = TranscriptStreamWriter(txt, wrap_width=80)
+
+        def _crash() -> None:
+            with writer:
+                writer.write(_SEGMENTS[0])
+                raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            _crash()
+        assert not txt.exists()
+        assert (tmp_path / "t.txt.part").exists()
+
+    def test_subtitles_optional(self, tmp_path: Path) -> None:
+        with TranscriptStreamWriter(tmp_path / "t.txt", wrap_width=80) as writer:
+            writer.write(_SEGMENTS[0])
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["t.txt"]
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from scriber.subtitles import _format_timestamp, write_srt, write_vtt
+from scriber.subtitles import _format_timestamp, srt_cue, vtt_cue, write_srt, write_vtt
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -52,3 +52,14 @@ class TestWriteVtt:
         assert body.startswith("WEBVTT\n")
         assert "00:00:00.000 --> 00:00:02.400\nHello world" in body
         assert "00:00:02.500 --> 00:00:05.123\nSecond cue" in body
+
+
+_SPEAKER_SEGMENT = {"start": 0.0, "end": 1.0, "text": " Hi there", "speaker": "SPEAKER_01"}
+
+
+class TestSpeakerCues:
+    def test_srt_prefixes_speaker(self) -> None:
+        assert srt_cue(1, _SPEAKER_SEGMENT).endswith("\nSPEAKER_01: Hi there\n")
+
+    def test_vtt_uses_voice_tag(self) -> None:
+        assert vtt_cue(_SPEAKER_SEGMENT).endswith("\n<v SPEAKER_01>Hi there\n")
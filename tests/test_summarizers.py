@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import openai
 import pytest
 
-from scriber.model import Transcript
+from scriber.model import Chapter, Transcript
 from scriber.settings import Settings
 from scriber.summarizers import MissingAPIKeyError, analyze_sentiment, make_summarizer
 from scriber.summarizers.openai_summarizer import OpenAISummarizer
@@ -182,6 +183,103 @@ class TestOpenAISummarizer:
         assert kwargs["model"] == "gpt-5"
 
 
+def _chaptered_transcript() -> Transcript:
+    return Transcript(
+        text="hello world and more",
+        language="en",
+        title="vid",
+        source="yt_manual",
+        diarized=False,
+        segments=[
+            {"start": 0.0, "end": 2.0, "text": "hello world"},
+            {"start": 95.0, "end": 97.0, "text": "and more"},
+        ],
+        chapters=[Chapter("Intro", 0.0, 90.0), Chapter("Deep dive", 90.0, 600.0)],
+    )
+
+
+class TestChapterSummaries:
+    def _echo_client(self) -> MagicMock:
+        """Client whose answer names the chapter its prompt was for."""
+        client = MagicMock()
+
+        def create(**kwargs: Any) -> MagicMock:
+            prompt: str = kwargs["messages"][1]["content"]
+            response = MagicMock()
+            response.choices[0].message.content = "summary of " + prompt.rsplit("[", 1)[1]
+            return response
+
+        client.chat.completions.create.side_effect = create
+        return client
+
+    def test_one_request_per_chapter(self, tmp_path: Path) -> None:
+        client = self._echo_client()
+        with patch("scriber.summarizers.openai_compatible.OpenAI", return_value=client):
+            OpenAISummarizer(_settings(output_dir=tmp_path / "out")).summarize(
+                _chaptered_transcript(),
+                input_path="https://youtu.be/abc",
+            )
+        prompts = [
+            c.kwargs["messages"][1]["content"]
+            for c in client.chat.completions.create.call_args_list
+        ]
+        assert len(prompts) == 2
+        assert any("[Intro]\nhello world" in p for p in prompts)
+        assert any("[Deep dive]\nand more" in p for p in prompts)
+
+    def test_merged_with_deep_links(self, tmp_path: Path) -> None:
+        with patch(
+            "scriber.summarizers.openai_compatible.OpenAI", return_value=self._echo_client()
+        ):
+            OpenAISummarizer(_settings(output_dir=tmp_path / "out")).summarize(
+                _chaptered_transcript(),
+                input_path="https://youtu.be/abc",
+            )
+        out = (tmp_path / "out" / "vid.md").read_text()
+        assert "- [0:00](https://youtu.be/abc?t=0) Intro" in out
+        assert "#### [1:30](https://youtu.be/abc?t=90) Deep dive\nsummary of Deep dive]" in out
+        assert out.index("summary of Intro]") < out.index("summary of Deep dive]")
+
+    def test_chapters_requested_in_parallel(self, tmp_path: Path) -> None:
+        s = _settings(output_dir=tmp_path / "out", summary_concurrency=2)
+        with (
+            patch("scriber.summarizers.openai_compatible.OpenAI", return_value=self._echo_client()),
+            patch("scriber.summarizers.openai_compatible.ThreadPoolExecutor") as pool,
+        ):
+            pool.return_value.__enter__.return_value.map.return_value = ["a", "b"]
+            OpenAISummarizer(s).summarize(_chaptered_transcript(), input_path="u")
+        assert pool.call_args.kwargs["max_workers"] == 2
+
+    def test_failed_chapter_writes_nothing(self, tmp_path: Path) -> None:
+        client = MagicMock()
+        client.chat.completions.create.side_effect = [MagicMock(), openai.OpenAIError("x")]
+        with patch("scriber.summarizers.openai_compatible.OpenAI", return_value=client):
+            OpenAISummarizer(_settings(output_dir=tmp_path / "out")).summarize(
+                _chaptered_transcript(),
+                input_path="u",
+            )
+        assert not (tmp_path / "out" / "vid.md").exists()
+
+    def test_untimed_transcript_summarized_whole(self, tmp_path: Path) -> None:
+        chaptered = _chaptered_transcript()
+        untimed = Transcript(
+            text=chaptered.text,
+            language="en",
+            title="vid",
+            source="whisper",
+            diarized=False,
+            chapters=chaptered.chapters,
+        )
+        client = self._echo_client()
+        with patch("scriber.summarizers.openai_compatible.OpenAI", return_value=client):
+            OpenAISummarizer(_settings(output_dir=tmp_path / "out")).summarize(
+                untimed,
+                input_path="u",
+            )
+        client.chat.completions.create.assert_called_once()
+        assert "Chapters" not in (tmp_path / "out" / "vid.md").read_text()
+
+
 class TestOpenRouterSummarizer:
     def test_uses_openrouter_base_url(self, tmp_path: Path) -> None:
         s = _settings(
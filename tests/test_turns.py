@@ -0,0 +1,156 @@
+# pyright: reportUnknownMemberType=false
+"""Tests for transcription.turns — columnar speaker-turn bookkeeping."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from pyannote.core import Segment, Timeline
+
+from scriber.transcription.turns import SpeakerTurns, assign_speakers, speaker_text
+
+
+def _word(word: str, start: float, end: float) -> dict[str, Any]:
+    return {"word": word, "start": start, "end": end}
+
+
+_TURNS = [
+    ("A", Segment(0.0, 3.0)),
+    ("B", Segment(3.0, 6.0)),
+    ("A", Segment(6.5, 9.0)),
+]
+
+
+class TestAssignSpeakers:
+    def test_words_split_at_speaker_change(self) -> None:
+        segment = {
+            "start": 1.0,
+            "end": 5.0,
+            "text": " Hi there. Hello.",
+            "words": [
+                _word(" Hi", 1.0, 1.5),
+                _word(" there.", 1.6, 2.8),
+                _word(" Hello.", 3.2, 5.0),
+            ],
+        }
+        out = assign_speakers([segment], SpeakerTurns.from_pairs(_TURNS))
+        assert [(s["speaker"], s["text"], s["start"], s["end"]) for s in out] == [
+            ("A", " Hi there.", 1.0, 2.8),
+            ("B", " Hello.", 3.2, 5.0),
+        ]
+        assert len(out[0]["words"]) == 2
+
+    def test_segment_level_when_no_words(self) -> None:
+        out = assign_speakers(
+            [{"start": 2.5, "end": 5.5, "text": " x"}],
+            SpeakerTurns.from_pairs(_TURNS),
+        )
+        assert out == [{"start": 2.5, "end": 5.5, "text": " x", "speaker": "B"}]
+
+    def test_gap_goes_to_nearest_turn_within_tolerance(self) -> None:
+        segments = [
+            {"start": 6.1, "end": 6.3, "text": " near"},
+            {"start": 20.0, "end": 21.0, "text": " silence"},
+        ]
+        out = assign_speakers(segments, SpeakerTurns.from_pairs(_TURNS), max_gap=1.0)
+        assert [(s["speaker"], s["text"]) for s in out] == [("B", " near")]
+
+    def test_short_turn_output_dropped(self) -> None:
+        turns = [("A", Segment(0.0, 5.0)), ("B", Segment(5.0, 5.5))]
+        segments = [
+            {"start": 1.0, "end": 2.0, "text": " kept"},
+            {"start": 5.1, "end": 5.4, "text": " um"},
+        ]
+        out = assign_speakers(
+            segments,
+            SpeakerTurns.from_pairs(turns),
+            min_turn_duration=1.5,
+        )
+        assert [s["text"] for s in out] == [" kept"]
+
+    def test_short_turn_words_fall_back_to_overlapping_long_turn(self) -> None:
+        # The word overlaps B most, but B is too short to keep: A takes it.
+        turns = [("A", Segment(0.0, 10.2)), ("B", Segment(10.0, 10.8))]
+        segments = [
+            {"start": 10.0, "end": 10.6, "text": " right", "words": [_word(" right", 10.0, 10.6)]}
+        ]
+        out = assign_speakers(segments, SpeakerTurns.from_pairs(turns), min_turn_duration=1.5)
+        assert [(s["speaker"], s["text"]) for s in out] == [("A", " right")]
+
+    def test_words_inside_long_turn_with_many_nested_turns(self) -> None:
+        turns = [("A", Segment(0.0, 100.0))]
+        turns += [("B", Segment(t, t + 0.5)) for t in (10.0, 20.0, 30.0, 40.0, 50.0, 52.0)]
+        segments = [
+            {
+                "start": 55.0,
+                "end": 61.0,
+                "text": " still me",
+                "words": [_word(" still", 55.0, 58.0), _word(" me", 58.0, 61.0)],
+            }
+        ]
+        out = assign_speakers(segments, SpeakerTurns.from_pairs(turns), min_turn_duration=1.5)
+        assert [(s["speaker"], s["text"]) for s in out] == [("A", " still me")]
+
+    def test_speaker_text_merges_runs(self) -> None:
+        segments = [
+            {"start": 0.0, "end": 1.0, "text": " Hi.", "speaker": "A"},
+            {"start": 1.0, "end": 2.0, "text": " Again.", "speaker": "A"},
+            {"start": 2.0, "end": 3.0, "text": " Yes.", "speaker": "B"},
+        ]
+        assert speaker_text(segments) == "A: Hi. Again.\nB: Yes."
+
+
+def _random_turns(n: int, seed: int) -> list[tuple[str, Segment]]:
+    rng = np.random.default_rng(seed)
+    starts = np.cumsum(rng.uniform(0.0, 2.0, n))
+    ends = starts + rng.uniform(0.1, 3.0, n)  # overlapping turns included
+    labels = rng.choice(["A", "B", "C"], n)
+    return [
+        (str(label), Segment(float(s), float(e)))
+        for label, s, e in zip(labels, starts, ends, strict=True)
+    ]
+
+
+class TestSpeakerTurns:
+    def test_round_trip(self) -> None:
+        assert SpeakerTurns.from_pairs(_TURNS).to_pairs() == _TURNS
+
+    def test_empty(self) -> None:
+        turns = SpeakerTurns.from_pairs([])
+        assert len(turns) == 0
+        assert turns.grouped().to_pairs() == []
+        assert turns.within(Timeline([Segment(0.0, 1.0)])).to_pairs() == []
+
+    def test_within_matches_timeline_crop(self) -> None:
+        pairs = _random_turns(300, seed=0)
+        speech = Timeline([seg for _, seg in _random_turns(120, seed=1)]).support()
+        expected = [(label, seg) for label, seg in pairs if speech.crop(seg)]
+        assert SpeakerTurns.from_pairs(pairs).within(speech).to_pairs() == expected
+
+    def test_within_merges_overlapping_speech_regions(self) -> None:
+        pairs = _random_turns(300, seed=2)
+        speech = Timeline([seg for _, seg in _random_turns(120, seed=3)])  # not a support
+        expected = [(label, seg) for label, seg in pairs if speech.crop(seg)]
+        assert SpeakerTurns.from_pairs(pairs).within(speech).to_pairs() == expected
+
+    def test_within_touching_boundary_is_not_speech(self) -> None:
+        speech = Timeline([Segment(2.0, 3.0)])
+        turns = SpeakerTurns.from_pairs([("A", Segment(0.0, 2.0)), ("B", Segment(3.0, 4.0))])
+        assert turns.within(speech).to_pairs() == []
+
+    def test_match_picks_largest_overlap_like_a_full_scan(self) -> None:
+        turns = SpeakerTurns.from_pairs(_random_turns(400, seed=4)).sorted()
+        turns = SpeakerTurns.from_pairs(
+            [*turns.to_pairs(), ("L", Segment(5.0, 500.0))],  # one turn spanning the rest
+        ).sorted()
+        rng = np.random.default_rng(5)
+        starts = rng.uniform(0.0, 500.0, 2000)
+        ends = starts + rng.uniform(0.05, 4.0, 2000)
+        overlap = np.minimum(ends[:, None], turns.ends) - np.maximum(starts[:, None], turns.starts)
+        got = turns.match(starts, ends, max_gap=1.0)
+        rows = np.arange(len(starts))
+        np.testing.assert_allclose(overlap[rows, got], overlap.max(axis=1))
+
+    def test_within_empty_speech_drops_all(self) -> None:
+        assert SpeakerTurns.from_pairs(_TURNS).within(Timeline()).to_pairs() == []